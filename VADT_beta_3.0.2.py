@@ -17,649 +17,343 @@ Last Updated: 2-05-2021
 
 # Required Modules
 from __future__ import division
+import array
+import bisect
+import mmap
+import multiprocessing
 import os.path
+import re
+import shutil
 import sys
 import time
 from scipy import stats
-from scipy.stats import combine_pvalues
 import numpy as np
-import copy
 from datetime import datetime
 from platform import python_version
+from typing import NamedTuple
 
 
 #########################################################################################################################
 ############################################ Help Menu ##################################################################
 #########################################################################################################################
 
-#Help Menu for code
-def help_menu_prompt ():
-    print ("Help Menu\n")
-    print ("To Run Program Please Supply the Following Required Parameters\n")
-    print ("")
-    print ("Required Parameter")
-    print ("--File_Name Name_of_File.vcf")
-    print ("Note: Give full pathway otherwise program assumes local directory")
-    print ("")
-    print ("")
-    print ("Optional Parameters")
-    print ("")
-    print ("--Output_File_Location (default setting output to local directory)")
-    print ("")
-    print ("Variant Level Filtering")
-    print ("--Indel_Exclusion_Region_Length (default setting = 0)")
-    print ("--Quality_Score_Minimum_for_Variants (default setting = 20)")
-    print ("")
-    print ("Sample Level Filtering")
-    print ("--Minimum_Read_Counts (default setting = 20)")
-    print ("")
-    print ("Meta-Analysis Cutoff Values")
-    print ("--Meta_BH_adj_p_value_cutoff (default setting = 0.05)")
-    print ("--Meta_sample_p_value_cutoff (default setting = 0.05) ")
-    print ("")
-    print ("Multi-Dimensional P-Value Cutoff Value")
-    print ("--Multi_Dim_adjust_pvalue_cutoff (default setting = 0.05)")
-    print ("")
-    print ("Binomial Probability Value")
-    print ("--Binomial_Probability_Value (default setting = 0.5)")
-    print ("")
-    print ("")
-    print ("")
-    print ("The order of the parameters does not matter, but capitalization, underscores and spelling does matter")
-    print ("VERY IMPORTANT when putting pathways of the file \\ at the end is extremely important!!!")
-    print ("")
-    print ("Definition of Parameters")
-    print ("File_Name - Name of the file being analyzed, give full pathway otherwise program assumes local directory")
-    print ("Output_File_Location - Location to write data ---REMEMBER forward slash /")
-    print ("Indel_Exclusion_Region_Length - Length of region around indels (forward & reverse) to filter variants.")
-    print ("Quality_Score_Minimum_for_Variants - Variant quality score (phred score) minimum to filter variants ")
-    print ("")
-    print ("Meta-Analysis Cutoff Values")
-    print ("Meta_BH_adj_p_value_cutoff - Meta-Analysis BH adjusted p-value cutoff for significance")
-    print ("Meta_sample_p_value_cutoff - P-value Used for tallying samples after identification of significant variants.")
-    print ("     IMPORTANT: This technique is only for a estimation of sample counts, the multi-dimensional p-value adjustment")
-    print ("                gives a more accurate value")
-    print ("")
-    print ("Multi-Dimensional P-Value Adjustment")
-    print ("Multi_Dim_adjust_pvalue_cutoff - P-value threshold for calculating significance")
-    print ("")
-    print ("Binomial Test Probability Value")
-    print ("Binomial_Probability_Value - Probability value for testing statistical deviation.  /")
-    print ("    Used for correcting reference allele bias.")
-    print ("")
-    print ("EXAMPLE SUBMISSION IN UNIX")
-    print ("")
-    print ("python name_of_program \\")
-    print ("--File_Name Blue_Chickens.vcf \\")
-    print ("--Indel_Exclusion_Region_Length 75 \\")
-    print ("--Output_File_Location your/favorite/output/directory/ \\")
-    print ("")
-    sys.exit()
-
-
-#########################################################################################################################
-##################################### Code to Parse the Parameter File ##################################################
-#########################################################################################################################
-
-
-def test_Number_Input(value):
+# Help Menu text (written to the terminal in one go)
+HELP_MENU_TEXT = """\
+Help Menu
 
-    '''
+To Run Program Please Supply the Following Required Parameters
 
-    Tests input from the user to see if its a number (decimals acceptable).
-    Converts any floats to numbers and tests using the python built-in types "isdgit"
-    Note: isdigit does NOT accept decimal places, so input needs to be slightly modified)
-    
-    : Param value: Value being tested
 
-    : Return result: Pass or fail if its a number or not
+Required Parameter
+--File_Name Name_of_File.vcf
+Note: Give full pathway otherwise program assumes local directory
 
-    '''
 
-    # Replace all periods with nothing and test if numbers
-    test=value.replace('.','').isdigit()
-    
-    # Examines the results (True/False)
-    if test==True:
-        result='Pass'
-    else:
-        result='Fail'
- 
-    #return the results for the function
-    return (result)
+Optional Parameters
 
+--Output_File_Location (default setting output to local directory)
 
-def parsing_input_parameter_file(program_parameters):
+Variant Level Filtering
+--Indel_Exclusion_Region_Length (default setting = 0)
+--Quality_Score_Minimum_for_Variants (default setting = 20)
 
-    """
+Sample Level Filtering
+--Minimum_Read_Counts (default setting = 20)
 
-    Parses apart the VADT_Parameter_File.txt to get all user input parameters
-    for analyzing the data. Function also prints all user parameters to
-    command line, so a user can monitor the inputs. Also, default settings are
-    set in this function and are overwritten if a user provides the parameter
-    instead. 
-    
-    : Param program_parameters: Name of the parameter file being parsed
-    
-    : Return dictionary: Returns a dictionary of all paramters for later parts of the
-                          program (lots of variables)
-    
-    """
-    
-    # Default parameters (will be overridden by user---input)
+Meta-Analysis Cutoff Values
+--Meta_BH_adj_p_value_cutoff (default setting = 0.05)
+--Meta_sample_p_value_cutoff (default setting = 0.05) 
 
-    # Variant Level Default Paramters
-    quality_score_min= 20
+Multi-Dimensional P-Value Cutoff Value
+--Multi_Dim_adjust_pvalue_cutoff (default setting = 0.05)
 
-    # Default parameter for indel testing
-    indel_exclusion_region_length = 1
+Binomial Probability Value
+--Binomial_Probability_Value (default setting = 0.5)
 
-    # Sample level default parameters
-    min_total_read_count=20
 
-    # Meta-Analysis Cutoff Values
-    meta_BH_adj_p_value_cutoff = 0.05
-    meta_sample_p_value_cutoff = 0.05
 
-    # Multi-Dimensional P-Value Cutoff Value
-    multi_dim_adjust_pvalue_cutoff = 0.05
+The order of the parameters does not matter, but capitalization, underscores and spelling does matter
+VERY IMPORTANT when putting pathways of the file \\ at the end is extremely important!!!
 
-    # Currenting working directory default parameters (same directory as program)
-    working_directory= os.getcwd()
-    input_file_location = working_directory+'\\'
+Definition of Parameters
+File_Name - Name of the file being analyzed, give full pathway otherwise program assumes local directory
+Output_File_Location - Location to write data ---REMEMBER forward slash /
+Indel_Exclusion_Region_Length - Length of region around indels (forward & reverse) to filter variants.
+Quality_Score_Minimum_for_Variants - Variant quality score (phred score) minimum to filter variants 
 
-    # Global Output_File_Location
-    output_file_location = working_directory+'/' #for UNIX environment this symbol is required and it works fine in PC submission
-
-    # binomial probability value (50/50 Test)
-    binomial_probability_value = 0.5
-    
-    ###LEGACY VARIABLE KEPT FOR LATER DEVELOPMENT######
-    # Variables originally created to be modified, but later
-    # in development realized obsolete
-    min_numb_of_samples = 1
+Meta-Analysis Cutoff Values
+Meta_BH_adj_p_value_cutoff - Meta-Analysis BH adjusted p-value cutoff for significance
+Meta_sample_p_value_cutoff - P-value Used for tallying samples after identification of significant variants.
+     IMPORTANT: This technique is only for a estimation of sample counts, the multi-dimensional p-value adjustment
+                gives a more accurate value
 
-    numb_ref_alleles_allowed = 1
+Multi-Dimensional P-Value Adjustment
+Multi_Dim_adjust_pvalue_cutoff - P-value threshold for calculating significance
 
-    numb_alt_alleles_allowed = 1
-
-
-    file = open (program_parameters, 'r')
+Binomial Test Probability Value
+Binomial_Probability_Value - Probability value for testing statistical deviation.  /
+    Used for correcting reference allele bias.
 
-    print ("Parsed Lines from User")
-    for line in file:
-        if line.startswith("--"):
-            line=line.rstrip('\n')
-            
-            print (line)
-            parsed_parameters=line.split("--")
-            for x in range(1, len(parsed_parameters)):
-                inputs = parsed_parameters[x].split(" ")
-                
-                if inputs[0] == "File_Name":
-                    file_name = inputs[1] 
+EXAMPLE SUBMISSION IN UNIX
 
-                elif inputs[0] == "Indel_Exclusion_Region_Length":
-                    indel_exclusion_region_length = inputs[1]
+python name_of_program \\
+--File_Name Blue_Chickens.vcf \\
+--Indel_Exclusion_Region_Length 75 \\
+--Output_File_Location your/favorite/output/directory/ \\
 
-                    #Testing user input (verify numeric value)
-                    result = test_Number_Input(indel_exclusion_region_length)
-                    #If the result passes do this or if the result fails do something else
-                    if result =='Pass':
-                        pass
-                    else:
-                        print ("")
-                        print ("ERROR Alert!")
-                        print ("Please check Indel_Exclusion_Region_Length- incorrect input")
-                        print ("Incorrect input was: ", indel_exclusion_region_length) 
-                        sys.exit()
+"""
 
-                elif inputs[0] == "Minimum_Number_of_Samples_for_ASE":
-                    min_numb_of_samples = inputs[1]
 
-                    #Testing user input (verify numeric value)
-                    result = test_Number_Input(min_numb_of_samples)
-                    #If the result passes do this or if the result fails do something else
-                    if result =='Pass':
-                        pass
-                    else:
-                        print ("")
-                        print ("ERROR Alert!")
-                        print ("Please check Minimum_Number_of_Samples_for_ASE- incorrect input")
-                        print ("Incorrect input was: ", min_numb_of_samples) 
-                        sys.exit()
+#Help Menu for code
+def help_menu_prompt ():
+    sys.stdout.write(HELP_MENU_TEXT)
+    sys.exit()
 
-                elif inputs[0] == "Number_of_Reference_Alleles_Allowed":
-                    numb_ref_alleles_allowed = inputs[1]
 
-                    #Testing user input (verify numeric value)
-                    result = test_Number_Input(numb_ref_alleles_allowed)
-                    #If the result passes do this or if the result fails do something else
-                    if result =='Pass':
-                        pass
-                    else:
-                        print ("")
-                        print ("ERROR Alert!")
-                        print ("Please check Number_of_Reference_Alleles_Allowed- incorrect input")
-                        print ("Incorrect input was: ", numb_ref_alleles_allowed) 
-                        sys.exit()
+#########################################################################################################################
+##################################### Code to Parse the Parameter File ##################################################
+#########################################################################################################################
 
-                elif inputs[0] == "Number_of_Alternative_Alleles_Allowed":
-                    numb_alt_alleles_allowed = inputs[1]
+# Numeric user input (ex: 20, 0.05, .5, -1, 1e-5)
+NUMBER_INPUT_REGEX = re.compile(r'^-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?$')
 
-                    #Testing user input (verify numeric value)
-                    result = test_Number_Input(numb_alt_alleles_allowed)
-                    #If the result passes do this or if the result fails do something else
-                    if result =='Pass':
-                        pass
-                    else:
-                        print ("")
-                        print ("ERROR Alert!")
-                        print ("Please check Number_of_Alternative_Alleles_Allowed- incorrect input")
-                        print ("Incorrect input was: ", numb_alt_alleles_allowed) 
-                        sys.exit()
 
-                elif inputs[0] == "Quality_Score_Minimum_for_Variants":
-                    quality_score_min = inputs[1]
+def test_Number_Input(value):
 
-                    #Testing user input (verify numeric value)
-                    result = test_Number_Input(quality_score_min)
-                    #If the result passes do this or if the result fails do something else
-                    if result =='Pass':
-                        pass
-                    else:
-                        print ("")
-                        print ("ERROR Alert!")
-                        print ("Please check Quality_Score_Minimum_for_Variants- incorrect input")
-                        print ("Incorrect input was: ", quality_score_min) 
-                        sys.exit()
+    '''
 
-                elif inputs[0] == "Minimum_Read_Counts":
-                    min_total_read_count = inputs[1]
+    Tests input from the user to see if its a number (decimals, negative values and
+    scientific notation acceptable, ex: 20, 0.05, -1, 1e-5) using a pre-compiled
+    regular expression (NUMBER_INPUT_REGEX)
+    
+    : Param value: Value being tested
 
-                    #Testing user input (verify numeric value)
-                    result = test_Number_Input(min_total_read_count)
-                    #If the result passes do this or if the result fails do something else
-                    if result =='Pass':
-                        pass
-                    else:
-                        print ("")
-                        print ("ERROR Alert!")
-                        print ("Please check Minimum_Read_Counts- incorrect input")
-                        print ("Incorrect input was: ", min_total_read_count) 
-                        sys.exit()
+    : Return result: Pass or fail if its a number or not
 
-                elif inputs[0] == "Meta_BH_adj_p_value_cutoff":
-                    meta_BH_adj_p_value_cutoff = inputs[1]
+    '''
 
-                    #Testing user input (verify numeric value)
-                    result = test_Number_Input(meta_BH_adj_p_value_cutoff)
-                    #If the result passes do this or if the result fails do something else
-                    if result =='Pass':
-                        pass
-                    else:
-                        print ("")
-                        print ("ERROR Alert!")
-                        print ("Please check Meta_BH_adj_p_value_cutoff- incorrect input")
-                        print ("Incorrect input was: ", meta_BH_adj_p_value_cutoff) 
-                        sys.exit()
+    # Examines the results (match object or None)
+    if NUMBER_INPUT_REGEX.match(value):
+        result='Pass'
+    else:
+        result='Fail'
+ 
+    #return the results for the function
+    return (result)
 
-                elif inputs[0] == "Meta_sample_p_value_cutoff":
-                    meta_sample_p_value_cutoff = inputs[1]
 
-                    #Testing user input (verify numeric value)
-                    result = test_Number_Input(meta_sample_p_value_cutoff)
-                    #If the result passes do this or if the result fails do something else
-                    if result =='Pass':
-                        pass
-                    else:
-                        print ("")
-                        print ("ERROR Alert!")
-                        print ("Please check Meta_sample_p_value_cutoff- incorrect input")
-                        print ("Incorrect input was: ", meta_sample_p_value_cutoff) 
-                        sys.exit()
+class VADTParameters(NamedTuple):
 
-                elif inputs[0] == "Multi_Dim_adjust_pvalue_cutoff":
-                    multi_dim_adjust_pvalue_cutoff = inputs[1]
+    """
 
-                    #Testing user input (verify numeric value)
-                    result = test_Number_Input(multi_dim_adjust_pvalue_cutoff)
-                    #If the result passes do this or if the result fails do something else
-                    if result =='Pass':
-                        pass
-                    else:
-                        print ("")
-                        print ("ERROR Alert!")
-                        print ("Please check FDR_Sample_p_value- incorrect input")
-                        print ("Incorrect input was: ", multi_dim_adjust_pvalue_cutoff) 
-                        sys.exit()
+    User parameters for the program (returned by the parameter parsing functions),
+    values are read as attributes (ex: parameter_stuff.quality_score_min)
 
-                elif inputs[0] == "Binomial_Probability_Value":
-                    binomial_probability_value = inputs[1]
+    """
 
-                    #Testing user input (verify numeric value)
-                    result = test_Number_Input(binomial_probability_value)
-                    #If the result passes do this or if the result fails do something else
-                    if result =='Pass':
-                        pass
-                    else:
-                        print ("")
-                        print ("ERROR Alert!")
-                        print ("Please check Binomial_Probability_Value- incorrect input")
-                        print ("Incorrect input was: ", binomial_probability_value) 
-                        sys.exit()
-           
-                elif inputs[0] == "Output_File_Location":
-                    output_file_location = inputs[1]
-    else:
-        pass
+    file_name: str
+    output_file_location: str
+    indel_exclusion_region_length: int
+    quality_score_min: int
+    min_total_read_count: int
+    meta_BH_adj_p_value_cutoff: float
+    meta_sample_p_value_cutoff: float
+    multi_dim_adjust_pvalue_cutoff: float
+    binomial_probability_value: float
 
-    # Close the intial file
-    file.close()
-    
-    # Printing user settings to terminal in case program crashes out before completion
-    print ("")
-    print ("")
-    print ("Exact User Parameter Settings")
-    print ("")
-    print ("The input file is: ", file_name)
-    print ("The output directory for analysis is: ", output_file_location)
-    print ("")
-    print ("")
-    print ("The minimum qualtity score (phred score) for a variant is: ", quality_score_min)
-    print ("The indel exclusion region length from identified indels is: ", indel_exclusion_region_length)
-    #print ("The minimum number of samples to count a variant for ASE is: ", min_numb_of_samples)
-    print ("The number of allowable reference alleles is (currently program is limited to one): ", numb_ref_alleles_allowed)
-    print ("The number of allowable alternative alleles is (currently program is limited to one): ", numb_alt_alleles_allowed)
-    print ("The minimum number of total read counts for a sample per variant is: ", min_total_read_count)
-    print ("")
-    print ("")
-    print ("The binomial probability value for ASE testing is: ", binomial_probability_value)
-    print ("")
-    print ("")
-    print ("Meta-Analysis of Data")
-    print ("The Meta BH adjusted p-value cutoff is: ", meta_BH_adj_p_value_cutoff)
-    print ("The p-value cutoff used for estimated tallying of samples is: ", meta_sample_p_value_cutoff)
-    print ("")
-    print ("Multi-Dimensional P-Value Adjustment")
-    print ("The p-value cutoff for testing is: ", multi_dim_adjust_pvalue_cutoff)
-    print ("")
-    print ("")
-    
 
-    # Returns a dictionary of all the variables
-    return{'file_name':file_name, 'indel_exclusion_region_length':indel_exclusion_region_length,
-    'min_numb_of_samples':min_numb_of_samples, 'numb_ref_alleles_allowed':numb_ref_alleles_allowed,
-    'numb_alt_alleles_allowed':numb_alt_alleles_allowed, 'quality_score_min':quality_score_min, 
-    'min_total_read_count':min_total_read_count, 'binomial_probability_value': binomial_probability_value,
-    'meta_BH_adj_p_value_cutoff':meta_BH_adj_p_value_cutoff, 'meta_sample_p_value_cutoff': meta_sample_p_value_cutoff,
-    'multi_dim_adjust_pvalue_cutoff': multi_dim_adjust_pvalue_cutoff, 'output_file_location':output_file_location}
+# Table of every parameter a user can supply (key given after "--" by the user)
+# Value: (VADTParameters field name, default value, numeric type the input is converted to)
+# Note: Output_File_Location default is set at run time (current working directory)
+PARAMETER_SPECS = {
+    'File_Name': ('file_name', None, None),
+    'Output_File_Location': ('output_file_location', None, None),
+    'Indel_Exclusion_Region_Length': ('indel_exclusion_region_length', 1, int),
+    'Quality_Score_Minimum_for_Variants': ('quality_score_min', 20, int),
+    'Minimum_Read_Counts': ('min_total_read_count', 20, int),
+    'Meta_BH_adj_p_value_cutoff': ('meta_BH_adj_p_value_cutoff', 0.05, float),
+    'Meta_sample_p_value_cutoff': ('meta_sample_p_value_cutoff', 0.05, float),
+    'Multi_Dim_adjust_pvalue_cutoff': ('multi_dim_adjust_pvalue_cutoff', 0.05, float),
+    'Binomial_Probability_Value': ('binomial_probability_value', 0.5, float)}
 
+# Parameters of older versions of the program that are no longer used (accepted and ignored,
+# so older command lines and parameter files still run)
+LEGACY_PARAMETERS = ('Minimum_Number_of_Samples_for_ASE',
+                     'Number_of_Reference_Alleles_Allowed',
+                     'Number_of_Alternative_Alleles_Allowed')
 
 
-def parsing_input(program_parameters):
+def parsing_parameters(parameter_entries, ignore_unknown_parameters):
 
     """
 
-    Parses apart the command line or qsub submission file to get all user input parameters
-    for analyzing the data. Function also prints all user parameters to
-    command line, so a user can monitor the inputs. Also, default settings are
-    set in this function and are overwritten if a user provides the parameter
-    instead. 
+    Parses apart the user supplied parameters (either from the command line or
+    parameter file) using the PARAMETER_SPECS table. Function also prints all user
+    parameters to command line, so a user can monitor the inputs. Also, default
+    settings are set in this function and are overwritten if a user provides the
+    parameter instead.
 
-    : Param program_parameters: Name of the parameter file being parsed
+    : Param parameter_entries: List of parameter entries (ex: 'Minimum_Read_Counts 20')
+    : Param ignore_unknown_parameters: True skips unknown entries (parameter file),
+        False stops the program with an error (command line)
 
-    : Return dictionary: Returns a dictionary of all paramters for later parts of the
-                          program (lots of variables)
+    : Return parameter_stuff: VADTParameters of all paramters for later parts of the
+                          program (lots of variables), numeric values already int/float
 
     """
-    
-    # Default parameters (will be overridden by user---input)
-
-    # Variant Level Default Paramters
-    quality_score_min= 20
 
-    # Default parameter for indel distance
-    indel_exclusion_region_length = 1
-
-    # Sample level default parameters
-    min_total_read_count=20
-
-    # Meta-Analysis Cutoff Values
-    meta_BH_adj_p_value_cutoff = 0.05
-    meta_sample_p_value_cutoff = 0.05
-
-    # Multi-Dimensional P-Value Cutoff Value
-    multi_dim_adjust_pvalue_cutoff = 0.05
+    # Default parameters (will be overridden by user---input)
+    parameter_stuff = {}
+    for dict_key, default_value, numeric_type in PARAMETER_SPECS.values():
+        parameter_stuff[dict_key] = default_value
 
-    # Currenting working directory default parameters (same directory as program)
-    working_directory= os.getcwd()
-    input_file_location = working_directory+'\\'
+    # Global Output_File_Location (default is the current working directory)
+    parameter_stuff['output_file_location'] = os.getcwd()+'/' #for UNIX environment this symbol is required and it works fine in PC submission
 
-    # Global Output_File_Location
-    output_file_location = working_directory+'/' #for UNIX environment this symbol is required and it works fine in PC submission
+    for entry in parameter_entries:
+        inputs = entry.split(" ")
 
-    # binomial probability value (50/50 Test)
-    binomial_probability_value = 0.5
-    
-    ###LEGACY VARIABLE KEPT FOR LATER DEVELOPMENT######
-    # Variables originally created to be modified, but later
-    # in development realized obsolete
-    min_numb_of_samples = 1
+        # prints the help menu prompt
+        if not ignore_unknown_parameters and inputs[0] in ("help", "h", "Help"):
+            printing_help_menu=help_menu_prompt()
 
-    numb_ref_alleles_allowed = 1
+        # Legacy parameter (no longer used by the program)
+        if inputs[0] in LEGACY_PARAMETERS:
+            print ("")
+            print ("Warning: --" + inputs[0] + " is no longer used by the program and is ignored")
+            continue
 
-    numb_alt_alleles_allowed = 1
+        spec = PARAMETER_SPECS.get(inputs[0])
 
-    parsed_parameters=program_parameters.split("--")
+        # Unknown parameter
+        if spec is None:
+            if ignore_unknown_parameters:
+                continue
+            print ("")
+            print ("ERROR Alert!")
+            print ("Please double check your input parameters, something was not quite right")
+            print ("Type: --help to see a list of options and acceptable input for the program")
+            sys.exit()
 
-    # print (parsed_parameters)
-    for x in range(1, len(parsed_parameters)):
-        inputs = parsed_parameters[x].split(" ")
+        dict_key, default_value, numeric_type = spec
 
-        if inputs[0] == "File_Name":
-            file_name = inputs[1] 
+        # Parameter given without a value
+        if len(inputs) < 2:
+            print ("")
+            print ("ERROR Alert!")
+            print ("Please check " + inputs[0] + "- no input was given")
+            sys.exit()
 
-        elif inputs[0] == "Indel_Exclusion_Region_Length":
-            indel_exclusion_region_length = inputs[1]
+        value = inputs[1]
 
-            #Testing user input (verify numeric value)
-            result = test_Number_Input(indel_exclusion_region_length)
-            #If the result passes do this or if the result fails do something else
-            if result =='Pass':
-                pass
-            else:
+        #Testing user input (verify numeric value) and converting it once here, so
+        #later parts of the program never re-convert it (ex: int('20') per variant)
+        if numeric_type is not None:
+            try:
+                if test_Number_Input(value) != 'Pass':
+                    raise ValueError
+                parameter_stuff[dict_key] = numeric_type(value)
+            except ValueError:
                 print ("")
                 print ("ERROR Alert!")
-                print ("Please check Indel_Exclusion_Region_Length- incorrect input")
-                print ("Incorrect input was: ", indel_exclusion_region_length) 
+                print ("Please check " + inputs[0] + "- incorrect input")
+                print ("Incorrect input was: ", value)
                 sys.exit()
 
-        elif inputs[0] == "Minimum_Number_of_Samples_for_ASE":
-            min_numb_of_samples = inputs[1]
+        else:
+            parameter_stuff[dict_key] = value
 
-            #Testing user input (verify numeric value)
-            result = test_Number_Input(min_numb_of_samples)
-            #If the result passes do this or if the result fails do something else
-            if result =='Pass':
-                pass
-            else:
-                print ("")
-                print ("ERROR Alert!")
-                print ("Please check Minimum_Number_of_Samples_for_ASE- incorrect input")
-                print ("Incorrect input was: ", min_numb_of_samples) 
-                sys.exit()
+    # The input file is the only required parameter
+    if parameter_stuff['file_name'] is None:
+        print ("")
+        print ("ERROR Alert!")
+        print ("Please supply the required parameter --File_Name")
+        print ("Type: --help to see a list of options and acceptable input for the program")
+        sys.exit()
 
-        elif inputs[0] == "Number_of_Reference_Alleles_Allowed":
-            numb_ref_alleles_allowed = inputs[1]
+    # Printing user settings to terminal in case program crashes out before completion
+    # (lines are joined and written to the terminal in one go)
+    settings_lines = ["",
+                      "",
+                      "Exact User Parameter Settings",
+                      "",
+                      "The input file is:  " + str(parameter_stuff['file_name']),
+                      "The output directory for analysis is:  " + str(parameter_stuff['output_file_location']),
+                      "",
+                      "",
+                      "The minimum qualtity score (phred score) for a variant is:  " + str(parameter_stuff['quality_score_min']),
+                      "The indel exclusion region length from identified indels is:  " + str(parameter_stuff['indel_exclusion_region_length']),
+                      "The number of allowable reference alleles is (currently program is limited to one):  1",
+                      "The number of allowable alternative alleles is (currently program is limited to one):  1",
+                      "The minimum number of total read counts for a sample per variant is:  " + str(parameter_stuff['min_total_read_count']),
+                      "",
+                      "",
+                      "The binomial probability value for ASE testing is:  " + str(parameter_stuff['binomial_probability_value']),
+                      "",
+                      "",
+                      "Meta-Analysis of Data",
+                      "The Meta BH adjusted p-value cutoff is:  " + str(parameter_stuff['meta_BH_adj_p_value_cutoff']),
+                      "The p-value cutoff used for estimated tallying of samples is:  " + str(parameter_stuff['meta_sample_p_value_cutoff']),
+                      "",
+                      "Multi-Dimensional P-Value Adjustment",
+                      "The p-value cutoff for testing is:  " + str(parameter_stuff['multi_dim_adjust_pvalue_cutoff']),
+                      "",
+                      ""]
+    sys.stdout.write("\n".join(settings_lines) + "\n")
+
+    # Returns all the variables
+    return(VADTParameters(**parameter_stuff))
 
-            #Testing user input (verify numeric value)
-            result = test_Number_Input(numb_ref_alleles_allowed)
-            #If the result passes do this or if the result fails do something else
-            if result =='Pass':
-                pass
-            else:
-                print ("")
-                print ("ERROR Alert!")
-                print ("Please check Number_of_Reference_Alleles_Allowed- incorrect input")
-                print ("Incorrect input was: ", numb_ref_alleles_allowed) 
-                sys.exit()
 
-        elif inputs[0] == "Number_of_Alternative_Alleles_Allowed":
-            numb_alt_alleles_allowed = inputs[1]
+def parsing_input_parameter_file(program_parameters):
 
-            #Testing user input (verify numeric value)
-            result = test_Number_Input(numb_alt_alleles_allowed)
-            #If the result passes do this or if the result fails do something else
-            if result =='Pass':
-                pass
-            else:
-                print ("")
-                print ("ERROR Alert!")
-                print ("Please check Number_of_Alternative_Alleles_Allowed- incorrect input")
-                print ("Incorrect input was: ", numb_alt_alleles_allowed) 
-                sys.exit()
+    """
 
-        elif inputs[0] == "Quality_Score_Minimum_for_Variants":
-            quality_score_min = inputs[1]
+    Parses apart the VADT_Parameter_File.txt to get all user input parameters
+    for analyzing the data (only lines starting with "--" are parameters)
+    
+    : Param program_parameters: Name of the parameter file being parsed
+    
+    : Return parameter_stuff: VADTParameters of all paramters for later parts of the
+                          program (lots of variables)
+    
+    """
 
-            #Testing user input (verify numeric value)
-            result = test_Number_Input(quality_score_min)
-            #If the result passes do this or if the result fails do something else
-            if result =='Pass':
-                pass
-            else:
-                print ("")
-                print ("ERROR Alert!")
-                print ("Please check Quality_Score_Minimum_for_Variants- incorrect input")
-                print ("Incorrect input was: ", quality_score_min) 
-                sys.exit()
+    parameter_entries = []
 
-        elif inputs[0] == "Minimum_Read_Counts":
-            min_total_read_count = inputs[1]
+    file = open (program_parameters, 'r')
 
-            #Testing user input (verify numeric value)
-            result = test_Number_Input(min_total_read_count)
-            #If the result passes do this or if the result fails do something else
-            if result =='Pass':
-                pass
-            else:
-                print ("")
-                print ("ERROR Alert!")
-                print ("Please check Minimum_Read_Counts- incorrect input")
-                print ("Incorrect input was: ", min_total_read_count) 
-                sys.exit()
+    print ("Parsed Lines from User")
+    for line in file:
+        if line.startswith("--"):
+            line=line.rstrip('\n')
+            
+            print (line)
+            parameter_entries.extend(line.split("--")[1:])
 
-        elif inputs[0] == "Meta_BH_adj_p_value_cutoff":
-            meta_BH_adj_p_value_cutoff = inputs[1]
+    # Close the intial file
+    file.close()
 
-            #Testing user input (verify numeric value)
-            result = test_Number_Input(meta_BH_adj_p_value_cutoff)
-            #If the result passes do this or if the result fails do something else
-            if result =='Pass':
-                pass
-            else:
-                print ("")
-                print ("ERROR Alert!")
-                print ("Please check META_FDR_p_value- incorrect input")
-                print ("Incorrect input was: ", meta_BH_adj_p_value_cutoff) 
-                sys.exit()
+    return(parsing_parameters(parameter_entries, True))
 
-        elif inputs[0] == "Meta_sample_p_value_cutoff":
-            meta_sample_p_value_cutoff = inputs[1]
 
-            #Testing user input (verify numeric value)
-            result = test_Number_Input(meta_sample_p_value_cutoff)
-            #If the result passes do this or if the result fails do something else
-            if result =='Pass':
-                pass
-            else:
-                print ("")
-                print ("ERROR Alert!")
-                print ("Please check META_binomial_p_value- incorrect input")
-                print ("Incorrect input was: ", meta_sample_p_value_cutoff) 
-                sys.exit()
+def parsing_input(program_parameters):
 
-        elif inputs[0] == "Multi_Dim_adjust_pvalue_cutoff":
-            multi_dim_adjust_pvalue_cutoff = inputs[1]
+    """
 
-            #Testing user input (verify numeric value)
-            result = test_Number_Input(multi_dim_adjust_pvalue_cutoff)
-            #If the result passes do this or if the result fails do something else
-            if result =='Pass':
-                pass
-            else:
-                print ("")
-                print ("ERROR Alert!")
-                print ("Please check Multi_Dim_adjust_pvalue_cutoff- incorrect input")
-                print ("Incorrect input was: ", multi_dim_adjust_pvalue_cutoff) 
-                sys.exit()
+    Parses apart the command line or qsub submission file to get all user input parameters
+    for analyzing the data
 
-        elif inputs[0] == "Binomial_Probability_Value":
-            binomial_probability_value = inputs[1]
+    : Param program_parameters: Name of the parameter file being parsed
 
-            #Testing user input (verify numeric value)
-            result = test_Number_Input(binomial_probability_value)
-            #If the result passes do this or if the result fails do something else
-            if result =='Pass':
-                pass
-            else:
-                print ("")
-                print ("ERROR Alert!")
-                print ("Please check Binomial_Probability_Value- incorrect input")
-                print ("Incorrect input was: ", binomial_probability_value) 
-                sys.exit()
-   
-        elif inputs[0] == "Output_File_Location":
-            output_file_location = inputs[1]
+    : Return parameter_stuff: VADTParameters of all paramters for later parts of the
+                          program (lots of variables)
 
-        # prints the help menu prompt
-        elif inputs[0] == "help" or inputs[0]=="h" or inputs[0]=="Help":
-            printing_help_menu=help_menu_prompt()
+    """
 
-        else:
-            print ("")
-            print ("ERROR Alert!")
-            print ("Please double check your input parameters, something was not quite right")
-            print ("Type: --help to see a list of options and acceptable input for the program")
-            sys.exit()
-    
-    # Printing user settings to terminal in case program crashes out before completion
-    print ("")
-    print ("")
-    print ("Exact User Parameter Settings")
-    print ("")
-    print ("The input file is: ", file_name)
-    print ("The output directory for analysis is: ", output_file_location)
-    print ("")
-    print ("")
-    print ("The minimum qualtity score (phred score) for a variant is: ", quality_score_min)
-    print ("The indel exclusion region length from identified indels is: ", indel_exclusion_region_length)
-    # print ("The minimum number of samples to count a variant for ASE is: ", min_numb_of_samples)
-    print ("The number of allowable reference alleles is (currently program is limited to one): ", numb_ref_alleles_allowed)
-    print ("The number of allowable alternative alleles is (currently program is limited to one): ", numb_alt_alleles_allowed)
-    print ("The minimum number of total read counts for a sample per variant is: ", min_total_read_count)
-    print ("")
-    print ("")
-    print ("The binomial probability value for ASE testing is: ", binomial_probability_value)
-    print ("")
-    print ("")
-    print ("Meta-Analysis of Data")
-    print ("The Meta BH adjusted p-value cutoff is: ", meta_BH_adj_p_value_cutoff)
-    print ("The p-value cutoff used for estimated tallying of samples is: ", meta_sample_p_value_cutoff)
-    print ("")
-    print ("Multi-Dimensional P-Value Adjustment")
-    print ("The p-value cutoff for testing is: ", multi_dim_adjust_pvalue_cutoff)
-    print ("")
-    print ("")
-    
-    # Returns a dictionary of all the variables
-    return{'file_name':file_name, 'indel_exclusion_region_length':indel_exclusion_region_length,
-    'min_numb_of_samples':min_numb_of_samples, 'numb_ref_alleles_allowed':numb_ref_alleles_allowed,
-    'numb_alt_alleles_allowed':numb_alt_alleles_allowed, 'quality_score_min':quality_score_min, 
-    'min_total_read_count':min_total_read_count, 'binomial_probability_value': binomial_probability_value,
-    'meta_BH_adj_p_value_cutoff':meta_BH_adj_p_value_cutoff, 'meta_sample_p_value_cutoff': meta_sample_p_value_cutoff,
-    'multi_dim_adjust_pvalue_cutoff': multi_dim_adjust_pvalue_cutoff, 'output_file_location':output_file_location}
+    parameter_entries = program_parameters.split("--")[1:]
+
+    return(parsing_parameters(parameter_entries, False))
     
 
 #########################################################################################################################
@@ -686,43 +380,6 @@ def get_file_name(input_file_name):
     return (file_name)
 
 
-def sample_information(file_name):
-
-    """
-
-    Function counts the number of individuals in the filtered VCF file and returns the value
-    for later functions to use (Sample FDR, Meta-Analysis etc.)
-    
-    : Param file_name: Name of filtered file being analyzed
-
-    : Return sample_list: List of all the samples in a file
-    : Return numb_individuals: The number of individuals in the file
-
-    """
-
-    # Opening up variant file
-    tested_variants = open(file_name, 'r')
-
-    # Reading file line by line
-    for line in tested_variants:
-        
-        # Getting the header information from the file
-        if line.startswith('#CHROM'):
-            parsed_line = line.rstrip().split('\t')
-
- 
-
-            # Retrieve_Sample_Names_for_Logging
-            sample_list = parsed_line[9:]
-            numb_individuals = len(sample_list) 
-
-        # Getting the actual data from the file to perform meta-analysis
-        else:
-            break
-
-    return {'numb_individuals': numb_individuals, 'sample_list': sample_list}
-
-
 #########################################################################################################################
 ########################################## FDR P-value Adjustment Code ##################################################
 #########################################################################################################################
@@ -741,73 +398,6 @@ Source of code: https://github.com/mjtiv/FDR_Corrected_P-value/blob/master/FDR_C
 """
 
 
-def create_pvalues_fdr_results_dict(pvalues_list):
-
-
-    '''
-
-    Creates a dictionary inside a list to allow corrected
-    FDR pvalues to be stored and also allow for values to changed
-    and updated in the inside dictionary
-
-    : Parameters pvalues_list: list of input pvalues
-
-    : Return pvalues_fdr_results_list: list dictionary where the list
-        value is the original p-value, followed index value then dictionary
-
-    '''
-
-    # Create list dictionary combo to store results
-    pvalues_list_dict = []
-
-    # Start index counter
-    x = 0
-
-    # Start looping over pvalues
-    for pvalue in pvalues_list:
-
-        # For each entry add a value as an outside list with a dictionary inside
-        # Allow sorting of the outside value, very important
-        pvalues_list_dict.append([pvalue, x, {'index_in_list': x,
-                                               'original_pvalue': pvalue,
-                                               'adjusted_pvalue': 'nan'}])
-        # Add to the index counter
-        x += 1
-
-    return (pvalues_list_dict)
-
-
-def reorder_sorted_pvalues_list_dict(sorted_pvalues_list_dict):
-
-    """
-
-    Takes in the final list-dictionary with corrected p-values
-    and replaces pvalue "list" value with the original list index value
-    so the list-dictionary can be re-sorted to match the original list
-    order.
-
-    : Param sorted_pvalues_list_dict: list-dictionary with all entries
-        where the list value is the original p-value
-
-    : Return re_sorted_pvalues_list_dict: list-dictionary where the
-        original the list value is the original index value and has been
-        re-sorted by that value
-
-    """
-
-    # Loop over all the entries in the list dictionary
-    for entry in sorted_pvalues_list_dict:
-
-        # Delete the first entry in the list
-        # To get to the original index value
-        del entry[0]
-
-    # Sort the list (outside value using original index value)
-    re_sorted_pvalues_list_dict = sorted(sorted_pvalues_list_dict)
-
-    return (re_sorted_pvalues_list_dict)
-
-
 def fdr_correction(pvalues_list):
 
     """
@@ -815,82 +405,50 @@ def fdr_correction(pvalues_list):
     Function performs FDR correction of the p-values
     using Benjamini-Hochberg (1995) which sorts the list of pvalues
     and then determines the p-value correction based on the rank and following
-    equation (p-value x NumbTest / p-value_Rank)
+    equation (p-value x NumbTest / p-value_Rank), all ranks are corrected
+    at once with NumPy (single sort, cumulative minimum)
     
-    : Param values: list of pvalues to correct
-    : Return p_value_dict: dictionary of corrected pvalues
+    : Param pvalues_list: list (or NumPy array) of pvalues to correct
+    : Return adjusted_pvalues: list of corrected pvalues in the original list order
     
     """
 
-    # Create a list of pvalues with a dictionary inside each entry
-    pvalues_list_dict = create_pvalues_fdr_results_dict(pvalues_list)
-
-    # Sort the list in Reverse (outside value uses raw pvalue)
-    # if a duplicate is found, goes to next value (aka index value),
-    # index value required to prevent sort from breaking
-    reverse_sorted_pvalues_list_dict = sorted(pvalues_list_dict, reverse=True)
-
-    # Position Movement Counter
-    i = 0
+    pvalues = np.asarray(pvalues_list, dtype=np.float64)
 
     # Get the total number of pvalues analyzed
-    total_pvalues = len(pvalues_list_dict)
+    total_pvalues = pvalues.size
 
-    # Start looping over list dictionary 
-    for entry in reverse_sorted_pvalues_list_dict:
+    # Sorted position of each p-value (most significant to least significant),
+    # stable sort so duplicate p-values keep their original list order
+    sorted_order = np.argsort(pvalues, kind='stable')
+    p_value_sorted_positions = np.arange(1, total_pvalues + 1)
 
-        # Get the sorted position of p-value (most significant to least significant),
-        # opposite the current list
-        p_value_sorted_position = total_pvalues - i
+    # Get corrected pvalue for every position
+    fdr_adj_pvalues = pvalues[sorted_order] * total_pvalues / p_value_sorted_positions
 
-        # Last value in list (no need for following calculation)
-        if i == 0:
-            
-            # Get corrected pvalue for position i
-            # Important: No correction occurs for position because last value in sorted list
-            fdr_adj_pvalue = round((entry[0] * total_pvalues / p_value_sorted_position), 8)
-
-            # Adjust p-values may be greater than 1
-            if fdr_adj_pvalue > 1:
-                fdr_adj_pvalue = 1
-
-            # Update the dictionary value with corrected pvalue
-            entry[2]['adjusted_pvalue'] = fdr_adj_pvalue
-
-            # Increment i value
-            i+=1
-
-        else:
-            
-            # Get corrected pvalue for current entry
-            fdr_adj_pvalue = round((entry[0] * total_pvalues / p_value_sorted_position), 8)
-
-            # Get pvalue for the prior entry, which has a less significant original pvalue, which after
-            # adjustment could be more significant and needs to replace the adjusted pvalue
-            # of the current entry if this occurs
-            prior_entry_adj_pvalue = reverse_sorted_pvalues_list_dict[i -1][2]['adjusted_pvalue']
+    # A less significant original pvalue, after adjustment, could be more significant and
+    # replaces the adjusted pvalue of the entries before it (running minimum from the end)
+    fdr_adj_pvalues = np.minimum.accumulate(fdr_adj_pvalues[::-1])[::-1]
 
-            # Correct adjusted pvalue if lower ranked pvalue is more signficant
-            if prior_entry_adj_pvalue < fdr_adj_pvalue:
-                fdr_adj_pvalue = prior_entry_adj_pvalue
+    # Adjust p-values may be greater than 1
+    fdr_adj_pvalues = np.minimum(fdr_adj_pvalues, 1)
 
-            # Update the dictionary value with corrected pvalue
-            entry[2]['adjusted_pvalue'] = fdr_adj_pvalue
+    # Put the corrected pvalues back into the original list order
+    adjusted_pvalues = np.empty(total_pvalues)
+    adjusted_pvalues[sorted_order] = fdr_adj_pvalues
 
-            # Increment i value
-            i+=1
+    # Rounding corrected pvalues to 8 decimals (rounding does not change the order,
+    # so rounding after the running minimum gives the same values as before)
+    adjusted_pvalues = [round(fdr_adj_pvalue, 8) for fdr_adj_pvalue in adjusted_pvalues.tolist()]
 
-    # Replace first value in list with index to re-order values to match orginal data
-    re_sorted_pvalues_list_dict = reorder_sorted_pvalues_list_dict(reverse_sorted_pvalues_list_dict)
-
-    return(re_sorted_pvalues_list_dict)
+    return(adjusted_pvalues)
 
 
 #########################################################################################################################
 ######################################## RNA-Seq Filtering Code #########################################################
 #########################################################################################################################
 
-def failure_Report(failure_file_out, parsed_line, failure):
+def failure_Report(failure_file_out, line, failure):
 
     """
 
@@ -898,49 +456,80 @@ def failure_Report(failure_file_out, parsed_line, failure):
     failure defined to allow validation of filtering
     
     : Param failure_File_Out: Failure file being written to
-    : Param parsed_line: Variant data being passed to program
+    : Param line: Variant line as read from the file (written unchanged)
     : Param failure: Exact failure for the variant
     
     : Return: NONE
 
     """
 
-    line=('\t'.join(map(str,parsed_line)))
-    failure_file_out.write(str(failure)+"\t"+line)
+    failure_file_out.write(f"{failure}\t{line}")
     return()
 
 
-def removeSNPsInExclusionZone(parsed_line, no_of_exclusions, indel_exclusion_regions):
+class ExclusionZoneResult(NamedTuple):
+
+    """
+
+    Result of checking a variant against the INDEL exclusion zones
+    (returned by removeSNPsInExclusionZone)
 
     """
 
-    Identifies variants that are found in INDEL exclusion zones for filtering
+    line_of_data: list
+    judging_score: int
+
+
+def removeSNPsInExclusionZone(parsed_line, chromosome_exclusion_regions):
+
+    """
+
+    Identifies variants that are found in INDEL exclusion zones for filtering,
+    uses a binary search of the sorted exclusion zones on the variant's chromosome
     
     : Param parsed_line: Variant being examined
-    : Param noex: Number of INDEL exclusion zones
-    : Param indel_exclusion_regions: Identified INDEL exclusion regions for data
+    : Param chromosome_exclusion_regions: Merged INDEL exclusion regions on the
+        variant's chromosome (lists of sorted starts and stops) or None if it has none
 
-    : Return line_of_data: variant being examined
-    : Return judging_score: verdict if data is found in indel zone
+    : Return ExclusionZoneResult: line_of_data (variant being examined) and
+        judging_score (verdict if data is found in indel zone)
 
     """
    
     # Judge Region Exclusion (local counter to pass or fail SNPs)
     judregex = 0
+
+    # Only the exclusion zones on the variant's chromosome need examining
+    if chromosome_exclusion_regions is not None:
+        region_starts, region_stops = chromosome_exclusion_regions
+        position = int(parsed_line[1])
+
+        # Number of zones starting before the variant, zones do not overlap so only
+        # the last of them can contain the variant (SNP is in an Indel region)
+        i = bisect.bisect_left(region_starts, position)
+        if i > 0 and region_stops[i - 1] > position:
+            # Judge if variant is in exclusion region counter, if fail will be
+            # Excluded from future analysis
+            judregex = 1
     
-    # Examining the overlap between the SNP and indel regions
-    for i in range(no_of_exclusions): 
-   
-    # Nested "if" loops to examine if SNP chromosomes match then compares the
-    # the regions to see if SNP is Indel region (moves couter)
-        if parsed_line[0] == indel_exclusion_regions[i][0]:
-            if indel_exclusion_regions[i][1] < int(parsed_line[1]) < indel_exclusion_regions[i][2]:
-                # Judge if variant is in exclusion region counter, if fail will be
-                # Excluded from future analysis
-                judregex += 1
-                continue
-    
-    return{'line_of_data':parsed_line, 'judging_score':judregex}
+    return ExclusionZoneResult(parsed_line, judregex)
+
+
+class VariantCounts(NamedTuple):
+
+    """
+
+    Verdict and local filtering counters of a variant (returned by testing_variant_counts)
+
+    """
+
+    verdict: str
+    homozygous_ref_variant_local_counter: int
+    homozygous_alt_variant_local_counter: int
+    low_read_count_local_counter: int
+    low_freq_count_local_counter: int
+    no_value: int
+
 
 
 def identify_INDEL_Regions(output_file_location, input_vcf, exclusion_region_length):
@@ -953,12 +542,19 @@ def identify_INDEL_Regions(output_file_location, input_vcf, exclusion_region_len
     : Param inputvcf: Input vcf file that is being analyzed for INDELs
     : Param exreglen: Exclusion region based on sequencing length of data
     
-    : Return: A dictionary with all the exclusion regions and total number of regions excluded
+    : Return: A dictionary with all the exclusion regions (per chromosome, merged and sorted
+        lists of starts and stops for binary searching) and total number of regions excluded
     
     """
 
-    # infile being analyzed for INDELS
-    vcf_input_file = open(input_vcf, "r")
+    # infile being analyzed for INDELS, memory-mapped so the FILTER column can be checked
+    # in the raw bytes and failing variants (most of the file) are never decoded or split
+    vcf_input_file = open(input_vcf, "rb")
+    file_size = os.path.getsize(input_vcf)
+
+    # Empty files can not be memory-mapped
+    if file_size > 0:
+        mapped_vcf = mmap.mmap(vcf_input_file.fileno(), 0, access=mmap.ACCESS_READ)
 
     file_name = get_file_name(input_vcf)
 
@@ -966,30 +562,63 @@ def identify_INDEL_Regions(output_file_location, input_vcf, exclusion_region_len
     
     ###Section of Code looks at the Indels That Passed and Counts Their Numbers
 
-    #Creating a list of exclusion regions for Indels
-    indel_exclusion_regions = []
+    #Creating a list of exclusion regions for Indels (chromosome, start, stop)
+    exclusion_regions = []
     #Start Counter for no_of_exclusions
     no_of_exclusions = 0
 
-    # Creating a list of lengths (stats about indels)
-    indel_lengths_list =[]
+    # Running stats about indel lengths (no list of every length is kept)
+    number_indels_identified = 0
+    longest_indel = -sys.maxsize
+    shortest_indel = sys.maxsize
+    total_indel_length = 0
+
+    # Walking the file line by line (start and end of each line in the memory map)
+    next_line_start = 0
+    while next_line_start < file_size:
 
-    for line in vcf_input_file:
+        line_start = next_line_start
+        line_end = mapped_vcf.find(b'\n', line_start)
+        if line_end == -1:
+            line_end = file_size
+        next_line_start = line_end + 1
+
+        line_beginning = mapped_vcf[line_start:line_start+6]
         
         #Get Header from file
-        if line.startswith('#CHROM'):
+        if line_beginning == b'#CHROM':
+            line = mapped_vcf[line_start:next_line_start].decode()
             parsed_line = line.split('\t')
             header_info = parsed_line[:8]
-            header_info = ('\t'.join(map(str,header_info)))
+            header_info = ('\t'.join(header_info))
             indel_log_file.write("Chromosome\tStart_INDEL_Zone\tStop_INDEL_Zone\t" + header_info + "\n")
 
             #indel_log_file.write("Start\tStop\t
     
-        elif line.startswith(("##", "#", " #", "'#", '"##')):
+        # Comment lines start with '#' (a few tools quote or indent them, those are only
+        # checked when the first character could start one, so data lines cost one compare)
+        elif line_beginning[:1] == b'#' or (line_beginning[:1] in b" '\""
+                                             and line_beginning.startswith((b" #", b"'#", b'"##'))):
                     pass
                 
         else:
-            parsed_line  = line.rstrip().split('\t')
+            # Locating the FILTER column (after the 6th tab) without splitting the line
+            filter_start = line_start
+            for column in range(6):
+                filter_start = mapped_vcf.find(b'\t', filter_start, line_end) + 1
+                if filter_start == 0:
+                    break
+
+            # Skipping variants that did not "PASS" without decoding them
+            if filter_start > 0:
+                filter_end = mapped_vcf.find(b'\t', filter_start, line_end)
+                if filter_end != -1 and mapped_vcf[filter_start:filter_end] != b'PASS':
+                    continue
+
+            line = mapped_vcf[line_start:next_line_start].decode()
+
+            # Only the fixed variant columns are needed (sample columns left unsplit)
+            parsed_line  = line.rstrip().split('\t', 8)
             # Is looking at the column called FILTER-- if "PASS" it passed all GATK filters, if failed
             # will list the filter it failed examples DP=filtered depth issue 
             if parsed_line[6] != 'PASS':  #This filter removes TONS of samples
@@ -1003,59 +632,88 @@ def identify_INDEL_Regions(output_file_location, input_vcf, exclusion_region_len
                 #find the INDELs in either Ref or Alt using for loops
                 Indel= 0
                 for i in alleleR:
-                    i = i.rstrip('"')
-                    i = i.lstrip('"')
+                    i = i.strip('"')
                     if len(i) > 1:
-                        indel_lengths_list.append(len(i))
+                        indel_length = len(i)
+                        number_indels_identified += 1
+                        total_indel_length += indel_length
+                        if indel_length > longest_indel:
+                            longest_indel = indel_length
+                        if indel_length < shortest_indel:
+                            shortest_indel = indel_length
                         Indel += 1
                 #Identify alternative alleles where indels or a deletion (asterix symbol)
                 for j in alleleA:
-                    j = j.rstrip('"')
-                    j = j.lstrip('"')
+                    j = j.strip('"')
                     if len(j) > 1 or j=="*":
                         Indel += 1
+                        # A deletion (asterix symbol) is recorded with a length of -1
                         if len(j) > 1:
-                            indel_lengths_list.append(len(j))
+                            indel_length = len(j)
                         else:
-                            indel_lengths_list.append(-1)
+                            indel_length = -1
+                        number_indels_identified += 1
+                        total_indel_length += indel_length
+                        if indel_length > longest_indel:
+                            longest_indel = indel_length
+                        if indel_length < shortest_indel:
+                            shortest_indel = indel_length
                         
                 #Adds the Indel to a list and calculates the foward and reverse distance of it
                 if Indel > 0:
-                    indel_exclusion_regions.append([])
-                    indel_exclusion_regions[no_of_exclusions].append(parsed_line[0])
-                    indel_exclusion_regions[no_of_exclusions].append(int(parsed_line[1]) - exclusion_region_length)
-                    indel_exclusion_regions[no_of_exclusions].append(int(parsed_line[1]) + exclusion_region_length)
+                    start_exclusion_zone = int(parsed_line[1]) - exclusion_region_length
+                    stop_exclusion_zone = int(parsed_line[1]) + exclusion_region_length
+
+                    exclusion_regions.append((parsed_line[0], start_exclusion_zone, stop_exclusion_zone))
 
                     #Counter for number of exclusions
                     no_of_exclusions += 1
 
                     #Write Info to Log file 
-                    start_exclusion_zone = int(parsed_line[1]) - exclusion_region_length
-                    stop_exclusion_zone = int(parsed_line[1]) + exclusion_region_length
 
                     indel_log_file.write(parsed_line[0] + "\t" + str(start_exclusion_zone)
                                          + "\t" + str(stop_exclusion_zone) +"\t")
 
                     variant_data = (parsed_line[:8])
-                    variant_data = ('\t'.join(map(str,variant_data)))
+                    variant_data = ('\t'.join(variant_data))
 
                     indel_log_file.write(variant_data + "\n")
                              
+    if file_size > 0:
+        mapped_vcf.close()
     vcf_input_file.close()  
     indel_log_file.close()
 
+    # Sorting all regions by chromosome then start and merging overlapping regions into each
+    # chromosome's lists of starts and stops, so each variant is checked by one binary search
+    exclusion_regions.sort()
+    indel_exclusion_regions = {}
+    for chromosome, start_exclusion_zone, stop_exclusion_zone in exclusion_regions:
+        chromosome_exclusion_regions = indel_exclusion_regions.get(chromosome)
+
+        # First region on the chromosome
+        if chromosome_exclusion_regions is None:
+            indel_exclusion_regions[chromosome] = ([start_exclusion_zone], [stop_exclusion_zone])
+            continue
+
+        region_starts, region_stops = chromosome_exclusion_regions
+
+        # A region starting before the stop of the previous zone is merged into it
+        # (zones exclude their own start and stop, so touching regions stay separate)
+        if start_exclusion_zone < region_stops[-1]:
+            if stop_exclusion_zone > region_stops[-1]:
+                region_stops[-1] = stop_exclusion_zone
+        else:
+            region_starts.append(start_exclusion_zone)
+            region_stops.append(stop_exclusion_zone)
+
     
     # indel stats dictionary
 
     # Note: some variants have multiple indels, so number of indels will be different
     # from number of indel regions
-    number_indels_identified = len(indel_lengths_list)
-
-    
     if number_indels_identified > 0:
-        longest_indel = max(indel_lengths_list)
-        shortest_indel = min(indel_lengths_list)
-        average_indel = sum(indel_lengths_list)/len(indel_lengths_list)
+        average_indel = total_indel_length/number_indels_identified
 
     # Small datasets may not have any indels (safety built in)
     else:
@@ -1074,7 +732,148 @@ def identify_INDEL_Regions(output_file_location, input_vcf, exclusion_region_len
     return {'indel_exclusion_regions':indel_exclusion_regions, 'no_of_exclusions':no_of_exclusions,
             'indel_stats_dict': indel_stats_dict}
 
-def testing_variant_counts(parsed_line, min_total_read_count):
+
+class SampleReadCounts(NamedTuple):
+
+    """
+
+    Parsed sample data and read counts of a variant (returned by parse_sample_read_counts),
+    array fields have one slot per sample
+
+    """
+
+    samples_data: list
+    genotype_fields: list
+    ref_counts: np.ndarray
+    total_counts: np.ndarray
+    low_read_count_mask: np.ndarray
+    low_freq_count_mask: np.ndarray
+    no_data_mask: np.ndarray
+    count_pair_mask: np.ndarray
+    heterozygous_mask: np.ndarray
+    homozygous_ref_mask: np.ndarray
+    homozygous_alt_mask: np.ndarray
+
+
+def parse_sample_read_counts(parsed_line, min_total_read_count):
+
+    """
+
+    Splits the genotype data of every sample for a variant ONCE and stores the
+    allele read counts as int32 arrays (one slot per sample), so the read count
+    filters are run on all samples of the variant at once and both
+    testing_variant_counts and parse_filter_and_binomial_test can share the results
+
+    : Param parsed_line: Line of data (variant) being examined
+    : Param min_total_read_count: Minimum per sample read count
+
+    : Return samples_data: Sample data with quotes removed
+    : Return genotype_fields: Genotype information for each sample as (genotype, genotype counts,
+        allele one, allele two), None if sample has no data
+    : Return ref_counts: Reference allele read counts (0 if sample has no pair of counts)
+    : Return total_counts: Total allele read counts (single reported count if sample has no
+        pair of counts, 0 if sample has no data)
+    : Return low_read_count_mask: Samples with total counts below the minimum read count
+    : Return low_freq_count_mask: Samples with lowest allele count <= 1% of the total counts
+    : Return no_data_mask: Samples with no genotype or no genotype counts recorded
+    : Return count_pair_mask: Samples with a pair of counts (ex: '135,464') loaded
+    : Return heterozygous_mask: Samples with two different alleles (ex: '0/1')
+    : Return homozygous_ref_mask: Samples homozygous for the reference allele ('0/0')
+    : Return homozygous_alt_mask: Samples homozygous for the alternative allele ('1/1')
+
+    """
+
+    # Quote marks were already stripped from the samples when the line was split
+    samples_data = parsed_line[9:]
+    numb_samples = len(samples_data)
+
+    genotype_fields = []
+    ref_counts = np.zeros(numb_samples, dtype=np.int32)
+    alt_counts = np.zeros(numb_samples, dtype=np.int32)
+    single_counts = np.zeros(numb_samples, dtype=np.int32)
+    no_data_mask = np.zeros(numb_samples, dtype=bool)
+    count_pair_mask = np.zeros(numb_samples, dtype=bool)
+    heterozygous_mask = np.zeros(numb_samples, dtype=bool)
+    homozygous_ref_mask = np.zeros(numb_samples, dtype=bool)
+    homozygous_alt_mask = np.zeros(numb_samples, dtype=bool)
+
+    # Pairs of counts (ex: '135,464') are gathered and converted to numbers all at once
+    ref_count_strings = []
+    alt_count_strings = []
+
+    for x in range(numb_samples):
+
+        #get the genotype and genotype counts for each sample, only the first two fields are needed
+        #(ex: '0/1' and '135,464' from '0/1:135,464:605:99:11857,0,2154')
+        genotype, separator, remaining_fields = samples_data[x].partition(':')
+
+        # Verify genotype data contains more information other files may not
+        if not separator:
+            genotype_fields.append(None)
+            no_data_mask[x] = True
+            continue
+
+        genotype_counts = remaining_fields.partition(':')[0]
+
+        #Skipping all no recorded genotype values
+        if genotype == './.':
+            genotype_fields.append((genotype, genotype_counts, None, None))
+            no_data_mask[x] = True
+            continue
+
+        #get the alleles for a genotype (ex: '0' and '1'), single digit alleles are read directly
+        if len(genotype) == 3 and genotype[1] == '/':
+            allele_one = genotype[0]
+            allele_two = genotype[2]
+        else:
+            alleles = genotype.split('/')
+            allele_one = alleles[0]
+            allele_two = alleles[1]
+
+        genotype_fields.append((genotype, genotype_counts, allele_one, allele_two))
+        if allele_one != allele_two:
+            heterozygous_mask[x] = True
+        elif allele_one == '0':
+            homozygous_ref_mask[x] = True
+        elif allele_one == '1':
+            homozygous_alt_mask[x] = True
+
+        # Dealing with empty genotyping counts values
+        if genotype_counts == './.' or genotype_counts == '.':
+            no_data_mask[x] = True
+
+        # Genotypes with a pair of counts (ex: '135,464') get loaded, only the first two
+        # counts are used (ex: '10,20' from '10,20,0')
+        elif len(genotype_counts) > 1:
+            genotyping_counts = genotype_counts.split(',', 2)
+            ref_count_strings.append(genotyping_counts[0])
+            alt_count_strings.append(genotyping_counts[1])
+            count_pair_mask[x] = True
+
+        # Homozygous reads with only one reported count (occurs sometimes in data)
+        else:
+            single_counts[x] = int(genotype_counts)
+
+    # Converting all pairs of counts at once (ex: '135' and '464' -> 135 and 464)
+    if ref_count_strings:
+        ref_counts[count_pair_mask] = list(map(int, ref_count_strings))
+        alt_counts[count_pair_mask] = list(map(int, alt_count_strings))
+
+    #Gets the allele total (ex: 135 + 464 = 599)
+    total_counts = ref_counts + alt_counts + single_counts
+
+    # Finds the lowest non-zero allele count of each sample
+    lowest_allele_counts = np.where((ref_counts > 0) & (alt_counts > 0),
+                                    np.minimum(ref_counts, alt_counts), np.maximum(ref_counts, alt_counts))
+
+    return SampleReadCounts(samples_data, genotype_fields, ref_counts, total_counts,
+                            total_counts < min_total_read_count,
+                            lowest_allele_counts <= (0.01*total_counts),
+                            no_data_mask, count_pair_mask, heterozygous_mask,
+                            homozygous_ref_mask, homozygous_alt_mask)
+
+
+def testing_variant_counts(read_counts):
     
     """
 
@@ -1082,128 +881,132 @@ def testing_variant_counts(parsed_line, min_total_read_count):
     Various filtering criterias are applied to see if the variant is "testable."
     Can only examine bi-allelic samples 
     
-    : Param Parsed_line: Line of data (variant) being examined
+    : Param read_counts: Parsed sample data and read counts of the variant (parse_sample_read_counts)
     
-    : Return Dictionary: Dictionary of various results from the variant analysis
+    : Return VariantCounts: Verdict and counters of various results from the variant analysis
     
     """
 
-    #Variants starts as 'fail' if it makes it through the list will become 'pass'
-    verdict = 'fail'
+    # Samples with data, each sample is only counted for the first filter it fails
+    has_data_mask = ~read_counts.no_data_mask
+
+    #if the number of alleles is less than user input (standard value = 20) stop analysis
+    low_read_count_mask = has_data_mask & read_counts.low_read_count_mask
+    checked_mask = has_data_mask & ~low_read_count_mask
+
+    # Checks to see minimum allele is < (1% of total alleles for bi-allelic samples
+    # Issue with this trigger is monoallelic samples that get one biallelic count
+    low_freq_count_mask = (checked_mask & read_counts.count_pair_mask
+                           & read_counts.heterozygous_mask & read_counts.low_freq_count_mask)
+    checked_mask &= ~low_freq_count_mask
+
+    ####################Testing##############
+    #comparing genotypes if homozygous ref or alt stops (ASE detection only heterzygous SNPs)
+    homozygous_ref_mask = checked_mask & read_counts.homozygous_ref_mask
+    homozygous_alt_mask = checked_mask & read_counts.homozygous_alt_mask
+    ########################################
+
+    #Variants starts as 'fail' if one sample passed all thresholds---passes and can be tested
+    if np.any(checked_mask & ~homozygous_ref_mask & ~homozygous_alt_mask):
+        verdict = 'pass'
+    else:
+        verdict = 'fail'
 
     #Local Counters---so if all samples show behavior triggers larger counter
-    homozygous_ref_variant_local_counter = 0
-    homozygous_alt_variant_local_counter = 0
-    low_read_count_local_counter = 0
-    low_freq_count_local_counter = 0
-    no_value = 0
-    
-    #Testable Variants Counter
-    testable_SNPs = 0
+    homozygous_ref_variant_local_counter = int(np.count_nonzero(homozygous_ref_mask))
+    homozygous_alt_variant_local_counter = int(np.count_nonzero(homozygous_alt_mask))
+    low_read_count_local_counter = int(np.count_nonzero(low_read_count_mask))
+    low_freq_count_local_counter = int(np.count_nonzero(low_freq_count_mask))
+    no_value = len(has_data_mask) - int(np.count_nonzero(has_data_mask))
 
-    #starts the range of i to capture all samples genotype information
-    #format for each sample genotype is (GT:AD:DP:GQ:PL)
-    for sample in parsed_line[9:]:
-        sample = sample.rstrip('"')
-        sample = sample.lstrip('"')
+    return VariantCounts(verdict, homozygous_ref_variant_local_counter,
+                         homozygous_alt_variant_local_counter,
+                         low_read_count_local_counter,
+                         low_freq_count_local_counter,
+                         no_value)
 
-        # Verify genotype data contains more information other files may not
-        if sample.count(':'):
-            
-        #get the genotype information as a list for each sample (ex: ['0/1', '135,464', '605', '99', '11857,0,2154'])
-            genotyping_information = sample.split(':')
 
-            #Skipping all no recorded genotype values
-            if genotyping_information[0] == './.':
-                no_value += 1
-                #print ("No Record")
-                continue
-    
-            #get the alleles for a genotype (ex: ['0', '1'])
-            alleles = genotyping_information[0].split('/')
+# Largest number of other tail outcomes binomial_test_pvalues lays out at once, samples are
+# tested in batches below this size (a deeper sample on its own is tested alone)
+BINOMIAL_TEST_MAX_OUTCOMES = 1 << 18
 
-            #Returning the physical genotype values
-            allele_one=(alleles[0])
-            allele_two=(alleles[1])
 
-            # Dealing with empty genotyping counts values
-            if genotyping_information[1] == './.' or genotyping_information[1] == '.':
-                no_value += 1
-                continue
+def binomial_test_pvalues(reference_counts, total_counts, binomial_probability_value):
 
-            #get the count of the genotype counts (ex: ['135', '464'])
-            if len(genotyping_information[1]) > 1: 
-                genotyping_counts = genotyping_information[1].split(',')
-            
-                #Gets the allele total (ex: 135 + 464 = 599)
-                total_counts = int(genotyping_counts[0])+int(genotyping_counts[1])
+    """
 
-                #if the number of alleles is less than user input (standard value = 20) stop analysis
-                if total_counts < min_total_read_count:
-                    low_read_count_local_counter+= 1
-                    #print ("Number of Reads Too Low")
-                    continue
+    Performs the two-sided exact binomial test for many samples at once, same calculation
+    as the SciPy binom_test (p-value is the probability of all outcomes no more likely than
+    the observed count), but with one call of each SciPy distribution function for all samples
 
-                #Allele count for individuals [alt, ref] (ex: 464, 135)
-                count_list = []
-
-                # Note: alleles get loaded alternate first followed by reference
-                if int(genotyping_counts[0]) > 0:
-                    count_list.append(int(genotyping_counts[0]))
-                    
-                if int(genotyping_counts[1]) > 0:
-                    count_list.append(int(genotyping_counts[1]))
-                    
-                # Finds the minimum in the list
-                lowest_allele_count = min(count_list)
-
-                # Checks to see minimum allele is < (1% of total alleles for bi-allelic samples
-                # Issue with this trigger is monoallelic samples that get one biallelic count
-                if lowest_allele_count <= (0.01*total_counts) and allele_one != allele_two:
-                    low_freq_count_local_counter+=1
-                    #print ("Lowest Allele Count Too Low")
-                    continue
+    Reference website for test
+    https://docs.scipy.org/doc/scipy/reference/generated/scipy.stats.binom_test.html
 
-            # Dealing with homozygous reads with only one reported count (occurs sometimes)
-            else:
-                if int(genotyping_information[1]) < min_total_read_count:    
-                    low_read_count_local_counter+= 1
-                    #print ("Number of Reads Too Low")
-                    continue
+    : Param reference_counts: Reference allele read counts
+    : Param total_counts: Total read counts (reference + alternative)
+    : Param binomial_probability_value: Probability value for the test
 
-            ####################Testing##############
-            #Returning the physical genotype values
-            allele_one=(alleles[0])
-            allele_two=(alleles[1])
+    : Return pvalues: Binomial test p-values (same order as the counts)
 
-            #comparing genotypes if homozygous ref stops (ASE detection only heterzygous SNPs)
-            if (allele_one == allele_two and allele_one == '0'):
-                homozygous_ref_variant_local_counter+= 1
-                continue
+    """
 
-            #comparing genotypes if homozygous alt stops (ASE detection only heterzygous SNPs)
-            if (allele_one == allele_two and allele_one == '1'):
-                homozygous_alt_variant_local_counter+= 1
-                continue
-            ########################################
-      
-            # sample passed all thresholds---passes and can be tested
-            verdict = 'pass'
+    reference_counts = np.asarray(reference_counts, dtype=np.int64)
+    total_counts = np.asarray(total_counts, dtype=np.int64)
+    p = binomial_probability_value
 
-        # Dealing with no data issue (like NO DATA found)
-        else:
-            no_value += 1
-            #print ("No Record")
-            continue
-                                
-    return {'verdict': verdict, 'homozygous_ref_variant_local_counter': homozygous_ref_variant_local_counter,
-            'homozygous_alt_variant_local_counter': homozygous_alt_variant_local_counter,
-            'low_read_count_local_counter': low_read_count_local_counter,
-            'low_freq_count_local_counter': low_freq_count_local_counter,
-            'no_value': no_value} 
+    # Counts matching the expected count have a p-value of 1
+    pvalues = np.ones(reference_counts.size)
+    expected_counts = p * total_counts
+    lower_tail = reference_counts < expected_counts
+    upper_tail = reference_counts > expected_counts
+
+    # Probability of the observed count (with the same relative error allowance as SciPy)
+    observed_probabilities = stats.binom.pmf(reference_counts, total_counts, p) * (1 + 1e-7)
+
+    # Outcomes on the other side of the expected count (ex: ceil(p*n) to n for a low count)
+    tail_starts = np.where(lower_tail, np.ceil(expected_counts), 0)
+    tail_stops = np.where(lower_tail, total_counts + 1, np.floor(expected_counts) + 1)
+    tail_lengths = np.where(lower_tail | upper_tail, tail_stops - tail_starts, 0).astype(np.int64)
+
+    # Number of other tail outcomes no more likely than the observed count, the samples' outcomes
+    # are laid out in one array per batch of at most BINOMIAL_TEST_MAX_OUTCOMES outcomes
+    numb_less_likely = np.zeros(reference_counts.size, dtype=np.int64)
+    tail_ends = np.cumsum(tail_lengths)
+    batch_start = 0
+    while batch_start < reference_counts.size:
+
+        # Samples whose outcomes fit in the batch (always at least one sample)
+        batch_outcomes_start = tail_ends[batch_start] - tail_lengths[batch_start]
+        batch_stop = max(int(np.searchsorted(tail_ends, batch_outcomes_start + BINOMIAL_TEST_MAX_OUTCOMES,
+                                             side='right')), batch_start + 1)
+        batch_tail_lengths = tail_lengths[batch_start:batch_stop]
+
+        # Outcomes of the batch (owners = sample of each outcome within the batch)
+        owners = np.repeat(np.arange(batch_tail_lengths.size), batch_tail_lengths)
+        offsets = np.arange(owners.size) - np.repeat(tail_ends[batch_start:batch_stop] - batch_tail_lengths
+                                                     - batch_outcomes_start, batch_tail_lengths)
+        tail_outcomes = tail_starts[batch_start:batch_stop][owners] + offsets
+
+        less_likely = (stats.binom.pmf(tail_outcomes, total_counts[batch_start:batch_stop][owners], p)
+                       <= observed_probabilities[batch_start:batch_stop][owners])
+        numb_less_likely[batch_start:batch_stop] = np.bincount(owners[less_likely],
+                                                               minlength=batch_tail_lengths.size)
+        batch_start = batch_stop
+
+    # Sum of both tails
+    pvalues[lower_tail] = (stats.binom.cdf(reference_counts[lower_tail], total_counts[lower_tail], p)
+                           + stats.binom.sf(total_counts[lower_tail] - numb_less_likely[lower_tail],
+                                            total_counts[lower_tail], p))
+    pvalues[upper_tail] = (stats.binom.cdf(numb_less_likely[upper_tail] - 1, total_counts[upper_tail], p)
+                           + stats.binom.sf(reference_counts[upper_tail] - 1, total_counts[upper_tail], p))
+
+    pvalues = np.minimum(pvalues, 1.0)
+
+    return(pvalues)
 
 
-def parse_filter_and_binomial_test(filtered_rna_seq_file, parsed_line, parameter_stuff):
+def parse_filter_and_binomial_test(filtered_rna_seq_file, parsed_line, read_counts,
+                                   binomial_probability_value):
 
     """
 
@@ -1212,214 +1015,225 @@ def parse_filter_and_binomial_test(filtered_rna_seq_file, parsed_line, parameter
     filters and was further analyzed for ASE.
     
     : Param filtered_rna_seq_file: Filtered file being written
-    : Param paramter_stuff: Input paramter variables for testing
     : Param parsed_line: Variant data from file
+    : Param read_counts: Parsed sample data and read counts of the variant (parse_sample_read_counts)
+    : Param binomial_probability_value: Expected probability of the binomial test
     
     : Return NONE
 
     """
 
-    # Input parameters for program
-    min_total_read_count = int(parameter_stuff['min_total_read_count'])
-    binomial_probability_value = float(parameter_stuff['binomial_probability_value'])
-
+    # Columns of the filtered line are collected and written out once per variant
     variant_info = parsed_line[:8]
-    variant_info = ('\t'.join(map(str,variant_info)))
-    filtered_rna_seq_file.write(variant_info+"\t")
-    filtered_rna_seq_file.write("Verdict:Genotype:Counts:Binomial_P_value\t")
-
-    for sample in parsed_line[9:]:
-        sample = sample.rstrip('"')
-        sample = sample.lstrip('"')
+    line_columns = variant_info
+    line_columns.append("Verdict:Genotype:Counts:Binomial_P_value")
+
+    # Split genotype information, read counts and read count filters for all samples
+    samples_data = read_counts.samples_data
+    genotype_fields = read_counts.genotype_fields
+    ref_counts = read_counts.ref_counts
+    total_counts = read_counts.total_counts
+    low_read_count_mask = read_counts.low_read_count_mask
+    low_freq_count_mask = read_counts.low_freq_count_mask
+
+    # Biallelic samples passing every filter are binomial tested all together
+    biallelic_mask = (read_counts.count_pair_mask & read_counts.heterozygous_mask
+                      & ~low_read_count_mask & ~low_freq_count_mask)
+    binomial_pvalues = np.ones(len(genotype_fields))
+    binomial_pvalues[biallelic_mask] = binomial_test_pvalues(ref_counts[biallelic_mask],
+                                                             total_counts[biallelic_mask],
+                                                             binomial_probability_value)
+    binomial_pvalues = binomial_pvalues.tolist()
+
+    for x in range(len(genotype_fields)):
+
+        #get the genotype information for each sample (ex: ('0/1', '135,464', '0', '1'))
+        genotyping_information = genotype_fields[x]
 
         # Verify genotype data contains more information other files may not
-        if sample.count(':'):
-
-            #get the genotype information as a list for each sample (ex: ['0/1', '135,464', '605', '99', '11857,0,2154'])
-            genotyping_information = sample.split(':')
+        if genotyping_information is not None:
 
             #Skipping all no recorded genotype values
             if genotyping_information[0] == './.':
                 # Write to file and move on
-                filtered_rna_seq_file.write("No_Data:" + str(genotyping_information[0])
-                                            + ":" + str(genotyping_information[0]) + ":NA\t")
+                line_columns.append(f"No_Data:{genotyping_information[0]}:{genotyping_information[0]}:NA")
                 continue
 
             # Dealing with empty genotyping counts values
             if genotyping_information[1] == './.' or genotyping_information[1] == '.':
-                filtered_rna_seq_file.write("No_Data:" + str(genotyping_information[0])
-                                            + ":" + str(genotyping_information[0]) + ":NA\t")
+                line_columns.append(f"No_Data:{genotyping_information[0]}:{genotyping_information[0]}:NA")
                 continue
 
 
-            #get the count of the genotype counts (ex: ['135', '464'])
+            # Pair of genotype counts (ex: '135,464') already loaded into the count arrays
             if len(genotyping_information[1]) > 1:
-                
-                genotyping_counts = genotyping_information[1].split(',')
-            
-                #get the alleles for a genotype (ex: ['0', '1'])
-                alleles = genotyping_information[0].split('/')
 
                 #Returning the physical genotype values, so can be later used to INDEX the data for
                 #SNPs with 2 alternative alleles
-                allele_one=(alleles[0])
-                allele_two=(alleles[1])
-
-                #get the count of the genotype counts (ex: ['135', '464'])
-                genotyping_counts = genotyping_information[1].split(',')
-
-                #Gets the allele total (ex: 135 + 464 = 599)
-                total_counts = int(genotyping_counts[0])+int(genotyping_counts[1])
+                allele_one = genotyping_information[2]
+                allele_two = genotyping_information[3]
 
                 # Flagging and Filtering homozygous SNPs with issues
                 if allele_one == allele_two:
 
                     #if the number of alleles is less than user input (standard value = 20) stop analysis
-                    if total_counts < min_total_read_count:
-                        filtered_rna_seq_file.write("Homo_Low_Count:"+str(genotyping_information[0])
-                                                    +":"+str(genotyping_information[1])+":NA\t")
+                    if low_read_count_mask[x]:
+                        line_columns.append(f"Homo_Low_Count:{genotyping_information[0]}:{genotyping_information[1]}:NA")
                         continue
 
                     else:
-                       filtered_rna_seq_file.write("Homo:"+str(genotyping_information[0])
-                                                    +":"+str(genotyping_information[1])+":NA\t")
+                       line_columns.append(f"Homo:{genotyping_information[0]}:{genotyping_information[1]}:NA")
                        continue
 
                 # Filtering Low Count Biallelic Variants
-                if total_counts < min_total_read_count:
-                        filtered_rna_seq_file.write("Low_Read_Count:"+str(genotyping_information[0])
-                                                    +":"+str(genotyping_information[1])+":NA\t")
+                if low_read_count_mask[x]:
+                        line_columns.append(f"Low_Read_Count:{genotyping_information[0]}:{genotyping_information[1]}:NA")
                         continue
 
                 # Filtering and Testing Biallelic Variants
                 else:
-                    
-                    # Allele count for individuals [alt, ref] (ex: 464, 135)
-                    count_list = []
-
-                    # Built in for safety, only really affected homozygous SNPs in other programs
-                    # Note: alleles get loaded alternate first followed by reference
-                    if int(genotyping_counts[0]) > 0:
-                        count_list.append(int(genotyping_counts[0]))
-                    if int(genotyping_counts[1]) > 0:
-                        count_list.append(int(genotyping_counts[1]))
-                    
-                    # Finds the minimum in the list
-                    lowest_allele_count = min(count_list)
                 
                     # Checks to see minimum allele is < (1% of total alleles for bi-allelic samples
                     # Issue with this trigger is monoallelic samples that get one biallelic count
-                    if lowest_allele_count <= (0.01*total_counts) and allele_one != allele_two:
-                        filtered_rna_seq_file.write("Low_Allele_Count:" +str(genotyping_information[0])
-                                                +":"+str(genotyping_information[1])+ ":NA\t")
+                    if low_freq_count_mask[x] and allele_one != allele_two:
+                        line_columns.append(f"Low_Allele_Count:{genotyping_information[0]}:{genotyping_information[1]}:NA")
                         continue
 
-                    # Performs the SciPy Binominal test
-                    # Reference website for test
-                    # https://docs.scipy.org/doc/scipy/reference/generated/scipy.stats.binom_test.html
-                    pvalue = (stats.binom_test(int(genotyping_counts[0]),total_counts, binomial_probability_value))
-                    filtered_rna_seq_file.write("Biallelic:" +str(genotyping_information[0])
-                                                +":"+str(genotyping_information[1])+ ":" + str(pvalue)+ "\t")
+                    # SciPy Binominal test result (tested above)
+                    pvalue = binomial_pvalues[x]
+                    line_columns.append(f"Biallelic:{genotyping_information[0]}:{genotyping_information[1]}:{pvalue}")
 
             # Dealing with homozygous reads with only one reported count (occurs sometimes in data)
             else:
-                if int(genotyping_information[1]) < min_total_read_count:    
-                    filtered_rna_seq_file.write("Homo_Low_Count:"+str(genotyping_information[0])
-                                                    +":"+str(genotyping_information[1])+":NA\t")
+                if low_read_count_mask[x]:
+                    line_columns.append(f"Homo_Low_Count:{genotyping_information[0]}:{genotyping_information[1]}:NA")
                     continue
 
                 else:
-                    filtered_rna_seq_file.write("Homo:"+str(genotyping_information[0])
-                                                    +":"+str(genotyping_information[1])+":NA\t")
+                    line_columns.append(f"Homo:{genotyping_information[0]}:{genotyping_information[1]}:NA")
                     continue
                 
         # Dealing with bad data that has no reported values (./.)
         else:
-            sample = sample.rstrip('\n')
-            filtered_rna_seq_file.write("No_Data:"+str(sample) + ":NA:NA\t")
+            sample = samples_data[x].rstrip('\n')
+            line_columns.append(f"No_Data:{sample}:NA:NA")
         
-    filtered_rna_seq_file.write("\n")
+    line_columns.append("\n")
+    filtered_rna_seq_file.write('\t'.join(line_columns))
 
     return()
 
 
-def filter_RNA_Seq_Data(parameter_stuff):
+# Smallest VCF file (bytes) filtered by several processes, smaller files are filtered in one
+PARALLEL_FILTER_MIN_FILE_SIZE = 64 * 1024 * 1024
+
+
+class RawRNASeqStats:
 
     """
 
-    Filters the raw RNA-Seq data using various parameters to create a testable filtered dataset that
-    furthered analyzed for ASE
+    Counters of the filtering process (filter_RNA_Seq_Data), all start at 0 and
+    are read and incremented as attributes (ex: raw_rna_seq_stats.variants_in_file += 1)
 
-    : Param input_file: Input RNA-Seq VCF file being filtered
-    : Param exclusion_region_length: Length of the region surrounding indels to filter neighboring SNPs
-    : Param quality_score_min: Minimum quality score to filter a variant
-    : Param min_total_read_count: Minimum per sample read count
+    """
+
+    __slots__ = ('variants_in_file', 'no_of_individuals_in_file',
+                 'failed_GATK_SNP_filter', 'failed_Qual_filter',
+                 'numb_SNPs_excl_Indels',
+                 'ref_allele_mutiple_forms', 'alt_allele_mutiple_forms',
+                 'no_genotype_values', 'low_read_count', 'low_freq_count',
+                 'combo_filter_failure',
+                 'no_indel_exclusion_regions',
+                 'no_ref_homozygous_variants',
+                 'no_alt_homozygous_variants',
+                 'no_combo_homozygous_variants',
+                 'passing_variants')
+
+    def __init__(self):
+        for counter in self.__slots__:
+            setattr(self, counter, 0)
 
-    : Return filtered_rna_seq_file_name: Name of the filtered file to use later in the program
-    : Return raw_rna_seq_stats: Stats about the overall filtering process
-    : Return indel_stats_dict: Statistics about the indels in the vcf file
+
+def open_filtering_results_files(output_file_location, part_suffix=""):
 
     """
 
-    # Get variables from parameter file
-    input_file = parameter_stuff['file_name']
-    indel_exclusion_region_length = int(parameter_stuff['indel_exclusion_region_length'])
-    #min_numb_of_samples = int(parameter_stuff['min_numb_of_samples'])
-    numb_ref_alleles_allowed = int(parameter_stuff['numb_ref_alleles_allowed'])
-    numb_alt_alleles_allowed = int(parameter_stuff['numb_alt_alleles_allowed'])
-    quality_score_min = int(parameter_stuff['quality_score_min'])
-    min_total_read_count = int(parameter_stuff['min_total_read_count'])
-    output_file_location = parameter_stuff['output_file_location']
-
-    # Get the RNA_Seq File Name With Extra Pathway Stuff
-    rna_seq_file = input_file
-    # Strips pathway from file name
-    rna_seq_file_name = get_file_name (rna_seq_file)
-
-    # Open file
-    rna_seq_file = open (input_file, 'r')
+    Opens the files the filtering results are written to (large write buffers, the
+    variants are written one line at a time)
+
+    : Param output_file_location: Output directory of the program
+    : Param part_suffix: Added to the file names when writing one part of the results
+
+    : Return filtered_rna_seq_file: Passed variants to be tested
+    : Return gatk_failure_file_out: Variants failing the GATK filter (written as bytes)
+    : Return other_failure_file_out: Variants failing the other quality controls
+
+    """
 
     #Passed Variants to be Tested
-    filtered_rna_seq_file_name = output_file_location + "/Filtering_Results/Testable_Informative_Filt_Variants.txt"
-    filtered_rna_seq_file = open (filtered_rna_seq_file_name, 'w')
+    filtered_rna_seq_file = open(output_file_location + "/Filtering_Results/Testable_Informative_Filt_Variants.txt"
+                                 + part_suffix, 'w', buffering=1<<20)
 
     #Log file of variants that fail and could NOT be tested (quality controls)
-    gatk_failure_file_out=open(output_file_location + "/Filtering_Results/GATK_Failing_RNA_Seq_variants.txt",'w')
-    other_failure_file_out = open(output_file_location + "/Filtering_Results/Other_Failing_RNA_Seq_variants.txt",'w')
-
-    #File Stats Dictionary
-    raw_rna_seq_stats = {'variants_in_file': 0,
-                        'no_of_individuals_in_file': 0,
-                        'failed_GATK_SNP_filter' : 0, 'failed_Qual_filter': 0,
-                        'numb_SNPs_excl_Indels' : 0,
-                        'ref_allele_mutiple_forms' : 0, 'alt_allele_mutiple_forms': 0,
-                        'no_genotype_values': 0, 'low_read_count': 0, 'low_freq_count': 0,
-                        'combo_filter_failure': 0,
-                        'no_indel_exclusion_regions': 0,
-                        'no_ref_homozygous_variants' : 0,
-                        'no_alt_homozygous_variants' : 0,
-                        'no_combo_homozygous_variants' : 0,
-                        'passing_variants': 0}
-    
+    gatk_failure_file_out = open(output_file_location + "/Filtering_Results/GATK_Failing_RNA_Seq_variants.txt"
+                                 + part_suffix, 'wb', buffering=1<<20)
+    other_failure_file_out = open(output_file_location + "/Filtering_Results/Other_Failing_RNA_Seq_variants.txt"
+                                  + part_suffix, 'w', buffering=1<<20)
 
-    #Identifies the INDEL regions in the dataset based on a certain length
-    indel_data=identify_INDEL_Regions(output_file_location, input_file, indel_exclusion_region_length)
-    indel_exclusion_regions = indel_data['indel_exclusion_regions']
-    no_of_exclusions = indel_data['no_of_exclusions']
-    indel_stats_dict = indel_data['indel_stats_dict']
-    
-    # Tally number of indel regions
-    raw_rna_seq_stats['no_indel_exclusion_regions'] = no_of_exclusions
+    return(filtered_rna_seq_file, gatk_failure_file_out, other_failure_file_out)
+
+
+def filter_variant_lines(mapped_rna_seq, range_start, range_end, indel_exclusion_regions,
+                         quality_score_min, min_total_read_count, binomial_probability_value,
+                         filtered_rna_seq_file, gatk_failure_file_out, other_failure_file_out):
+
+    """
+
+    Filters the lines of the memory-mapped RNA-Seq VCF file between two positions
+    (range starts at the beginning of a line), writing every variant to the
+    passing or failure files and counting the results
+
+    : Param mapped_rna_seq: Memory map of the input VCF file
+    : Param range_start: Position of the first line to filter
+    : Param range_end: Position after the last line to filter
+    : Param indel_exclusion_regions: Merged INDEL exclusion regions of each chromosome
+    : Param quality_score_min: Minimum quality score to filter a variant
+    : Param min_total_read_count: Minimum per sample read count
+    : Param binomial_probability_value: Expected probability of the binomial test
+    : Param filtered_rna_seq_file: Passed variants file being written
+    : Param gatk_failure_file_out: GATK failures file being written
+    : Param other_failure_file_out: Other failures file being written
+
+    : Return raw_rna_seq_stats: Stats about the filtering of these lines
+
+    """
+
+    #File Stats
+    raw_rna_seq_stats = RawRNASeqStats()
+
+    # Exclusion zones of the chromosome currently being read (VCF files are sorted by
+    # chromosome, so the zones are only looked up when the chromosome changes)
+    current_chromosome = None
+    current_exclusion_regions = None
 
+    #Starts parsing through the data (start and end of each line in the memory map)
+    next_line_start = range_start
+    while next_line_start < range_end:
 
-    #Starts parsing through the data
-    for line in rna_seq_file:
+        line_start = next_line_start
+        line_end = mapped_rna_seq.find(b'\n', line_start)
+        if line_end == -1:
+            line_end = range_end
+        next_line_start = line_end + 1
+
+        line_beginning = mapped_rna_seq[line_start:line_start+6]
 
         #Get the header from the file and print to new file
-        if line.startswith("#CHROM"):
+        if line_beginning == b'#CHROM':
+            gatk_failure_file_out.write(b"Failure\t" + mapped_rna_seq[line_start:next_line_start])
+            line = mapped_rna_seq[line_start:next_line_start].decode()
             file_header_info=line
             filtered_rna_seq_file.write(file_header_info)
-            gatk_failure_file_out.write("Failure\t"+line)
             other_failure_file_out.write("Failure\t"+line)
 
             #Getting sample IDs from list
@@ -1428,41 +1242,64 @@ def filter_RNA_Seq_Data(parameter_stuff):
             sample_list=line[9:]
 
             # Cutting the number of individuals in the file
-            raw_rna_seq_stats['no_of_individuals_in_file']= len(sample_list)
+            raw_rna_seq_stats.no_of_individuals_in_file= len(sample_list)
             
-        elif line.startswith(("##", "#", " #", "'#", '"##')):
+        # Comment lines start with '#' (quoted or indented ones are checked only when needed)
+        elif line_beginning[:1] == b'#' or (line_beginning[:1] in b" '\""
+                                             and line_beginning.startswith((b" #", b"'#", b'"##'))):
                     pass
 
         else:
             #Counting the Number of Probes in File
-            raw_rna_seq_stats['variants_in_file']+= 1
+            raw_rna_seq_stats.variants_in_file+= 1
 
-            #Splitting the line
-            parsed_line = line.split("\t")
+            # Locating the FILTER column (after the 6th tab) without splitting the line
+            filter_start = line_start
+            for column in range(6):
+                filter_start = mapped_rna_seq.find(b'\t', filter_start, line_end) + 1
+                if filter_start == 0:
+                    break
+            filter_end = mapped_rna_seq.find(b'\t', filter_start, line_end) if filter_start > 0 else -1
 
             #Removes all SNPs without a filter passing score
+            if filter_end != -1 and mapped_rna_seq[filter_start:filter_end] != b'PASS':
+                raw_rna_seq_stats.failed_GATK_SNP_filter+= 1
+                #writing GATK failures to its own file because SO MANY (written as raw bytes)
+                gatk_failure_file_out.write(b"GATK_Filter\t" + mapped_rna_seq[line_start:next_line_start])
+                continue
+
+            line = mapped_rna_seq[line_start:next_line_start].decode()
+
+            #Splitting the line, only the variant columns are needed for the first filters
+            #(sample columns stay joined, writing the parts back out still gives the line)
+            parsed_line = line.split("\t", 8)
+
+            #Removes all SNPs without a filter passing score (lines too short for the check above)
             if parsed_line[6] != 'PASS':
-                raw_rna_seq_stats['failed_GATK_SNP_filter']+= 1
+                raw_rna_seq_stats.failed_GATK_SNP_filter+= 1
                 failure="GATK_Filter"
                 #writing GATK failures to its own file because SO MANY
-                failure_Report(gatk_failure_file_out, parsed_line, failure)
+                gatk_failure_file_out.write(f"{failure}\t{line}".encode())
                 continue
             
             #Quality score filter of data (QUAL column)
             if float(parsed_line[5]) < quality_score_min:
-                raw_rna_seq_stats['failed_Qual_filter']+= 1
+                raw_rna_seq_stats.failed_Qual_filter+= 1
                 failure="Qual_Score_Filter"
-                failure_Report(other_failure_file_out, parsed_line, failure) 
+                failure_Report(other_failure_file_out, line, failure) 
                 continue
 
             #Filters all SNPs found in INDEL Exclusion Zone
-            exclusion_filter = removeSNPsInExclusionZone(parsed_line, no_of_exclusions, indel_exclusion_regions)
-            parsed_line = exclusion_filter['line_of_data']
-            judregex=exclusion_filter['judging_score']
+            if parsed_line[0] != current_chromosome:
+                current_chromosome = parsed_line[0]
+                current_exclusion_regions = indel_exclusion_regions.get(current_chromosome)
+            exclusion_filter = removeSNPsInExclusionZone(parsed_line, current_exclusion_regions)
+            parsed_line = exclusion_filter.line_of_data
+            judregex=exclusion_filter.judging_score
             if judregex > 0:
-                raw_rna_seq_stats['numb_SNPs_excl_Indels']+= 1
+                raw_rna_seq_stats.numb_SNPs_excl_Indels+= 1
                 failure="Indel_Region"
-                failure_Report(other_failure_file_out, parsed_line, failure)
+                failure_Report(other_failure_file_out, line, failure)
                 continue
 
             #Splitting the Reference Alleles
@@ -1472,9 +1309,9 @@ def filter_RNA_Seq_Data(parameter_stuff):
             # should occur, but built in for safety
             no_Ref_Alleles = len(alleles_Ref)
             if no_Ref_Alleles > 1:
-                raw_rna_seq_stats['ref_allele_mutiple_forms']+= 1
+                raw_rna_seq_stats.ref_allele_mutiple_forms+= 1
                 failure="Multiple_Ref_Alleles"
-                failure_Report(other_failure_file_out, parsed_line, failure)
+                failure_Report(other_failure_file_out, line, failure)
                 continue
 
             #Splitting the Alternative Alleles
@@ -1483,158 +1320,314 @@ def filter_RNA_Seq_Data(parameter_stuff):
             #Filters alternative allele if greater than input threshold alleles
             noAtl = len(alleleA)
             if noAtl > 1:
-                raw_rna_seq_stats['alt_allele_mutiple_forms']+= 1
+                raw_rna_seq_stats.alt_allele_mutiple_forms+= 1
                 failure="To_Many_Alt_Alleles"
-                failure_Report(other_failure_file_out, parsed_line, failure)
+                failure_Report(other_failure_file_out, line, failure)
                 continue
             
+            # Splitting the sample columns now the variant passed the variant filters
+            # (the variant columns are already split and are reused), VCF sample fields are
+            # normally not quoted so one scan of the unsplit columns decides if quote marks
+            # need stripping from the samples
+            if len(parsed_line) > 8:
+                quoted_samples = '"' in parsed_line[8]
+                parsed_line[8:] = parsed_line[8].split("\t")
+                if quoted_samples:
+                    parsed_line[9:] = [sample.strip('"') for sample in parsed_line[9:]]
+
+            # Parsing the sample read counts of the variant once (used for testing and printing)
+            read_counts = parse_sample_read_counts(parsed_line, min_total_read_count)
+
             # Testing if variant can actually be analyzed (one sample biallelic)
-            variant_counts = testing_variant_counts(parsed_line, min_total_read_count)
+            variant_counts = testing_variant_counts(read_counts)
 
             # Various filtering Variables
-            homozygous_ref_variant_local_counter = variant_counts['homozygous_ref_variant_local_counter']
-            homozygous_alt_variant_local_counter = variant_counts['homozygous_alt_variant_local_counter']
-            low_read_count_local_counter = variant_counts['low_read_count_local_counter']
-            low_freq_count_local_counter = variant_counts['low_freq_count_local_counter']
-            no_value_local_counter = variant_counts['no_value']
+            homozygous_ref_variant_local_counter = variant_counts.homozygous_ref_variant_local_counter
+            homozygous_alt_variant_local_counter = variant_counts.homozygous_alt_variant_local_counter
+            low_read_count_local_counter = variant_counts.low_read_count_local_counter
+            low_freq_count_local_counter = variant_counts.low_freq_count_local_counter
+            no_value_local_counter = variant_counts.no_value
 
             # True or False statement for if variant passes and should be examined further
-            verdict = variant_counts['verdict']
+            verdict = variant_counts.verdict
 
-            # Recording the type of failure of data (most SNPs fail for a variety of reasons)
-            noind = len(parsed_line[9:])
+            # Recording the type of failure of data (most SNPs fail for a variety of reasons),
+            # the categories overlap (ex: all Ref Homozygous is also Combo Homozygous) so the
+            # order of the tests below decides the reported failure
+            noind = len(read_counts.samples_data)
 
             if verdict == 'fail':
 
                 if homozygous_ref_variant_local_counter == noind:
-                    raw_rna_seq_stats['no_ref_homozygous_variants'] += 1
+                    raw_rna_seq_stats.no_ref_homozygous_variants += 1
                     failure="All Samples Ref Homozygous"
-                    failure_Report(other_failure_file_out, parsed_line, failure)
+                    failure_Report(other_failure_file_out, line, failure)
                     continue
 
                 if homozygous_alt_variant_local_counter == noind:
-                    raw_rna_seq_stats['no_alt_homozygous_variants'] += 1
+                    raw_rna_seq_stats.no_alt_homozygous_variants += 1
                     failure="All Samples Alt Homozygous"
-                    failure_Report(other_failure_file_out, parsed_line, failure)
+                    failure_Report(other_failure_file_out, line, failure)
                     continue
 
                 # Counting how many variants where failture is due to comboniation of homozygous
                 # alleles
                 if (homozygous_ref_variant_local_counter + homozygous_alt_variant_local_counter) == noind:
-                    raw_rna_seq_stats['no_combo_homozygous_variants'] += 1
+                    raw_rna_seq_stats.no_combo_homozygous_variants += 1
                     failure="All Samples Combo Homozygous"
-                    failure_Report(other_failure_file_out, parsed_line, failure)
+                    failure_Report(other_failure_file_out, line, failure)
                     continue
 
                 if no_value_local_counter == noind:
-                    raw_rna_seq_stats['no_genotype_values'] += 1
+                    raw_rna_seq_stats.no_genotype_values += 1
                     failure="No_Genotype_Value"
-                    failure_Report(other_failure_file_out, parsed_line, failure)
+                    failure_Report(other_failure_file_out, line, failure)
                     continue
                 
                 if low_read_count_local_counter == noind:
-                    raw_rna_seq_stats['low_read_count'] += 1
+                    raw_rna_seq_stats.low_read_count += 1
                     failure="Samples_Low_Read_Count"
-                    failure_Report(other_failure_file_out, parsed_line, failure)
+                    failure_Report(other_failure_file_out, line, failure)
                     continue
 
                 if low_freq_count_local_counter == noind:
-                    raw_rna_seq_stats['low_freq_count']+= 1
+                    raw_rna_seq_stats.low_freq_count+= 1
                     failure="Samples_Low_Freq"
-                    failure_Report(other_failure_file_out, parsed_line, failure)
+                    failure_Report(other_failure_file_out, line, failure)
                     continue
             
                 if (homozygous_ref_variant_local_counter
                     + homozygous_alt_variant_local_counter
                     + low_read_count_local_counter
                     + low_freq_count_local_counter + no_value_local_counter)== noind:
-                    raw_rna_seq_stats['combo_filter_failure']+= 1    
+                    raw_rna_seq_stats.combo_filter_failure+= 1    
                     failure="Sample_Combo_Filter"
-                    failure_Report(other_failure_file_out, parsed_line, failure)
+                    failure_Report(other_failure_file_out, line, failure)
                     continue
 
             # Final Results Print to File for further testing
             else:
-                raw_rna_seq_stats['passing_variants']+= 1
-                parse_filter_and_binomial_test(filtered_rna_seq_file, parsed_line, parameter_stuff)
+                raw_rna_seq_stats.passing_variants+= 1
+                parse_filter_and_binomial_test(filtered_rna_seq_file, parsed_line, read_counts,
+                                               binomial_probability_value)
   
 
-    #Flusing Data if writing slow down
-    rna_seq_file.flush()
-    
-    #Closing Files            
+    return(raw_rna_seq_stats)
+
+
+def filter_variant_lines_part(part_information):
+
+    """
+
+    Filters one part of the RNA-Seq VCF file in a separate process, results are
+    written to part files that are joined back together in order afterwards
+
+    : Param part_information: Tuple of (input file, range start, range end, part suffix,
+        output file location, indel exclusion regions, quality score min,
+        min total read count, binomial probability value)
+
+    : Return raw_rna_seq_stats: Stats about the filtering of this part
+
+    """
+
+    (input_file, range_start, range_end, part_suffix, output_file_location, indel_exclusion_regions,
+     quality_score_min, min_total_read_count, binomial_probability_value) = part_information
+
+    rna_seq_file = open(input_file, 'rb')
+    mapped_rna_seq = mmap.mmap(rna_seq_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    filtered_rna_seq_file, gatk_failure_file_out, other_failure_file_out = (
+        open_filtering_results_files(output_file_location, part_suffix))
+
+    raw_rna_seq_stats = filter_variant_lines(mapped_rna_seq, range_start, range_end, indel_exclusion_regions,
+                                             quality_score_min, min_total_read_count, binomial_probability_value,
+                                             filtered_rna_seq_file, gatk_failure_file_out, other_failure_file_out)
+
+    mapped_rna_seq.close()
     rna_seq_file.close()
     filtered_rna_seq_file.close()
     gatk_failure_file_out.close()
     other_failure_file_out.close()
 
-    return {'filtered_rna_seq_file_name': filtered_rna_seq_file_name, 'raw_rna_seq_stats':raw_rna_seq_stats, 'indel_stats_dict': indel_stats_dict}
-    
+    return(raw_rna_seq_stats)
 
-#########################################################################################################################
-#################################### Sample Multi-dimensional Pvalue Adjustment #########################################
-#########################################################################################################################
 
-def determine_passing_pvalues(lowest_pvalue_list,
-                              fdr_corrected_dict,
-                              multi_dim_adjust_pvalue_cutoff):
+def numb_usable_cpus():
 
     """
 
-    Loops over the dictionary of pvalues using the original
-    uncorrected pvalue list to control order and determines
-    all FDR corrected pvalues that pass the cutoff
-
-    : Param lowest_pvalue_list: list of lowest pvalues
-    : Param fdr_corrected_dict: dictionary of all corrected pvalues
-    : Param multi_dim_adjust_pvalue_cutoff: cutoff for determining p-value significance
+    Number of CPUs this process may run on (respects CPU affinity, for example
+    the cores given to a job on a shared or HPC node, where available)
 
-    : Return count_passing_pvalues: count of all pvalues that pass the cutoff
+    : Return numb_cpus: Number of usable CPUs (at least 1)
 
     """
 
-    # List to store all passing pvalues
-    passing_pvalues = []
+    if hasattr(os, 'sched_getaffinity'):
+        numb_cpus = len(os.sched_getaffinity(0))
+    else:
+        numb_cpus = os.cpu_count() or 1
+
+    return(max(numb_cpus, 1))
+
+
+def filter_RNA_Seq_Data(parameter_stuff):
+
+    """
 
-    # Inex in List Counter for Movement
-    index_in_list_counter = 0
+    Filters the raw RNA-Seq data using various parameters to create a testable filtered dataset that
+    furthered analyzed for ASE
 
-    # Looping over the dictionary
-    for value in lowest_pvalue_list:
+    : Param input_file: Input RNA-Seq VCF file being filtered
+    : Param exclusion_region_length: Length of the region surrounding indels to filter neighboring SNPs
+    : Param quality_score_min: Minimum quality score to filter a variant
+    : Param min_total_read_count: Minimum per sample read count
 
-        # Get the dictionary results part of the list-dictionary combo
-        dictionary_results =(fdr_corrected_dict[index_in_list_counter][1])
+    : Return filtered_rna_seq_file_name: Name of the filtered file to use later in the program
+    : Return raw_rna_seq_stats: Stats about the overall filtering process
+    : Return indel_stats_dict: Statistics about the indels in the vcf file
 
-        # Add to index_in_list_counter now that values have been retrieved
-        index_in_list_counter += 1
+    """
 
-        # Get the original pvalue for double-checking it matches
-        original_pvalue = dictionary_results['original_pvalue']
+    # Get variables from parameter file
+    input_file = parameter_stuff.file_name
+    indel_exclusion_region_length = parameter_stuff.indel_exclusion_region_length
+    quality_score_min = parameter_stuff.quality_score_min
+    min_total_read_count = parameter_stuff.min_total_read_count
+    binomial_probability_value = parameter_stuff.binomial_probability_value
+    output_file_location = parameter_stuff.output_file_location
+
+    # Open file, the file is read through a memory map so variants failing the GATK filter
+    # (most of the file) are written out as raw bytes and never decoded or split
+    rna_seq_file = open (input_file, 'rb')
+    file_size = os.path.getsize(input_file)
+
+    # Empty files can not be memory-mapped
+    if file_size > 0:
+        mapped_rna_seq = mmap.mmap(rna_seq_file.fileno(), 0, access=mmap.ACCESS_READ)
 
-        # Get the adjusted pvalue
-        fdr_pvalue = dictionary_results['adjusted_pvalue']
+    #Passed Variants to be Tested
+    filtered_rna_seq_file_name = output_file_location + "/Filtering_Results/Testable_Informative_Filt_Variants.txt"
 
-        # Safety to kill program if lists being sorted over index order is wrong
-        if original_pvalue != value:
-            print ("P-value Lists Order is not correct, double check code")
-            print ("Killing program")
-            sys.exit(1)
+    #Identifies the INDEL regions in the dataset based on a certain length
+    indel_data=identify_INDEL_Regions(output_file_location, input_file, indel_exclusion_region_length)
+    indel_exclusion_regions = indel_data['indel_exclusion_regions']
+    no_of_exclusions = indel_data['no_of_exclusions']
+    indel_stats_dict = indel_data['indel_stats_dict']
 
-        # Determine if pvalue is below the 0.05 cutoff
-        if fdr_pvalue < float(multi_dim_adjust_pvalue_cutoff):
+    # Large files are split into parts (at line ends) filtered by one process per CPU
+    numb_processes = numb_usable_cpus()
+    if file_size < PARALLEL_FILTER_MIN_FILE_SIZE:
+        numb_processes = 1
 
-            # Add to the list if it passes
-            passing_pvalues.append(fdr_pvalue)
+    if numb_processes == 1:
+        filtered_rna_seq_file, gatk_failure_file_out, other_failure_file_out = (
+            open_filtering_results_files(output_file_location))
 
+        if file_size > 0:
+            raw_rna_seq_stats = filter_variant_lines(mapped_rna_seq, 0, file_size, indel_exclusion_regions,
+                                                     quality_score_min, min_total_read_count,
+                                                     binomial_probability_value, filtered_rna_seq_file,
+                                                     gatk_failure_file_out, other_failure_file_out)
         else:
-            continue
+            raw_rna_seq_stats = RawRNASeqStats()
+
+        filtered_rna_seq_file.close()
+        gatk_failure_file_out.close()
+        other_failure_file_out.close()
+
+    else:
+        part_boundaries = [0]
+        for part in range(1, numb_processes):
+            part_boundary = mapped_rna_seq.find(b'\n', file_size * part // numb_processes)
+            part_boundary = file_size if part_boundary == -1 else part_boundary + 1
+            part_boundaries.append(max(part_boundary, part_boundaries[-1]))
+        part_boundaries.append(file_size)
+
+        part_suffixes = [".part" + str(part) for part in range(numb_processes)]
+        part_information = [(input_file, part_boundaries[part], part_boundaries[part + 1], part_suffixes[part],
+                             output_file_location, indel_exclusion_regions, quality_score_min,
+                             min_total_read_count, binomial_probability_value)
+                            for part in range(numb_processes)]
+
+        results_file_names = (filtered_rna_seq_file_name,
+                              output_file_location + "/Filtering_Results/GATK_Failing_RNA_Seq_variants.txt",
+                              output_file_location + "/Filtering_Results/Other_Failing_RNA_Seq_variants.txt")
+
+        try:
+            with multiprocessing.Pool(numb_processes) as pool:
+                part_stats = pool.map(filter_variant_lines_part, part_information)
+
+            # Joining the part files back together in order
+            for results_file_name in results_file_names:
+                results_file = open(results_file_name, 'wb')
+                for part_suffix in part_suffixes:
+                    part_file = open(results_file_name + part_suffix, 'rb')
+                    shutil.copyfileobj(part_file, results_file, 1<<20)
+                    part_file.close()
+                results_file.close()
+
+        # The part files are removed even if filtering one of the parts failed
+        finally:
+            for results_file_name in results_file_names:
+                for part_suffix in part_suffixes:
+                    if os.path.exists(results_file_name + part_suffix):
+                        os.remove(results_file_name + part_suffix)
+
+        # Adding up the stats of all parts (number of individuals comes from the header line)
+        raw_rna_seq_stats = RawRNASeqStats()
+        individuals_in_file = 0
+        for part_stat in part_stats:
+            for counter in RawRNASeqStats.__slots__:
+                setattr(raw_rna_seq_stats, counter, getattr(raw_rna_seq_stats, counter) + getattr(part_stat, counter))
+            if part_stat.no_of_individuals_in_file:
+                individuals_in_file = part_stat.no_of_individuals_in_file
+        raw_rna_seq_stats.no_of_individuals_in_file = individuals_in_file
+
+    # Tally number of indel regions
+    raw_rna_seq_stats.no_indel_exclusion_regions = no_of_exclusions
+
+    #Closing Files            
+    if file_size > 0:
+        mapped_rna_seq.close()
+    rna_seq_file.close()
+
+    return {'filtered_rna_seq_file_name': filtered_rna_seq_file_name, 'raw_rna_seq_stats':raw_rna_seq_stats, 'indel_stats_dict': indel_stats_dict}
+    
+
+#########################################################################################################################
+#################################### Sample Multi-dimensional Pvalue Adjustment #########################################
+#########################################################################################################################
+
+def determine_passing_pvalues(fdr_corrected_pvalues,
+                              multi_dim_adjust_pvalue_cutoff):
+
+    """
+
+    Compares the FDR corrected pvalues against the cutoff (all at once
+    with NumPy) and counts all that pass the cutoff
+
+    : Param fdr_corrected_pvalues: list of all corrected pvalues
+    : Param multi_dim_adjust_pvalue_cutoff: cutoff for determining p-value significance
+
+    : Return count_passing_pvalues: count of all pvalues that pass the cutoff
+
+    """
+
+    # Corrected pvalues as one float64 array
+    fdr_pvalues = np.asarray(fdr_corrected_pvalues, dtype=np.float64)
 
-    # Get the count of passing values
-    count_passing_pvalues = len(passing_pvalues)
+    # Count the corrected pvalues below the cutoff (passing values are only counted, not collected)
+    count_passing_pvalues = int(np.count_nonzero(fdr_pvalues < multi_dim_adjust_pvalue_cutoff))
 
     return (count_passing_pvalues)
 
 
+# P-value of a Biallelic sample in the filtered file (4th field, ex: Biallelic:0/1:135,464:0.0001),
+# the tab in front of each sample column makes the search start from the literal text
+BIALLELIC_PVALUE_REGEX = re.compile(r'\tBiallelic[^\t:]*:[^\t:]*:[^\t:]*:([^\t:\n]*)')
+
+
 def determine_passing_FDR_pvalues(input_file_name, multi_dim_adjust_pvalue_cutoff):
 
     """
@@ -1648,7 +1641,8 @@ def determine_passing_FDR_pvalues(input_file_name, multi_dim_adjust_pvalue_cutof
     : Param multi_dim_adjust_pvalue_cutoff: cutoff for determining p-value significance
 
     : Return passing_count: number of variants that pass overall correction
-    : Return variant_counter: number of variants analyzed
+    : Return variant_counter: number of variants analyzed (variants without Biallelic
+        sample p-values are skipped and not counted)
 
     """
 
@@ -1658,11 +1652,12 @@ def determine_passing_FDR_pvalues(input_file_name, multi_dim_adjust_pvalue_cutof
     # Line movement counter
     line_counter = 0
 
-    # Lowest p-value list
-    lowest_bonf_pvalue_list = []
+    # Bonferroni pooled lowest p-value of each variant (one C double per variant, the
+    # p-values of the samples are only kept for the variant being read)
+    lowest_bonf_pvalues = array.array('d')
 
-    # Total variants count
-    variant_counter = 0
+    # Counter of variants without Biallelic sample p-values
+    skipped_variant_counter = 0
 
     # Read through the lines of the file
     for line in input_file:
@@ -1672,73 +1667,40 @@ def determine_passing_FDR_pvalues(input_file_name, multi_dim_adjust_pvalue_cutof
             line_counter += 1
             continue
 
-        # Start parsing variant results
+        # Start parsing variant results, the p-values of the Biallelic samples are
+        # pulled out of the format and samples data (columns after the 8th tab) in one search
         else:
+            samples_data = line.split("\t", 8)[8]
+            samples_pvalues = BIALLELIC_PVALUE_REGEX.findall(samples_data)
 
-            # Start counting variants
-            variant_counter +=1
-
-            # Clean up line
-            line = line.rstrip("\n")
-
-            # Split the data
-            data = line.split("\t")
-
-            # Get all the samples data 
-            samples_data = data[9:]
-
-            # Variant Information 
-            variant_info = data[:9]
-
-            # Create an empty list to store pvalues
-            samples_pvalues = []
-
-            # Start looping over actual data
-            for sample in samples_data:
-
-                # Clean up sample data some (remove quote marks)
-                sample = sample.lstrip('"')
-                sample = sample.rstrip('"')
-
-                # Filter out all samples that are not Biallelic
-                if not sample.startswith("Biallelic"):
-                    continue
-
-                # Split the sample data up to get pvalues
-                sample_data = sample.split(":")
-
-                # Get the pvalue from the results list
-                sample_pvalue = float(sample_data[3])
-
-                # Add pvalue to sample pvalues list for variant
-                samples_pvalues.append(sample_pvalue)
+            # A variant without biallelic samples has no p-value to pool, it is left out
+            # of the multi-dimensional test (same as for the reference allele ratios)
+            if not samples_pvalues:
+                skipped_variant_counter += 1
+                continue
 
-            # Find lowest p-value
-            min_pvalue = np.amin(samples_pvalues)
+            # Calculate the bonferroni pooled p-value (lowest p-value times the number of samples)
+            lowest_bonf_pvalues.append(min(map(float, samples_pvalues)) * len(samples_pvalues))
 
-            # Length of list
-            length_of_list = len(samples_pvalues)
+    # Close the input file
+    input_file.close()
 
-            # Calculate the bonferroni pooled p-value
-            bonf_pooled_pvalue = min_pvalue * length_of_list
+    if skipped_variant_counter > 0:
+        print ("Variants without Biallelic sample p-values left out of the test:  " + str(skipped_variant_counter))
 
-            # Adjust bonferroni value if > 1
-            if bonf_pooled_pvalue > 1:
-                bonf_pooled_pvalue = 1
-                
-            # Add value to list for FDR correction
-            lowest_bonf_pvalue_list.append(bonf_pooled_pvalue)
+    # Total variants count
+    variant_counter = len(lowest_bonf_pvalues)
 
-    # Close the input file
-    input_file.close()
+    # Bonferroni pooled p-values adjusted to 1 if > 1, kept as one float64 array
+    # (no Python float per variant) for the FDR correction
+    lowest_bonf_pvalues = np.minimum(np.frombuffer(lowest_bonf_pvalues, dtype=np.float64), 1)
 
     # Get FDR corrected p-values
-    fdr_corrected_dict = fdr_correction(lowest_bonf_pvalue_list)
+    fdr_corrected_pvalues = fdr_correction(lowest_bonf_pvalues)
 
     # Determine the number of passing p-values after FDR correction
     # Passes the multi_dim_adjst_pvalue_cutoff to function here
-    passing_count = determine_passing_pvalues(lowest_bonf_pvalue_list,
-                                              fdr_corrected_dict,
+    passing_count = determine_passing_pvalues(fdr_corrected_pvalues,
                                               multi_dim_adjust_pvalue_cutoff)
                                       
     return(passing_count, variant_counter)
@@ -1748,31 +1710,36 @@ def determine_biallelic_samples(samples_data):
 
     """
 
-    Determine the number of biallelic samples for a variant
+    Determine the number of biallelic samples for a variant and their p-values
+    (samples are only split once, the p-values are reused when writing the results)
 
     : Parameter samples_data: sample data for line
 
     : Return biallelic_sample_line_count: number of biallelic samples
+    : Return sample_pvalues: p-value of each sample (None if sample is not biallelic)
 
     """
 
     # Counter for biallelic samples
     biallelic_sample_line_count = 0
+    sample_pvalues = []
 
     # Start looping over values to identify biallelic samples
     for sample in samples_data:
 
-        # Clean up sample data some (remove quote marks)
-        sample = sample.lstrip('"')
-        sample = sample.rstrip('"')
-
         # Identify biallelic samples
         if sample.startswith("Biallelic"):
 
             # Add to the counter
             biallelic_sample_line_count += 1
 
-    return (biallelic_sample_line_count)
+            # Get the pvalue from the split sample results
+            sample_pvalues.append(float(sample.split(":")[3]))
+
+        else:
+            sample_pvalues.append(None)
+
+    return (biallelic_sample_line_count, sample_pvalues)
     
         
 def analyze_variants_for_significance_multi_dim_test(input_file_name, passing_variant_count,
@@ -1803,8 +1770,12 @@ def analyze_variants_for_significance_multi_dim_test(input_file_name, passing_va
     # Output file name
     output_file_name = multi_dim_sample_output_dir + "/multi_dim_adj_pvalues_testable.txt"
 
-    # Create an output file for results
-    output_file = open(output_file_name, 'w')
+    # Create an output file for results (large write buffer, one write per variant)
+    output_file = open(output_file_name, 'w', buffering=1<<20)
+
+    # The significance threshold only depends on the number of biallelic samples of the variant,
+    # so each threshold (and its new format column entry) is calculated once per sample count
+    variant_sig_thresholds = {}
 
     # Start looping over data
     for line in input_file:
@@ -1834,72 +1805,58 @@ def analyze_variants_for_significance_multi_dim_test(input_file_name, passing_va
             # Get all the samples data 
             samples_data = data[9:]
 
-            # Determine the number of biallelic testable samples for variant
-            biallelic_sample_line_count = determine_biallelic_samples(samples_data)
+            # Determine the number of biallelic testable samples for variant (and their p-values)
+            biallelic_sample_line_count, sample_pvalues = determine_biallelic_samples(samples_data)
 
-            # Calculate Significance Threshold for variant
-            variant_sig_threshold = round(((passing_variant_count * float(multi_dim_adjust_pvalue_cutoff)) / (biallelic_sample_line_count * total_variants_analyzed)),8)
-
-            # Convert variant info to string
-            variant_info_str = "\t".join(map(str, variant_info))
+            # Variants without biallelic samples were left out of the FDR correction
+            # (determine_passing_FDR_pvalues) and are not tested
+            if biallelic_sample_line_count == 0:
+                continue
 
-            # Print the variant info to file
-            output_file.write(variant_info_str + "\t")
+            # Calculate Significance Threshold for variant
+            if biallelic_sample_line_count not in variant_sig_thresholds:
+                variant_sig_threshold = round(((passing_variant_count * multi_dim_adjust_pvalue_cutoff) / (biallelic_sample_line_count * total_variants_analyzed)),8)
+                variant_sig_thresholds[biallelic_sample_line_count] = (variant_sig_threshold,
+                                                                      f":Var_Sig_Thres<{variant_sig_threshold}")
+            variant_sig_threshold, sig_threshold_format = variant_sig_thresholds[biallelic_sample_line_count]
 
-            # Clean up the format info
-            format_info = format_info.rstrip("\t")
+            # Columns of the new line (variant info first), written out once per variant
+            line_columns = variant_info
 
             # Add to the format a new input (Variant Significance Threshold)
-            new_format_info = (format_info + ":Var_Sig_Thres<" + str(variant_sig_threshold) + "\t")
-
-            # Write new format information to file
-            output_file.write(new_format_info)
+            line_columns.append(format_info + sig_threshold_format)
 
             # Start looping over the sample data using new threshold
-            for sample in samples_data:
-
-                # Clean up sample data some (remove quote marks)
-                sample = sample.lstrip('"')
-                sample = sample.rstrip('"')
-
-                # Identify Biallelic Samples
-                if sample.startswith("Biallelic"):
-
-                    # Split the results up
-                    split_sample_results = sample.split(":")
+            for sample, sample_pvalue in zip(samples_data, sample_pvalues):
 
-                    # Examine if Sample less than new significance threshold
-                    if float(split_sample_results[3]) < variant_sig_threshold:
-
-                        # Remove tab before adding
-                        sample = sample.rstrip("\t")
-
-                        # Output new information
-                        output_file.write(sample + ":Pass\t")
+                # Add NA to non-biallelic samples
+                if sample_pvalue is None:
+                    line_columns.append(sample + ":Na")
 
-                    # If results are not significant
-                    else:
-                        # Remove tab before adding
-                        sample = sample.rstrip("\t")
+                # Examine if Sample less than new significance threshold
+                elif sample_pvalue < variant_sig_threshold:
+                    line_columns.append(sample + ":Pass")
 
-                        # Output new information
-                        output_file.write(sample + ":Fail\t")
-                        
-                # Add NA to non-biallelic samples
+                # If results are not significant
                 else:
-                    # Remove tab before adding
-                    sample = sample.rstrip("\t")
+                    line_columns.append(sample + ":Fail")
 
-                    # Output new information
-                    output_file.write(sample + ":Na\t")
+            # Write the line to the file
+            output_file.write("\t".join(line_columns) + "\t\n")
 
-            # Write new line to the file
-            output_file.write("\n")
+    # Close the files (flushes the buffered results before the file is read again)
+    input_file.close()
+    output_file.close()
 
     # Nothing to return at this time
     return(output_file_name)
 
 
+# Biallelic sample passing the multi-dimensional significance threshold (5th field is Pass,
+# ex: Biallelic:0/1:135,464:0.0001:Pass), the tab in front of each sample column starts the search
+SIG_BIALLELIC_SAMPLE_REGEX = re.compile(r'\tBiallelic:[^\t:]*:[^\t:]*:[^\t:]*:Pass(?=[:\t\n]|$)')
+
+
 def filter_for_multi_dim_sig_samples(multi_dim_sample_output_dir, multi_dim_adj_file_name):
 
     """
@@ -1939,9 +1896,9 @@ def filter_for_multi_dim_sig_samples(multi_dim_sample_output_dir, multi_dim_adj_
     # Create output folder for failing data for verification purposes    
     not_sig_multi_dimensional_file_name = multi_dim_sample_output_dir + "/not_sig_multi_dim_adj_results.txt"
 
-    # Open the files
-    sig_multi_dimensional_file = open(sig_multi_dimensional_file_name, 'w')
-    not_sig_multi_dimensional_file = open(not_sig_multi_dimensional_file_name,'w')
+    # Open the files (large write buffers, lines are written one at a time)
+    sig_multi_dimensional_file = open(sig_multi_dimensional_file_name, 'w', buffering=1<<20)
+    not_sig_multi_dimensional_file = open(not_sig_multi_dimensional_file_name,'w', buffering=1<<20)
     
     # Open up the annotated multi-dimensional p-value adjusted file
     multi_dim_file = open(multi_dim_adj_file_name, 'r')
@@ -1949,9 +1906,6 @@ def filter_for_multi_dim_sig_samples(multi_dim_sample_output_dir, multi_dim_adj_
     #reading file line by line
     for line in multi_dim_file:
 
-        # Setup a trigger for reporting only variants with significant sampels
-        verdict = 'noASE'
-
         #Getting the header information from the file
         if line.startswith('#CHROM'):
     
@@ -1959,42 +1913,18 @@ def filter_for_multi_dim_sig_samples(multi_dim_sample_output_dir, multi_dim_adj_
             sig_multi_dimensional_file.write(line)
             not_sig_multi_dimensional_file.write(line)
             continue
-              
-        else:
-            #Splitting the data
-            parsed_line = line.rstrip().split('\t')
-
-            #Getting Variant Results Only
-            variant_sample_results=parsed_line[9:]
-
-            #Starting to Parse Sample Data
-            # Counting variants in file, all should have one biallelic sample
-            # from prior filtering
-            multi_dim_global_counts_dict['Biallelic_Testable_Variants'] += 1
-            
-            for sample_data in variant_sample_results:
-                split_sample_data = sample_data.split(':')
-                #print (split_sample_data)
 
-                if split_sample_data[0]=='Biallelic':
-                    sample_sig_verdict = split_sample_data[4]
-                    if sample_sig_verdict == 'Pass':
-                        verdict = 'ASE_hit'
-                    else:
-                        verdic = 'No_ASE_hit'
-                        pass
-                    
-                #not biallelic pass for now
-                else:
-                    pass
+        # Counting variants in file, all should have one biallelic sample
+        # from prior filtering
+        multi_dim_global_counts_dict['Biallelic_Testable_Variants'] += 1
 
-        #Print line of file if one ASE sample found
-        if verdict == 'ASE_hit':
+        #Print line of file if one ASE sample found (a Biallelic sample with a Pass verdict,
+        #searched for in the format and sample columns without splitting the line)
+        if SIG_BIALLELIC_SAMPLE_REGEX.search(line.split('\t', 8)[-1]):
             multi_dim_global_counts_dict ['Total_Sig_ASE_Variants'] += 1
             sig_multi_dimensional_file.write(line)
-            
 
-        if verdict == 'noASE':
+        else:
             not_sig_multi_dimensional_file.write(line)
             
     # Closing files
@@ -2011,63 +1941,88 @@ def get_list_sig_variants(file_name):
     """
 
     Parses through the significant variants file
-    and creates a dictionary of variants and their
-    information for later parsing
+    and creates a set of the variant names (CHROM:POS)
+    for later membership checks
     
     : Param file_name: Name of file being parsed
 
-    : Return sig_variants_dict: A dictionary of significant results  
+    : Return sig_variant_names: A frozenset of the significant variant names  
 
     """
 
-    sig_variants_dict = {}
-
     sig_variants_file = open(file_name, 'r')
 
-    # Skipping the header
-    for line in sig_variants_file:
-        if line.startswith('#CHROM'):
-            continue
-        
-        # Getting the actual data to create a dictionary
-        else:
-            parsed_line = line.rstrip().split('\t')
-
-            variant_name = parsed_line[0] + ":" + parsed_line[1]
-            variant_info = parsed_line[:8]
-            sig_variants_dict.update({variant_name: variant_info})
+    # Getting the variant names (only the CHROM and POS columns are needed), skipping the header
+    sig_variant_names = frozenset(":".join(line.split('\t', 2)[:2]) for line in sig_variants_file
+                                  if not line.startswith('#CHROM'))
 
     # Closing the file
     sig_variants_file.close()
 
-    return(sig_variants_dict)
+    return(sig_variant_names)
+
+
+# Read counts of a Biallelic sample (ex: Biallelic:0/1:135,464:...), the tab in front
+# of each sample column starts the search
+BIALLELIC_COUNTS_REGEX = re.compile(r'\tBiallelic:[^\t:]*:([0-9]+,[0-9]+)')
+
+# Number of variants whose read counts are converted and summed together (bounds the memory used)
+READ_COUNT_CHUNK_VARIANTS = 10000
 
 
-def multi_dim_data_for_mapping_bias_plots(testable_variants_file, sig_variants_dict, output_directory):
+def sum_read_count_pairs(count_strings, sample_counts):
 
     """
-    Function parses through all the testable biallelic variants
-    and tallies the overall read counts to investigate reference allele bias
+    Sums the reference and alternative read counts of the biallelic samples of a
+    chunk of variants (converted and summed in NumPy at once)
 
-    : Param testable_variants_file: File with ALL biallelic testable variants
-    : Param output_directory: Tells where to output the data file
+    : Param count_strings: Read counts (ref,alt text) of the biallelic samples of the variants
+    : Param sample_counts: Number of biallelic samples of each variant (at least one each)
 
-    : Return avg_ref_allele_ratio: Average reference allele ratio ---help identify ref allele bias in data
+    : Return variant_total_counts: Summed reference and alternative counts (one row per variant)
 
     """
 
-    #opening up variant file
-    testable_variants_file=open(testable_variants_file, 'r') 
+    # Reference and alternative count pairs of all biallelic samples
+    count_values = ",".join(count_strings).split(',')
+    count_pairs = np.fromiter(map(int, count_values), dtype=np.int64, count=len(count_values)).reshape(-1, 2)
 
-    #Creating a log file for variant meta analysis
-    ref_bias_file=open(output_directory + "/data_for_ref_allele_bias_plotting.txt",'w')
+    # Summing the counts of each variant
+    variant_starts = np.cumsum(sample_counts) - sample_counts
 
-    # Writing the heading to file for plotting file
-    ref_bias_file.write("Variant_Name\tStatus\tRef_Count\tAlt_Count\tTotal_Count\tRatio\n")
+    return(np.add.reduceat(count_pairs, variant_starts))
+
+
+def sum_biallelic_read_counts(testable_variants_file_name):
+
+    """
+    Reads through all the testable biallelic variants and sums the reference and
+    alternative read counts of the biallelic samples of each variant (the counts are
+    only kept as text for a chunk of READ_COUNT_CHUNK_VARIANTS variants at a time)
+
+    : Param testable_variants_file_name: File with ALL biallelic testable variants
+
+    : Return variant_names: Name of each variant (CHROM:POS), variants without biallelic samples are skipped
+    : Return variant_total_reference_counts: Summed reference counts of each variant
+    : Return variant_total_alternative_counts: Summed alternative counts of each variant
+
+    """
+
+    variant_names = []
+
+    # Counter of variants without Biallelic sample read counts
+    skipped_variant_counter = 0
+
+    # Summed counts of the chunks already read
+    variant_total_counts_chunks = []
+
+    # Read counts of the biallelic samples of the variants in the current chunk (as text)
+    # and the number per variant
+    biallelic_count_strings = []
+    biallelic_sample_counts = []
+
+    testable_variants_file = open(testable_variants_file_name, 'r')
 
-    # Creating Ref Allele Ratio List
-    ref_allele_ratio_list = []
-    
     #reading file line by line
     for line in testable_variants_file:
 
@@ -2075,67 +2030,208 @@ def multi_dim_data_for_mapping_bias_plots(testable_variants_file, sig_variants_d
         if line.startswith('#CHROM'):
             continue
 
-        else:
-            #Splitting the data
-            parsed_line = line.rstrip().split('\t')
+        # Only the sample columns are searched for the counts
+        parsed_line = line.split('\t', 8)
+        samples_counts = BIALLELIC_COUNTS_REGEX.findall(parsed_line[-1])
 
-            variant_name = parsed_line[0] + ":" + parsed_line[1]
+        # A variant without biallelic samples has no reads to calculate a reference allele
+        # ratio from, it is left out of the read counts (plotting data and average)
+        if not samples_counts:
+            skipped_variant_counter += 1
+            continue
 
-            # Determining if the variant showed ASE
-            if variant_name in sig_variants_dict:
-                status = 'Sig_ASE'
-            else:
-                status = 'No_ASE'
+        variant_names.append(parsed_line[0] + ":" + parsed_line[1])
+        biallelic_count_strings.extend(samples_counts)
+        biallelic_sample_counts.append(len(samples_counts))
 
-            # Simple Counters
-            variant_total_reference_count = 0
-            variant_total_alternative_count = 0
-            variant_total_count = 0 
+        # Sum the counts of a full chunk
+        if len(biallelic_sample_counts) == READ_COUNT_CHUNK_VARIANTS:
+            variant_total_counts_chunks.append(sum_read_count_pairs(biallelic_count_strings,
+                                                                    biallelic_sample_counts))
+            biallelic_count_strings = []
+            biallelic_sample_counts = []
 
-            #Getting Variant Results Only
-            variant_sample_results=parsed_line[9:]
+    # Closing the file
+    testable_variants_file.close()
 
-            #Starting reading and writing 
-            for sample_data in variant_sample_results:
-                split_sample_data = sample_data.split(':')
+    if skipped_variant_counter > 0:
+        print ("Variants without Biallelic sample read counts left out of the reference allele ratios:  "
+               + str(skipped_variant_counter))
 
-                if split_sample_data[0]=='Biallelic':
+    # Sum the counts of the last chunk
+    if biallelic_sample_counts:
+        variant_total_counts_chunks.append(sum_read_count_pairs(biallelic_count_strings, biallelic_sample_counts))
+
+    if variant_total_counts_chunks:
+        variant_total_counts = np.concatenate(variant_total_counts_chunks)
+    else:
+        variant_total_counts = np.zeros((0, 2), dtype=np.int64)
 
-                    counts = split_sample_data[2].split(',')
+    return(variant_names, variant_total_counts[:, 0], variant_total_counts[:, 1])
 
-                    reference_count = int(counts[0])
-                    alternative_count = int(counts[1])
-                    total_count = reference_count + alternative_count
 
-                    #add to variant totals
-                    variant_total_reference_count += reference_count
-                    variant_total_alternative_count += alternative_count
-                    variant_total_count += total_count 
- 
-                else:
-                    continue
+def data_for_mapping_bias_plots(biallelic_read_counts, sig_variant_names, output_directory):
+
+    """
+    Function goes through the read counts of all the testable biallelic variants
+    to investigate reference allele bias (used by both statistical tests, the
+    testable variants file is only parsed once for both)
+
+    : Param biallelic_read_counts: Variant names, reference and alternative read counts of ALL biallelic
+        testable variants (from sum_biallelic_read_counts)
+    : Param sig_variant_names: Names (CHROM:POS) of all ASE SNPs identified in the study
+    : Param output_directory: Tells where to output the data file
+
+    : Return avg_ref_allele_ratio: Average reference allele ratio ---help identify ref allele bias in data
+
+    """
 
-            # Get the reference allele ratio
-            ref_allele_ratio = (variant_total_reference_count/variant_total_count)
+    # Reference and alternative read counts of every variant (summed over its biallelic samples)
+    variant_names, variant_total_reference_counts, variant_total_alternative_counts = biallelic_read_counts
+    variant_total_counts = variant_total_reference_counts + variant_total_alternative_counts
 
-            ref_allele_ratio_list.append(ref_allele_ratio)
+    # Get the reference allele ratios (all variants at once)
+    ref_allele_ratios = variant_total_reference_counts / variant_total_counts
 
-            # Printing alll results to file
-            ref_bias_file.write(str(variant_name) + "\t" + status + "\t" + str(variant_total_reference_count)
-                                + "\t" + str(variant_total_alternative_count)
-                                + "\t" + str(variant_total_count) + "\t"
-                                + str(ref_allele_ratio) + "\n" )
+    #Creating a log file for variant meta analysis (large write buffer, one write per variant)
+    ref_bias_file=open(output_directory + "/data_for_ref_allele_bias_plotting.txt",'w', buffering=1<<20)
 
-    #Getting the average ref allele ratio
-    avg_ref_allele_ratio = np.mean(ref_allele_ratio_list)
+    # Writing the heading to file for plotting file
+    ref_bias_file.write("Variant_Name\tStatus\tRef_Count\tAlt_Count\tTotal_Count\tRatio\n")
+
+    for variant_name, variant_total_reference_count, variant_total_alternative_count, variant_total_count, \
+            ref_allele_ratio in zip(variant_names, variant_total_reference_counts.tolist(),
+                                    variant_total_alternative_counts.tolist(), variant_total_counts.tolist(),
+                                    ref_allele_ratios.tolist()):
+
+        # Determining if the variant showed ASE
+        if variant_name in sig_variant_names:
+            status = 'Sig_ASE'
+        else:
+            status = 'No_ASE'
+
+        # Printing alll results to file
+        ref_bias_file.write(f"{variant_name}\t{status}\t{variant_total_reference_count}"
+                            f"\t{variant_total_alternative_count}\t{variant_total_count}\t{ref_allele_ratio}\n")
+
+    #Getting the average ref allele ratio (not a number if no variants were read)
+    if len(ref_allele_ratios):
+        avg_ref_allele_ratio = float(np.mean(ref_allele_ratios))
+    else:
+        avg_ref_allele_ratio = float('nan')
 
     # Closing the file
-    testable_variants_file.close()
     ref_bias_file.close()
 
     return(avg_ref_allele_ratio)
 
 
+# Result categories of a sample in the final tallies (codes stored per sample of each variant)
+SIG_ASE_REF_SAMPLE = 0
+SIG_ASE_ALT_SAMPLE = 1
+BIALLELIC_NO_ASE_SAMPLE = 2
+HOMOZYGOUS_REF_SAMPLE = 3
+HOMOZYGOUS_ALT_SAMPLE = 4
+NON_TESTABLE_SAMPLE = 5
+MISSING_SAMPLE = 6
+
+# Columns of the variant tallies (one row of counts per variant)
+VARIANT_TALLY_COLUMNS = ('Biallelic_Testable', 'Sig_ASE', 'Sig_ASE_Ref', 'Sig_ASE_Alt', 'Biallelic_No_ASE',
+                         'Passing_Homozygous', 'Homozygous_Ref', 'Homozygous_Alt', 'Non_Testable')
+
+
+def tally_sample_categories(sample_categories, samples_list, samples_counters_dict, variant_list,
+                            tally_global_dictionary):
+
+    """
+
+    Tallies the result categories of all the samples of all the variants at once with NumPy
+    (counts per sample, per variant and global totals)
+
+    : Param sample_categories: Category code of every sample of every variant (variant after variant)
+    : Param samples_list: List of samples
+    : Param samples_counters_dict: Dictionary with information about sample results (added to)
+    : Param variant_list: List of variants being analyzed
+    : Param tally_global_dictionary: Global tallying dictionary (added to)
+
+    : Return variant_results_matrix: Tallying counts of each variant (one row per variant in the
+        order of variant_list, columns in the order of VARIANT_TALLY_COLUMNS)
+
+    """
+
+    # One row per variant, one column per sample
+    sample_categories = np.array(sample_categories, dtype=np.int8).reshape(len(variant_list), len(samples_list))
+
+    # Count of each category per sample (columns) and per variant (rows), each in one bincount
+    # pass by giving every sample (or variant) its own block of category codes
+    numb_variants, numb_samples = sample_categories.shape
+    numb_categories = MISSING_SAMPLE + 1
+    sample_counts = np.bincount((np.arange(numb_samples, dtype=np.intp) * numb_categories
+                                 + sample_categories).ravel(),
+                                minlength=numb_samples * numb_categories).reshape(numb_samples, numb_categories)
+    variant_counts = np.bincount((np.arange(numb_variants, dtype=np.intp)[:, np.newaxis] * numb_categories
+                                  + sample_categories).ravel(),
+                                 minlength=numb_variants * numb_categories).reshape(numb_variants, numb_categories)
+
+    # Sample counts listed by category (indexed by the category codes)
+    sample_counts = sample_counts.T.tolist()
+
+    # Tallying the samples (added, a sample name found twice in the header shares its counters)
+    for x, sample in enumerate(samples_list):
+        sig_ase_ref = sample_counts[SIG_ASE_REF_SAMPLE][x]
+        sig_ase_alt = sample_counts[SIG_ASE_ALT_SAMPLE][x]
+        biallelic_no_ase = sample_counts[BIALLELIC_NO_ASE_SAMPLE][x]
+        homozygous_ref = sample_counts[HOMOZYGOUS_REF_SAMPLE][x]
+        homozygous_alt = sample_counts[HOMOZYGOUS_ALT_SAMPLE][x]
+
+        sample_tally = samples_counters_dict[sample]
+        sample_tally['Biallelic_Testable'] += sig_ase_ref + sig_ase_alt + biallelic_no_ase
+        sample_tally['Sig_ASE'] += sig_ase_ref + sig_ase_alt
+        sample_tally['Sig_ASE_Ref'] += sig_ase_ref
+        sample_tally['Sig_ASE_Alt'] += sig_ase_alt
+        sample_tally['Biallelic_No_ASE'] += biallelic_no_ase
+        sample_tally['Passing_Homozygous'] += homozygous_ref + homozygous_alt
+        sample_tally['Passing_Homozygous_Ref'] += homozygous_ref
+        sample_tally['Passing_Homozygous_Alt'] += homozygous_alt
+        sample_tally['Non_Testable'] += sample_counts[NON_TESTABLE_SAMPLE][x]
+
+    # Tallying the variants (columns in the order of VARIANT_TALLY_COLUMNS)
+    sig_ase_ref, sig_ase_alt, biallelic_no_ase, homozygous_ref, homozygous_alt, non_testable = \
+        variant_counts[:, :MISSING_SAMPLE].T
+    variant_results_matrix = np.column_stack((sig_ase_ref + sig_ase_alt + biallelic_no_ase,
+                                              sig_ase_ref + sig_ase_alt, sig_ase_ref, sig_ase_alt,
+                                              biallelic_no_ase, homozygous_ref + homozygous_alt,
+                                              homozygous_ref, homozygous_alt, non_testable))
+
+    # A variant found twice keeps the counts of its last line (for every time it is listed)
+    last_variant_rows = {variant_key: x for x, variant_key in enumerate(variant_list)}
+    if len(last_variant_rows) < len(variant_list):
+        variant_results_matrix = variant_results_matrix[[last_variant_rows[variant_key]
+                                                         for variant_key in variant_list]]
+
+    # Tallying the global results
+    sig_ase_ref = sum(sample_counts[SIG_ASE_REF_SAMPLE])
+    sig_ase_alt = sum(sample_counts[SIG_ASE_ALT_SAMPLE])
+    biallelic_no_ase = sum(sample_counts[BIALLELIC_NO_ASE_SAMPLE])
+    homozygous_ref = sum(sample_counts[HOMOZYGOUS_REF_SAMPLE])
+    homozygous_alt = sum(sample_counts[HOMOZYGOUS_ALT_SAMPLE])
+    non_testable = sum(sample_counts[NON_TESTABLE_SAMPLE])
+
+    tally_global_dictionary['Total_Tests'] += (sig_ase_ref + sig_ase_alt + biallelic_no_ase
+                                               + homozygous_ref + homozygous_alt + non_testable)
+    tally_global_dictionary['Total_Biallelic_Samples'] += sig_ase_ref + sig_ase_alt + biallelic_no_ase
+    tally_global_dictionary['Total_Sig_Biallelic_Samples'] += sig_ase_ref + sig_ase_alt
+    tally_global_dictionary['Total_Sig_ASE_Ref'] += sig_ase_ref
+    tally_global_dictionary['Total_Sig_ASE_Alt'] += sig_ase_alt
+    tally_global_dictionary['Total_Biallelic_No_ASE'] += biallelic_no_ase
+    tally_global_dictionary['Total_Passing_Homozygous'] += homozygous_ref + homozygous_alt
+    tally_global_dictionary['Total_Passing_Homozygous_Ref'] += homozygous_ref
+    tally_global_dictionary['Total_Passing_Homozygous_Alt'] += homozygous_alt
+    tally_global_dictionary['Total_Non_Testable'] += non_testable
+
+    return(variant_results_matrix)
+
+
 def tally_final_multi_dim_results(sig_multi_dimensional_file_name, multi_dim_global_counts_dict):
 
     """
@@ -2149,7 +2245,7 @@ def tally_final_multi_dim_results(sig_multi_dimensional_file_name, multi_dim_glo
     : Return samples_list: List of samples
     : Return samples_counters_dict: Dictionary with information about sample results
     : Return variant_list: List of variants being analyzed
-    : Return variant_results_dictionary: Tallying dictionary for variants
+    : Return variant_results_matrix: Tallying counts of each variant (columns in VARIANT_TALLY_COLUMNS order)
     : Return variant_header: Header of file with variants
     : Return tally_global_dictionary: Global tallying dictionary filled in with values
 
@@ -2161,11 +2257,12 @@ def tally_final_multi_dim_results(sig_multi_dimensional_file_name, multi_dim_glo
     #opening up variant file
     final_results_file = open(sig_multi_dimensional_file_name, 'r')
 
-    #Create a variant dictionary
-    variant_results_dictionary = {}
-
     #Create a variant list for cycling through
     variant_list = []
+
+    # Result category of every sample of every variant (one code per sample, tallied
+    # all at once with NumPy when the file is read)
+    sample_categories = []
     
     #reading file line by line
     for line in final_results_file:
@@ -2178,7 +2275,7 @@ def tally_final_multi_dim_results(sig_multi_dimensional_file_name, multi_dim_glo
 
             # Getting Variant Header
             variant_header = parsed_line[:8]
-            variant_header = ('\t'.join(map(str,variant_header)))
+            variant_header = ('\t'.join(variant_header))
 
             # Retrieve_Sample_Names_for_Logging
             samples_list = parsed_line[9:]
@@ -2197,102 +2294,58 @@ def tally_final_multi_dim_results(sig_multi_dimensional_file_name, multi_dim_glo
             
             #Variant information
             variant_info = parsed_line[:8]
-            variant_key = ('\t'.join(map(str,variant_info)))
+            variant_key = ('\t'.join(variant_info))
 
             # Add new variant to list
             variant_list.append(variant_key)
-
-            variant_results_dictionary.update({variant_key: {'Biallelic_Testable': 0, 'Sig_ASE': 0, 
-                           'Sig_ASE_Ref': 0, 'Sig_ASE_Alt': 0,
-                           'Biallelic_No_ASE': 0,
-                           'Passing_Homozygous': 0,
-                           'Homozygous_Ref': 0,
-                           'Homozygous_Alt': 0,                                  
-                           'Non_Testable': 0}}) 
             
             # Getting variant results
             variant_sample_results=parsed_line[9:]
 
+            # More samples than the header would not have a sample name to be tallied under
+            if len(variant_sample_results) > numb_individuals:
+                print ("ERROR Alert!")
+                print ("Variant has more samples than the header of the file")
+                print (line)
+                sys.exit()
+
             #Starting reading and writing 
-            x=0
             for sample_data in variant_sample_results:
 
-                #get sample name from Index Location
-                sample = samples_list[x]
-
-                # Tallying all tests possible
-                tally_global_dictionary ['Total_Tests'] += 1
-
                 #Splitting the data for later parsing
                 split_sample_data = sample_data.split(':')
 
                 if split_sample_data[0]=='Biallelic':
-                    tally_global_dictionary ['Total_Biallelic_Samples'] += 1
-                    samples_counters_dict[sample]['Biallelic_Testable'] += 1
-                    variant_results_dictionary[variant_key]['Biallelic_Testable'] += 1
 
-                    # Getting Sample Verdict for Multi-Dimensional Adjustment
-                    sample_sig_verdict = split_sample_data[4]
-
-                    #Test if breach p_value cutoff
-                    if sample_sig_verdict == 'Pass':
-                        tally_global_dictionary ['Total_Sig_Biallelic_Samples'] += 1
-                        samples_counters_dict[sample]['Sig_ASE'] += 1
-                        variant_results_dictionary[variant_key]['Sig_ASE'] += 1
+                    # Getting Sample Verdict for Multi-Dimensional Adjustment (Test if breach p_value cutoff)
+                    if split_sample_data[4] == 'Pass':
 
                         #Look to see if ref or alt is higher
-                        variant_counts = (split_sample_data[2])
-                        split_counts = variant_counts.split(',')
+                        split_counts = split_sample_data[2].split(',')
 
                         # If Ref is Higher Than Alt
                         if int(split_counts[0]) > int(split_counts[1]):
-                            samples_counters_dict[sample]['Sig_ASE_Ref'] += 1
-                            tally_global_dictionary ['Total_Sig_ASE_Ref'] += 1
-                            variant_results_dictionary[variant_key]['Sig_ASE_Ref'] += 1
-
-                            # Move Counter
-                            x+= 1
+                            sample_categories.append(SIG_ASE_REF_SAMPLE)
 
                         # If Alt is Higher Than Ref
                         else:
-                            samples_counters_dict[sample]['Sig_ASE_Alt'] += 1
-                            tally_global_dictionary ['Total_Sig_ASE_Alt'] += 1
-                            variant_results_dictionary[variant_key]['Sig_ASE_Alt'] += 1
-
-                            # Move Counter
-                            x+= 1
+                            sample_categories.append(SIG_ASE_ALT_SAMPLE)
                             
                     #Biallic but not significant (fails cutoff)
                     else:
-                        samples_counters_dict[sample]['Biallelic_No_ASE'] += 1
-                        tally_global_dictionary ['Total_Biallelic_No_ASE'] += 1
-                        variant_results_dictionary[variant_key]['Biallelic_No_ASE'] += 1
-
-                        # Move Counter
-                        x+= 1
+                        sample_categories.append(BIALLELIC_NO_ASE_SAMPLE)
                           
                 #Homozygous passing sample 
                 elif split_sample_data[0]=='Homo':
-                    samples_counters_dict[sample]['Passing_Homozygous'] += 1
-                    tally_global_dictionary ['Total_Passing_Homozygous'] += 1
-                    variant_results_dictionary[variant_key]['Passing_Homozygous'] += 1
 
                     #Tally Type of Homozygous Genotype (allow freq calculations) 
                     homozygous_genotype = (split_sample_data[1])
 
                     if homozygous_genotype == "0/0":
-                        samples_counters_dict[sample]['Passing_Homozygous_Ref'] += 1
-                        variant_results_dictionary[variant_key]['Homozygous_Ref'] += 1
-                        tally_global_dictionary ['Total_Passing_Homozygous_Ref'] += 1
-                        # Move Counter
-                        x+= 1
+                        sample_categories.append(HOMOZYGOUS_REF_SAMPLE)
 
                     elif homozygous_genotype == "1/1":
-                        samples_counters_dict[sample]['Passing_Homozygous_Alt'] += 1
-                        variant_results_dictionary[variant_key]['Homozygous_Alt'] += 1
-                        tally_global_dictionary ['Total_Passing_Homozygous_Alt'] += 1
-                        # Move Counter
-                        x+= 1
+                        sample_categories.append(HOMOZYGOUS_ALT_SAMPLE)
 
                     else:
                         print ("Danger Incorrect Genotype")
@@ -2304,17 +2357,19 @@ def tally_final_multi_dim_results(sig_multi_dimensional_file_name, multi_dim_glo
                             
                 # No passing sample  
                 else:
-                    samples_counters_dict[sample]['Non_Testable'] += 1
-                    tally_global_dictionary['Total_Non_Testable'] += 1
-                    variant_results_dictionary[variant_key]['Non_Testable'] += 1
+                    sample_categories.append(NON_TESTABLE_SAMPLE)
 
-                    # Move Counter
-                    x+= 1
+            # Samples missing from the end of the line are not tallied
+            sample_categories.extend([MISSING_SAMPLE] * (numb_individuals - len(variant_sample_results)))
 
     # Closing the initial file
     final_results_file.close()
 
-    return (samples_list, samples_counters_dict, variant_list, variant_results_dictionary, variant_header,
+    # Tallying the samples, variants and global results from the sample categories
+    variant_results_matrix = tally_sample_categories(sample_categories, samples_list, samples_counters_dict,
+                                                     variant_list, tally_global_dictionary)
+
+    return (samples_list, samples_counters_dict, variant_list, variant_results_matrix, variant_header,
             tally_global_dictionary)
 
 
@@ -2324,41 +2379,77 @@ def tally_final_multi_dim_results(sig_multi_dimensional_file_name, multi_dim_glo
 #########################################################################################################################
 
 
+def fisher_combine_vectorized(pvalues_matrix, mask_matrix):
+
+    """
+
+    Performs Fisher's Method on every variant at once, same math as
+    scipy.stats.combine_pvalues(method='fisher') but as one NumPy call
+    over the whole (variants x samples) matrix instead of one SciPy call per variant
+
+    Link for Scipy website: https://docs.scipy.org/doc/scipy-0.19.1/reference/generated/scipy.stats.combine_pvalues.html
+
+    : Param pvalues_matrix: 2D array of sample p-values (rows = variants, padding ignored)
+    : Param mask_matrix: 2D boolean array marking which entries are real p-values
+
+    : Return chi_square_values: Chi-square statistic for each variant
+    : Return meta_pvalues: Meta p-value for each variant
+
+    """
+
+    # Padded entries are set to 1.0 so they add nothing to the sum (log(1) = 0)
+    log_pvalues = np.log(np.where(mask_matrix, pvalues_matrix, 1.0))
+    chi_square_values = -2 * log_pvalues.sum(axis=1)
+
+    # Degrees of freedom calculated (Number of Samples X 2)
+    numb_samples = mask_matrix.sum(axis=1)
+    meta_pvalues = stats.chi2.sf(chi_square_values, 2 * numb_samples)
+
+    return(chi_square_values, meta_pvalues)
+
+
 def meta_analysis(meta_analysis_output_folder, testable_variants_file):
     
     """
 
     Function performs Fisher's Method to combine p-values from ASE testing
     the function first parses through the ASE log file to find all SNPs classified
-    as ASE and then combines their p-values and testing using the
-    scip.stats.combine_pvalues module
+    as ASE and then combines their p-values in a single vectorized
+    pass (see fisher_combine_vectorized)
     
     : Param meta_analysis_output_folder: Location to put output files
     : Param testable_variants_file: Variant file with all biallelic testable variants
     
     : Return meta_analysis_all_p_values_results: Meta-analysis p-values for FDR correction
-    : Return intermediate_meta_log_file_name: Name of the intermediate log file that will be re-written
-        with FDR corrected q-values and then deleted
+    : Return meta_log_header: Header of the meta-analysis log (None if the file has no header)
+    : Return meta_log_lines: Meta-analysis log line of each variant (kept in memory and written out
+        with the FDR corrected q-values, no intermediate file is written and re-read)
+    : Return meta_variant_names: Name of each variant (CHROM:POS)
+    : Return meta_analyzed_values: Samples and p-values tested for each variant (log text)
+    : Return meta_chi_square_values: Chi-square value of each variant (log text)
+    : Return meta_degrees_of_freedom: Degrees of freedom of each variant (log text)
     """
 
     # opening up variant file
     testable_variants_file=open(testable_variants_file, 'r')
 
-    # meta log file name
-    intermediate_meta_log_file_name = meta_analysis_output_folder + '/intermediate_variants_meta_analysis_log_file.txt'
+    # Meta-analysis log, written out once the q-values are known
+    meta_log_header = None
 
-    #Creating an intermediate log file for variant meta analysis (will delete)
-    inter_meta_log_file = open(intermediate_meta_log_file_name,'w')
+    # Log text for each variant (everything before the chi-square value), plus the
+    # parts of the log reported again with the significant variants
+    variant_log_lines = []
+    meta_variant_names = []
+    meta_analyzed_values = []
 
-    # create an empty list to put all result values used in analysis
-    meta_analysis_all_p_values_results = []
+    # p-values of all variants (one flat buffer of C doubles, variant after variant) and the
+    # number of p-values of each variant, for the vectorized test
+    variant_pvalues = array.array('d')
+    variant_numb_samples = array.array('q')
 
     # reading file line by line
     for line in testable_variants_file:
 
-        # create an empty list to put all values used in analysis
-        pvalues_being_tested=[]
-
         # Log of samples and values tested, printed into log file
         samples_values_tested=[]
         
@@ -2372,11 +2463,11 @@ def meta_analysis(meta_analysis_output_folder, testable_variants_file):
             # Get the important variant info (discard column "Mod_Format")
             file_header = parsed_line[0:7]
             
-            file_header = ('\t'.join(map(str,file_header)))
+            file_header = ('\t'.join(file_header))
 
-            inter_meta_log_file.write(file_header+
-                           '\tTotal_Samples\tAnalyzed_Values\tBi-Allelic_Samples\tchi-square_value'+
-                           '\tDegrees_of_Freedom(2n)\tMeta_p-value\n')
+            meta_log_header = (file_header+
+                               '\tTotal_Samples\tAnalyzed_Values\tBi-Allelic_Samples\tchi-square_value'+
+                               '\tDegrees_of_Freedom(2n)\tMeta_p-value')
 
             # Retrieve_Sample_Names_for_Logging
             sample_names = parsed_line[9:]
@@ -2389,98 +2480,94 @@ def meta_analysis(meta_analysis_output_folder, testable_variants_file):
 
             # Getting variant info
             variant_info=parsed_line[0:7]
-            variant_info=('\t'.join(map(str,variant_info)))
-
-            # Writing variant info to log file
-            inter_meta_log_file.write((variant_info+('\t')))
+            variant_info=('\t'.join(variant_info))
 
             # Parsing apart data for sample results
             variant_results = parsed_line[9:]
             
-            for x in range(len(variant_results)):
+            for sample, sample_data in zip(sample_names, variant_results):
 
-                    # Finding all testable variants (aka hetereozygous)
-                    if variant_results[x].startswith("Biallelic"):
-                        data=variant_results[x].split(":") 
-                        p_value=data[3]
-
-                        # getting the sample analyze from sample list
-                        sample = sample_names[x]
-                        
-                        # Converts the string p-value to a float for fisher_testing
-                        pvalues_being_tested.append(float(p_value))
+                # Finding all testable variants (aka hetereozygous)
+                if sample_data.startswith("Biallelic"):
 
-                        # Create a log list for validation, round numeric values for simplicty
-                        log_sample_p_value=sample+":"+str(round(float(p_value),5))
+                    # Converts the string p-value to a float for fisher_testing (once, also used for the log)
+                    p_value = float(sample_data.split(":", 4)[3])
+                    variant_pvalues.append(p_value)
 
-                        # Adding values examined to log
-                        samples_values_tested.append(log_sample_p_value)
+                    # Create a log list for validation, round numeric values for simplicty
+                    samples_values_tested.append(sample + ":" + str(round(p_value, 5)))
 
-                    # just skipping all other types of variants in samples that fail QC
-                    else:
-                        continue
+                # just skipping all other types of variants in samples that fail QC
 
-            # Record number of samples overall
-            inter_meta_log_file.write(str(len(variant_results))+'\t')
-                    
             # Creating log output for file (what samples meta-tested)
-            values_tested=(', '.join(map(str,samples_values_tested)))
-            inter_meta_log_file.write(values_tested+'\t')
+            values_tested=(', '.join(samples_values_tested))
 
             # Counting the number of samples tested in meta-analysis
-            numb_samples=len(pvalues_being_tested)
-            inter_meta_log_file.write(str(numb_samples)+'\t')
-
-            #Performing analysis of data
-            #Results are returned as (chi-square value, p-value)
-            # Link for Scipy website: https://docs.scipy.org/doc/scipy-0.19.1/reference/generated/scipy.stats.combine_pvalues.html
-            meta_analysis_results = combine_pvalues(pvalues_being_tested)
-
-            #Printing the chi-square results
-            inter_meta_log_file.write(str(meta_analysis_results[0])+'\t')
+            numb_samples=len(samples_values_tested)
 
-            #Printing the degrees of freedom to the file for chi-square test
-            #Degrees of freedom calculated (Number of Samples X 2)
-            inter_meta_log_file.write(str(numb_samples*2)+'\t')
+            # Variant info, number of samples overall, samples meta-tested, number tested
+            variant_log_lines.append(variant_info+'\t'+str(len(variant_results))+'\t'+
+                                     values_tested+'\t'+str(numb_samples)+'\t')
+            meta_variant_names.append(parsed_line[0] + ":" + parsed_line[1])
+            meta_analyzed_values.append(values_tested)
+            variant_numb_samples.append(numb_samples)
 
-            
-            # Get the variant result p-value from meta-analysis
-            meta_analysis_variant_result = (meta_analysis_results[1])
-
-            # Convert the meta-results to 12 floating points (match normal print output from python)
-            # Conversion needs to be done, otherwise dictionary and output files do not match in p-values
-            # for dictionary look-up
-            meta_analysis_variant_result = format(meta_analysis_variant_result, '.12f')
-
-            # Print p-value to file
-            inter_meta_log_file.write(str(meta_analysis_variant_result)+'\n')
-
-            # Record the list of all p-values for FDR correction
-            meta_analysis_all_p_values_results.append(float(meta_analysis_variant_result))
-
-    # Flushing the data for safety reasons
-    inter_meta_log_file.flush()
+    # Closing the variant file
+    testable_variants_file.close()
 
-    # Closing meta_Log
-    inter_meta_log_file.close()
+    # Building a padded (variants x samples) matrix plus a mask of the real values, the mask
+    # marks the first numb_samples entries of each row so the p-values of all variants
+    # (flattened in row order) fill the matrix in one assignment
+    variant_numb_samples = np.frombuffer(variant_numb_samples, dtype=np.int64)
+    max_numb_samples = int(variant_numb_samples.max()) if len(variant_numb_samples) else 0
+    mask_matrix = np.arange(max_numb_samples) < variant_numb_samples[:, np.newaxis]
+    pvalues_matrix = np.ones((len(variant_numb_samples), max_numb_samples))
+    pvalues_matrix[mask_matrix] = np.frombuffer(variant_pvalues, dtype=np.float64)
+
+    #Performing analysis of data (all variants at once)
+    chi_square_values, meta_pvalues = fisher_combine_vectorized(pvalues_matrix, mask_matrix)
+
+    # Convert the meta-results to 12 floating points (match normal print output from python)
+    # Conversion needs to be done, otherwise dictionary and output files do not match in p-values
+    # for dictionary look-up (formatted once over plain floats, np.char.mod measured slower)
+    meta_pvalue_strings = [format(meta_pvalue, '.12f') for meta_pvalue in meta_pvalues.tolist()]
+
+    # Record the list of all p-values for FDR correction
+    meta_analysis_all_p_values_results = [float(meta_pvalue) for meta_pvalue in meta_pvalue_strings]
+
+    # The chi-square results and the degrees of freedom for the chi-square test
+    # (Number of Samples X 2)
+    meta_chi_square_values = [str(chi_square_value) for chi_square_value in chi_square_values.tolist()]
+    meta_degrees_of_freedom = [str(numb_samples * 2) for numb_samples in variant_numb_samples.tolist()]
+
+    # Variant info, the chi-square results, the degrees of freedom and the p-value
+    meta_log_lines = [log_line + chi_square_value + '\t' + degrees_of_freedom + '\t' + meta_pvalue
+                      for log_line, chi_square_value, degrees_of_freedom, meta_pvalue
+                      in zip(variant_log_lines, meta_chi_square_values,
+                             meta_degrees_of_freedom, meta_pvalue_strings)]
 
     # Return values for tallying
     return {'meta_analysis_all_p_values_results': meta_analysis_all_p_values_results,
-            'intermediate_meta_log_file_name': intermediate_meta_log_file_name}
+            'meta_log_header': meta_log_header,
+            'meta_log_lines': meta_log_lines,
+            'meta_variant_names': meta_variant_names,
+            'meta_analyzed_values': meta_analyzed_values,
+            'meta_chi_square_values': meta_chi_square_values,
+            'meta_degrees_of_freedom': meta_degrees_of_freedom}
 
 
 def meta_printing_q_values(meta_analysis_output_folder, meta_analysis_results, p_value_threshold):
 
     """
 
-    Function goes through data and prints out the corrected q-value from the FDR
-    analysis
+    Function goes through the meta-analysis log lines and prints them out with the
+    corrected q-value from the FDR analysis
 
     : Param meta_analysis_output_folder: Location of the meta-analsysis results
     : Param meta_analysis_results: Results from the meta-analysis (dictionary of multiple variables)
     : Param p_value_threshold: Meta-analysis FDR p-value for significance or not
 
-    : Return meta_analysis_sig_variants: List of significant variants from analysis
+    : Return meta_analysis_sig_variants: Set of significant variants from analysis
     : Return variant_meta_analysis_results_file_name: File name of final meta-anlysis folder with all output
 
     """
@@ -2488,115 +2575,56 @@ def meta_printing_q_values(meta_analysis_output_folder, meta_analysis_results, p
 
     # Get the results from the meta analysis of the data
     meta_analysis_all_p_values_results = meta_analysis_results['meta_analysis_all_p_values_results']
-    intermediate_meta_log_file_name = meta_analysis_results['intermediate_meta_log_file_name']
+    meta_log_header = meta_analysis_results['meta_log_header']
+    meta_log_lines = meta_analysis_results['meta_log_lines']
 
-    # FDR correct the meta data
-    corrected_p_values_dict = fdr_correction(meta_analysis_all_p_values_results)
+    # FDR correct the meta data (corrected pvalues in the same order as the log lines)
+    corrected_p_values = fdr_correction(meta_analysis_all_p_values_results)
 
-    # Variants with significant values list (used for later filtering)
-    meta_analysis_sig_variants_list=[]
-
-    # open up the temporary file for analysis (reads data)
-    initial_meta_log_file = open(intermediate_meta_log_file_name,'r')
+    # Variants with significant values (used for later filtering, a set for fast look-ups)
+    meta_analysis_sig_variants = set()
 
     variant_meta_analysis_results_file_name = meta_analysis_output_folder + '/variant_meta_analysis_results.txt'
 
-    # Final file for writing result to
-    final_meta_analysis_file = open(variant_meta_analysis_results_file_name,'w')
+    # Final file for writing result to (large write buffer, one write per variant)
+    final_meta_analysis_file = open(variant_meta_analysis_results_file_name,'w', buffering=1<<20)
 
-    # Index in List Counter for Movement
-    index_in_list_counter = 0
+    #Getting the header information
+    if meta_log_header is not None:
+        final_meta_analysis_file.write(meta_log_header+"\tBH_Adj_pvalue\tSignificant\n")
 
-    # Parsing through the data
-    for line in initial_meta_log_file:
-
-        #Getting the header information from the file
-        if line.startswith('#CHROM'):
+    # Going through the variants, the log parts of each variant and its original and corrected
+    # pvalues are all in the same order (p-values are already floats, nothing is re-parsed)
+    for line, variant, analyzed_values, chi_square_value, degrees_of_freedom, p_value, q_value in zip(
+            meta_log_lines, meta_analysis_results['meta_variant_names'], meta_analysis_results['meta_analyzed_values'],
+            meta_analysis_results['meta_chi_square_values'], meta_analysis_results['meta_degrees_of_freedom'],
+            meta_analysis_all_p_values_results, corrected_p_values):
 
-            #Get the line and remove newline character
-            header_line=line.rstrip() 
+        #Examine Significance for counting
+        if q_value < p_value_threshold:
+            verdict = 'yes'
 
-            final_meta_analysis_file.write(header_line+"\tBH_Adj_pvalue\tSignificant\n")
+            #get list of sig variants
+            meta_analysis_sig_variants.add(variant)
 
-        #go through the rest of the lines
         else:
+            verdict = 'no'
 
-            #Removing the new line character
-            line = line.rstrip('\n')
-
-            #parse the data line
-            parsed_line=line.split('\t')
-
-            #variant name (used for tallying significant variants)
-            variant=(parsed_line[0])+":"+(parsed_line[1])
-
-            # Retrieving variants analyzed in meta-analysis for logging
-            analyzed_values = parsed_line[8]
-
-            # Retrieving chi-square value from meta-analysis (important inf values)
-            chi_square_value = parsed_line[10]
-
-            # Retrieving degrees of freedom from meta-analysis
-            degrees_of_freedom = parsed_line[11]
-            
-            #Retrieving the original value to look up in dictionary
-            p_value = (parsed_line[12]).rstrip('\t')
-            p_value = float(p_value)
- 
-            # Get the dictionary results part of the list-dictionary combo
-            dictionary_results =(corrected_p_values_dict[index_in_list_counter][1])
-
-            # Add to index_in_list_counter now that values have been retrieved
-            index_in_list_counter += 1
-        
-            # Get the original pvalue for double-checking it matches
-            original_pvalue = dictionary_results['original_pvalue']
-
-            # Get the adjusted pvalue
-            fdr_pvalue = dictionary_results['adjusted_pvalue']
-
-            # Safety to kill program if lists being sorted over index order is wrong
-            if original_pvalue != p_value:
-                print ("P-value Lists Order is not correct, double check code")
-                print ("Killing program")
-                sys.exit(1)
-
-            #Rename Variable for Rest of Code
-            q_value = fdr_pvalue
-
-            final_meta_analysis_file.write(line + "\t" + str(q_value) + "\t")
-
-            #Examine Significance for counting
-            if float(q_value) < float(p_value_threshold):
-                verdict = 'yes'
-                final_meta_analysis_file.write(verdict + "\n")
-
-                #get list of sig variants
-                meta_analysis_sig_variants_list.append(variant)
+        final_meta_analysis_file.write(f"{line}\t{q_value}\t{verdict}\n")
 
-            else:
-                verdict = 'no'
-                final_meta_analysis_file.write(verdict + "\n")
-
-            meta_variants_results_dict.update({variant: {
-                'chi_square_value': chi_square_value,
-                'degrees_of_freedom': degrees_of_freedom,
-                'analyzed_values': analyzed_values,
-                'original_p_value': p_value,
-                'q_value': q_value,
-                'verdict': verdict}})
-
-    # Close the intermediate file
-    initial_meta_log_file.close()
-
-    # Delete the intermediate file
-    os.remove(intermediate_meta_log_file_name)
+        meta_variants_results_dict[variant] = {
+            'chi_square_value': chi_square_value,
+            'degrees_of_freedom': degrees_of_freedom,
+            'analyzed_values': analyzed_values,
+            'original_p_value': p_value,
+            'q_value': q_value,
+            'verdict': verdict}
 
     #Close the final meta_anlaysis file
     final_meta_analysis_file.close()
 
     #Return the significant SNPs Counter
-    return{'meta_analysis_sig_variants_list': meta_analysis_sig_variants_list,
+    return{'meta_analysis_sig_variants': meta_analysis_sig_variants,
            'variant_meta_analysis_results_file_name': variant_meta_analysis_results_file_name,
            'meta_variants_results_dict': meta_variants_results_dict}
 
@@ -2612,7 +2640,7 @@ def filter_for_meta_sig_variants(testable_variants_file_name, meta_analysis_outp
 
     : Param testable_variants_file_name: name of file with all testable variants
     : Param meta_analysis_output_folder: location where to output the data
-    : Param final_meta_analysis_sig_variants_results: list of all significant variants
+    : Param final_meta_analysis_sig_variants_results: set of all significant variants
 
     : Return sig_meta_file_name: file of all significant variants (original data)
     : Return meta_global_counts_dict: Tallies for global reporting
@@ -2634,7 +2662,7 @@ def filter_for_meta_sig_variants(testable_variants_file_name, meta_analysis_outp
         'Total_Non_Testable': 0}  
 
     # Getting 
-    meta_analysis_sig_variants_list = final_meta_analysis_sig_variants_results['meta_analysis_sig_variants_list']
+    meta_analysis_sig_variants = final_meta_analysis_sig_variants_results['meta_analysis_sig_variants']
 
     # creating new filtered file
     sig_meta_file_name = meta_analysis_output_folder + "/sig_meta_analysis_variants.txt"
@@ -2642,9 +2670,9 @@ def filter_for_meta_sig_variants(testable_variants_file_name, meta_analysis_outp
     # Create output folder for failing data for verification purposes
     not_sig_meta_file_name = meta_analysis_output_folder + "/not_sig_meta_analysis_variants.txt"
 
-    # Open the files for writing
-    sig_meta__file = open(sig_meta_file_name,'w')
-    not_sig_meta_file = open(not_sig_meta_file_name,'w')
+    # Open the files for writing (large write buffers, lines are written one at a time)
+    sig_meta__file = open(sig_meta_file_name,'w', buffering=1<<20)
+    not_sig_meta_file = open(not_sig_meta_file_name,'w', buffering=1<<20)
     
     #opening up variant file
     testable_variants_file = open(testable_variants_file_name, 'r')
@@ -2664,13 +2692,13 @@ def filter_for_meta_sig_variants(testable_variants_file_name, meta_analysis_outp
             #Tallying total testable variants
             meta_global_counts_dict['Biallelic_Testable_Variants']+= 1
             
-            #Splitting the data
-            parsed_line = line.rstrip().split('\t')
+            #Splitting the data (only the chromosome and position columns are needed)
+            parsed_line = line.split('\t', 2)
 
             #Getting Variant Results Only
             variant_name = parsed_line[0] + ":" + parsed_line[1]
 
-            if variant_name in meta_analysis_sig_variants_list:
+            if variant_name in meta_analysis_sig_variants:
                 sig_meta__file.write(line)
                 meta_global_counts_dict['Total_Sig_ASE_Variants']+= 1
 
@@ -2703,7 +2731,8 @@ def merge_final_results(meta_analysis_output_folder, sig_variants_final_output_f
     meta_variants_results_dict = final_meta_analysis_sig_variants_results['meta_variants_results_dict']
     
     # open up the temporary file for analysis (reads data)
-    sig_variants_meta_file = open((meta_analysis_output_folder + '/sig_variants_report_and_meta_results.txt'),'w')
+    sig_variants_meta_file = open((meta_analysis_output_folder + '/sig_variants_report_and_meta_results.txt'),'w',
+                                  buffering=1<<20)
     
     # open up significant variants results file (reads data)
     sig_variants_file = open(sig_variants_final_output_file_name,'r')
@@ -2724,26 +2753,22 @@ def merge_final_results(meta_analysis_output_folder, sig_variants_final_output_f
             #Removing the new line character
             line = line.rstrip('\n')
 
-            #parse the data line
-            parsed_line=line.split('\t')
+            #parse the data line (only the chromosome and position columns are needed)
+            parsed_line=line.split('\t', 2)
 
             #variant name (used for tallying significant variants)
             variant=(parsed_line[0])+":"+(parsed_line[1])
 
             if variant in meta_variants_results_dict:
-                analyzed_values = meta_variants_results_dict[variant]['analyzed_values']
-                chi_square_value = meta_variants_results_dict[variant]['chi_square_value']
-                degrees_of_freedom = meta_variants_results_dict[variant]['degrees_of_freedom']
-                meta_p_value = meta_variants_results_dict[variant]['original_p_value']
-                meta_q_value = meta_variants_results_dict[variant]['q_value']
-                meta_verdict = meta_variants_results_dict[variant]['verdict']
-
-                sig_variants_meta_file.write(line + "\t\tmeta_results\t" + str(analyzed_values)
-                                             + "\t" + str(chi_square_value)
-                                             + "\t" + str(degrees_of_freedom)
-                                             + "\t" + str(meta_p_value)
-                                             + "\t" + str(meta_q_value)
-                                             + "\t" + str(meta_verdict) + "\n")
+                meta_results = meta_variants_results_dict[variant]
+
+                # One formatted string and one write per variant
+                sig_variants_meta_file.write(f"{line}\t\tmeta_results\t{meta_results['analyzed_values']}"
+                                             f"\t{meta_results['chi_square_value']}"
+                                             f"\t{meta_results['degrees_of_freedom']}"
+                                             f"\t{meta_results['original_p_value']}"
+                                             f"\t{meta_results['q_value']}"
+                                             f"\t{meta_results['verdict']}\n")
                 
             else:
                 continue
@@ -2769,7 +2794,7 @@ def tally_final_meta_results(sig_meta_file_name, meta_global_counts_dict, meta_s
     : Return samples_list: List of sampels
     : Return samples_counters_dict: Dictionary with information about sample results
     : Return variant_list: List of variants being analyzed
-    : Return variant_results_dictionary: Tallying dictionary for variants
+    : Return variant_results_matrix: Tallying counts of each variant (columns in VARIANT_TALLY_COLUMNS order)
     : Return variant_header: Header of file with variants
     : Return tally_global_dictionary: Global tallying dictionary filled in with values
 
@@ -2781,11 +2806,12 @@ def tally_final_meta_results(sig_meta_file_name, meta_global_counts_dict, meta_s
     #opening up variant file
     final_results_file = open(sig_meta_file_name, 'r')
 
-    #Create a variant dictionary
-    variant_results_dictionary = {}
-
     #Create a variant list for cycling through
     variant_list = []
+
+    # Result category of every sample of every variant (one code per sample, tallied
+    # all at once with NumPy when the file is read)
+    sample_categories = []
     
     #reading file line by line
     for line in final_results_file:
@@ -2798,7 +2824,7 @@ def tally_final_meta_results(sig_meta_file_name, meta_global_counts_dict, meta_s
 
             # Getting Variant Header
             variant_header = parsed_line[:8]
-            variant_header = ('\t'.join(map(str,variant_header)))
+            variant_header = ('\t'.join(variant_header))
 
             # Retrieve_Sample_Names_for_Logging
             samples_list = parsed_line[9:]
@@ -2817,103 +2843,58 @@ def tally_final_meta_results(sig_meta_file_name, meta_global_counts_dict, meta_s
             
             #Variant information
             variant_info = parsed_line[:8]
-            variant_key = ('\t'.join(map(str,variant_info)))
+            variant_key = ('\t'.join(variant_info))
 
             # Add new variant to list
             variant_list.append(variant_key)
-
-            variant_results_dictionary.update({variant_key: {'Biallelic_Testable': 0, 'Sig_ASE': 0, 
-                           'Sig_ASE_Ref': 0, 'Sig_ASE_Alt': 0,
-                           'Biallelic_No_ASE': 0,
-                           'Passing_Homozygous': 0,
-                           'Homozygous_Ref': 0,
-                           'Homozygous_Alt': 0,                                  
-                           'Non_Testable': 0}}) 
             
             # Getting variant results
             variant_sample_results=parsed_line[9:]
 
+            # More samples than the header would not have a sample name to be tallied under
+            if len(variant_sample_results) > numb_individuals:
+                print ("ERROR Alert!")
+                print ("Variant has more samples than the header of the file")
+                print (line)
+                sys.exit()
+
             #Starting reading and writing 
-            x=0
             for sample_data in variant_sample_results:
 
-                #get sample name from Index Location
-                sample = samples_list[x]
-
-                # Tallying all tests possible
-                tally_global_dictionary ['Total_Tests'] += 1
-
                 #Splitting the data for later parsing
                 split_sample_data = sample_data.split(':')
 
                 if split_sample_data[0]=='Biallelic':
-                    tally_global_dictionary ['Total_Biallelic_Samples'] += 1
-                    samples_counters_dict[sample]['Biallelic_Testable'] += 1
-                    variant_results_dictionary[variant_key]['Biallelic_Testable'] += 1
-
-                    # Getting the p-value of interest from the data (reference index)
-                    sample_p_value = float(split_sample_data[3])
 
-                    #Test if breach p_value cutoff
-                    if float(sample_p_value) < float(meta_sample_p_value_cutoff):
-                        tally_global_dictionary ['Total_Sig_Biallelic_Samples'] += 1
-                        samples_counters_dict[sample]['Sig_ASE'] += 1
-                        variant_results_dictionary[variant_key]['Sig_ASE'] += 1
+                    # Getting the p-value of interest from the data (Test if breach p_value cutoff)
+                    if float(split_sample_data[3]) < meta_sample_p_value_cutoff:
 
                         #Look to see if ref or alt is higher
-                        variant_counts = (split_sample_data[2])
-                        split_counts = variant_counts.split(',')
+                        split_counts = split_sample_data[2].split(',')
 
                         # If Ref is Higher Than Alt
                         if int(split_counts[0]) > int(split_counts[1]):
-                            samples_counters_dict[sample]['Sig_ASE_Ref'] += 1
-                            tally_global_dictionary ['Total_Sig_ASE_Ref'] += 1
-                            variant_results_dictionary[variant_key]['Sig_ASE_Ref'] += 1
-
-                            # Move Counter
-                            x+= 1
+                            sample_categories.append(SIG_ASE_REF_SAMPLE)
 
                         # If Alt is Higher Than Ref
                         else:
-                            samples_counters_dict[sample]['Sig_ASE_Alt'] += 1
-                            tally_global_dictionary ['Total_Sig_ASE_Alt'] += 1
-                            variant_results_dictionary[variant_key]['Sig_ASE_Alt'] += 1
-
-                            # Move Counter
-                            x+= 1
+                            sample_categories.append(SIG_ASE_ALT_SAMPLE)
                             
                     #Biallic but not significant (fails cutoff)
                     else:
-                        samples_counters_dict[sample]['Biallelic_No_ASE'] += 1
-                        tally_global_dictionary ['Total_Biallelic_No_ASE'] += 1
-                        variant_results_dictionary[variant_key]['Biallelic_No_ASE'] += 1
-
-                        # Move Counter
-                        x+= 1
-                        
-                        
+                        sample_categories.append(BIALLELIC_NO_ASE_SAMPLE)
+                          
                 #Homozygous passing sample 
                 elif split_sample_data[0]=='Homo':
-                    samples_counters_dict[sample]['Passing_Homozygous'] += 1
-                    tally_global_dictionary ['Total_Passing_Homozygous'] += 1
-                    variant_results_dictionary[variant_key]['Passing_Homozygous'] += 1
 
                     #Tally Type of Homozygous Genotype (allow freq calculations) 
                     homozygous_genotype = (split_sample_data[1])
 
                     if homozygous_genotype == "0/0":
-                        samples_counters_dict[sample]['Passing_Homozygous_Ref'] += 1
-                        variant_results_dictionary[variant_key]['Homozygous_Ref'] += 1
-                        tally_global_dictionary ['Total_Passing_Homozygous_Ref'] += 1
-                        # Move Counter
-                        x+= 1
+                        sample_categories.append(HOMOZYGOUS_REF_SAMPLE)
 
                     elif homozygous_genotype == "1/1":
-                        samples_counters_dict[sample]['Passing_Homozygous_Alt'] += 1
-                        variant_results_dictionary[variant_key]['Homozygous_Alt'] += 1
-                        tally_global_dictionary ['Total_Passing_Homozygous_Alt'] += 1
-                        # Move Counter
-                        x+= 1
+                        sample_categories.append(HOMOZYGOUS_ALT_SAMPLE)
 
                     else:
                         print ("Danger Incorrect Genotype")
@@ -2925,17 +2906,19 @@ def tally_final_meta_results(sig_meta_file_name, meta_global_counts_dict, meta_s
                             
                 # No passing sample  
                 else:
-                    samples_counters_dict[sample]['Non_Testable'] += 1
-                    tally_global_dictionary['Total_Non_Testable'] += 1
-                    variant_results_dictionary[variant_key]['Non_Testable'] += 1
+                    sample_categories.append(NON_TESTABLE_SAMPLE)
 
-                    # Move Counter
-                    x+= 1
+            # Samples missing from the end of the line are not tallied
+            sample_categories.extend([MISSING_SAMPLE] * (numb_individuals - len(variant_sample_results)))
 
-    #Closing the initial file
+    # Closing the initial file
     final_results_file.close()
 
-    return (samples_list, samples_counters_dict, variant_list, variant_results_dictionary, variant_header,
+    # Tallying the samples, variants and global results from the sample categories
+    variant_results_matrix = tally_sample_categories(sample_categories, samples_list, samples_counters_dict,
+                                                     variant_list, tally_global_dictionary)
+
+    return (samples_list, samples_counters_dict, variant_list, variant_results_matrix, variant_header,
             tally_global_dictionary)
 
 
@@ -2962,14 +2945,8 @@ def create_sample_tallying_dict(samples_list):
 
     """
 
-    # Create dictionary
-    tallying_dict = {}
-
-    # Loop over the samples list
-    for sample in samples_list:
-
-        # Add entry to dictionary
-        tallying_dict.update({sample: {'total_count': 0, 'testable_biallelic': 0}})
+    # Create dictionary (an independent entry for each sample)
+    tallying_dict = {sample: {'total_count': 0, 'testable_biallelic': 0} for sample in samples_list}
 
     return(tallying_dict)
 
@@ -3004,10 +2981,6 @@ def count_sample_biallelic_testable(input_file_name):
             # Splitting the data
             parsed_line = line.rstrip().split('\t')
 
-            # Getting Variant Header
-            variant_header = parsed_line[:8]
-            variant_header = ('\t'.join(map(str,variant_header)))
-
             # Retrieve_Sample_Names_for_Logging
             samples_list = parsed_line[9:]
             numb_individuals = len(samples_list)
@@ -3015,45 +2988,42 @@ def count_sample_biallelic_testable(input_file_name):
             #Create a tallying dictionary for results
             testable_samples_counters_dict = create_sample_tallying_dict(samples_list)
 
+            # Counts of each sample column (added to the dictionary once the file is read)
+            total_counts = [0] * numb_individuals
+            biallelic_counts = [0] * numb_individuals
+
         # Start Examing the Samples
         else:
             
-            # Splitting the data
-            parsed_line = line.rstrip().split('\t')
-
-            # Getting Variant Header
-            variant_header = parsed_line[:8]
-            variant_header = ('\t'.join(map(str,variant_header)))
+            # Splitting the data (only the sample calls are needed)
+            sample_allelic_results_calls = line.rstrip().split('\t')[9:]
 
-            # Retrieve sample calls
-            sample_allelic_results_calls = parsed_line[9:]
-
-            # Sample index counter
-            sample_index_counter = 0
+            # More samples than the header would not have a sample name to be tallied under
+            if len(sample_allelic_results_calls) > numb_individuals:
+                print ("ERROR Alert!")
+                print ("Variant has more samples than the header of the file")
+                print (line)
+                sys.exit()
 
             # Loop over the samples
-            for sample_call in sample_allelic_results_calls:
-
-                # Get Sample ID
-                sample_id = samples_list[sample_index_counter]
+            for x, sample_call in enumerate(sample_allelic_results_calls):
 
-                # Add to the dictionary counter
-                testable_samples_counters_dict[sample_id]['total_count'] +=1
+                total_counts[x] += 1
 
                 # Get the Biallelic passing variants
-                if sample_call.startswith('Biallelic'):
-                    testable_samples_counters_dict[sample_id]['testable_biallelic'] +=1
-
                 # Skip over the rest of the sample variant verdicts
                 # Possible options: No_Data, Homo_Low_Count, Homo, Low_Read_Count, Low_Allele_Count
-                else:
-                    pass
-                    
-                # Add to the counter
-                sample_index_counter +=1
+                if sample_call.startswith('Biallelic'):
+                    biallelic_counts[x] += 1
 
     # Close the file
     input_file.close()
+
+    # Add to the dictionary counters (a repeated sample name shares its counters)
+    for x, sample in enumerate(samples_list):
+        sample_counters = testable_samples_counters_dict[sample]
+        sample_counters['total_count'] += total_counts[x]
+        sample_counters['testable_biallelic'] += biallelic_counts[x]
    
     return(testable_samples_counters_dict)
 
@@ -3083,10 +3053,9 @@ def create_sample_tallying_counters(samples_list):
 
     for sample in samples_list:
 
-        #Making a deep copy of the dictionary, so each one is independent
-        tallying_dictionary = copy.deepcopy(tallying_dictionary)
-        
-        samples_counters_dict.update({sample: tallying_dictionary})
+        #Making a copy of the empty dictionary, so each one is independent
+        #(values are only integer counters, so a shallow copy is enough)
+        samples_counters_dict[sample] = dict(tallying_dictionary)
     
     return(samples_counters_dict)
 
@@ -3105,36 +3074,28 @@ def printing_sample_results(folder_pathway, samples_list, samples_counters_dict,
     
     """
     
-    samples_report_file = open(folder_pathway + "/sig_samples_report.txt", "w")
-
-    samples_report_file.write("Sample\tTestableFile_Biallelic_Testable\t\tSigResultsFile_Biallelic_Testable\tBiallelic_No_ASE\tSig_ASE\t\tSig_ASE_Ref\tSig_ASE_Alt\t"
-                             "\tHomo_Passing\t\tHomo_Ref\tHomo_Alt\t\tNon-Testable\n")
+    samples_report_lines = ["Sample\tTestableFile_Biallelic_Testable\t\tSigResultsFile_Biallelic_Testable\tBiallelic_No_ASE\tSig_ASE\t\tSig_ASE_Ref\tSig_ASE_Alt\t"
+                            "\tHomo_Passing\t\tHomo_Ref\tHomo_Alt\t\tNon-Testable\n"]
 
     for sample in samples_list:
-        biallelic_testable = str(samples_counters_dict[sample]['Biallelic_Testable'])
-        sig_ase = str(samples_counters_dict[sample]['Sig_ASE'])
-        sig_ase_ref = str(samples_counters_dict[sample]['Sig_ASE_Ref'])
-        sig_ase_alt = str(samples_counters_dict[sample]['Sig_ASE_Alt'])
-        biallelic_no_ase = str(samples_counters_dict[sample]['Biallelic_No_ASE'])
-        passing_homozygous = str(samples_counters_dict[sample]['Passing_Homozygous'])
-        passing_homozygous_ref = str(samples_counters_dict[sample]['Passing_Homozygous_Ref'])
-        passing_homozygous_alt = str(samples_counters_dict[sample]['Passing_Homozygous_Alt'])
-        non_testable = str(samples_counters_dict[sample]['Non_Testable'])
+        sample_counters = samples_counters_dict[sample]
 
         # Get the global testable count from the testable file not just from the significant file
-        testablefile_biallelic_testable = str(testable_file_biallelic_samples_dict[sample]['testable_biallelic'])
+        testablefile_biallelic_testable = testable_file_biallelic_samples_dict[sample]['testable_biallelic']
  
-        samples_report_file.write(str(sample) + "\t"
-                                  + testablefile_biallelic_testable + "\t\t"
-                                  + biallelic_testable + "\t"
-                                  + biallelic_no_ase + "\t"
-                                  + sig_ase + "\t"
-                                  + "ASE Breakdown:" + "\t"
-                                  + sig_ase_ref + "\t" + sig_ase_alt + "\t\t" 
-                                  + passing_homozygous + "\tHomo_Breakdown\t"
-                                  + passing_homozygous_ref + "\t" + passing_homozygous_alt
-                                  + "\t\t" + non_testable + "\n")
-                            
+        samples_report_lines.append(f"{sample}\t{testablefile_biallelic_testable}\t\t"
+                                    f"{sample_counters['Biallelic_Testable']}\t"
+                                    f"{sample_counters['Biallelic_No_ASE']}\t"
+                                    f"{sample_counters['Sig_ASE']}\tASE Breakdown:\t"
+                                    f"{sample_counters['Sig_ASE_Ref']}\t{sample_counters['Sig_ASE_Alt']}\t\t"
+                                    f"{sample_counters['Passing_Homozygous']}\tHomo_Breakdown\t"
+                                    f"{sample_counters['Passing_Homozygous_Ref']}\t"
+                                    f"{sample_counters['Passing_Homozygous_Alt']}\t\t"
+                                    f"{sample_counters['Non_Testable']}\n")
+
+    # All the rows are written at once
+    samples_report_file = open(folder_pathway + "/sig_samples_report.txt", "w")
+    samples_report_file.writelines(samples_report_lines)
     samples_report_file.close()
 
 
@@ -3152,23 +3113,44 @@ def creating_frequency_bin_dict():
     
     '''
 
-    freq_bin_dict ={}
-    for x in range(0, 10, 1):
-
-        freq_bin_dict.update({x: 0})
+    freq_bin_dict = {x: 0 for x in range(0, 10, 1)}
 
     # Add a final total category for tallying
-    freq_bin_dict.update({'total': 0})
+    freq_bin_dict['total'] = 0
 
     # Tally for number of samples (should be the same for every variant)
-    freq_bin_dict.update({'total_sample_count': 0})
-
-    # Making a deep of the dictionary, so each is independent
-    freq_bin_dict = copy.deepcopy(freq_bin_dict)
+    freq_bin_dict['total_sample_count'] = 0
 
     return(freq_bin_dict)
 
 
+def add_to_frequency_bins(freq_bin_dict, variant_bins, total_sample_counts):
+
+    '''
+
+    Adds the bin of every variant to a frequency bin dictionary
+    (all variants at once)
+
+    : Param freq_bin_dict: Frequency bin dictionary being filled in
+    : Param variant_bins: NumPy array with the bin (0-9) of each variant
+    : Param total_sample_counts: NumPy array with the total sample count of each variant
+
+    : Return NONE:
+
+    '''
+
+    #Adding to frequency bin
+    for freq_bin, bin_count in enumerate(np.bincount(variant_bins, minlength=10).tolist()):
+        freq_bin_dict[freq_bin] += bin_count
+    freq_bin_dict['total'] += len(variant_bins)
+
+    # Just recording for printing purposes (NO TALLYING OCCURRING, last variant)
+    if len(total_sample_counts):
+        freq_bin_dict['total_sample_count'] = int(total_sample_counts[-1])
+
+    return()
+
+
 def printing_frequency_dictionary(folder_pathway, freq_bin_dict, study_file_name,
                                   study_description):
     
@@ -3185,32 +3167,19 @@ def printing_frequency_dictionary(folder_pathway, freq_bin_dict, study_file_name
     
     """
     
-    dict_out_file = open(folder_pathway + "/" + study_file_name + ".txt", "w")
+    # Bin labels (0.0 - 0.1 up to 0.9 - 1.0) and counts, the whole report is written at once
+    bin_lines = "".join(f"{freq_bin / 10:.1f} - {(freq_bin + 1) / 10:.1f}\t{freq_bin_dict[freq_bin]}\n"
+                        for freq_bin in range(0, 10, 1))
 
-    dict_out_file.write(study_description + "\n")
-    dict_out_file.write("\n")
-    dict_out_file.write("Bin\tCounts\n")
-    dict_out_file.write("0.0 - 0.1\t" + str(freq_bin_dict[0]) + "\n")
-    dict_out_file.write("0.1 - 0.2\t" + str(freq_bin_dict[1]) + "\n")
-    dict_out_file.write("0.2 - 0.3\t" + str(freq_bin_dict[2]) + "\n")
-    dict_out_file.write("0.3 - 0.4\t" + str(freq_bin_dict[3]) + "\n")
-    dict_out_file.write("0.4 - 0.5\t" + str(freq_bin_dict[4]) + "\n")
-    dict_out_file.write("0.5 - 0.6\t" + str(freq_bin_dict[5]) + "\n")
-    dict_out_file.write("0.6 - 0.7\t" + str(freq_bin_dict[6]) + "\n")
-    dict_out_file.write("0.7 - 0.8\t" + str(freq_bin_dict[7]) + "\n")
-    dict_out_file.write("0.8 - 0.9\t" + str(freq_bin_dict[8]) + "\n")
-    dict_out_file.write("0.9 - 1.0\t" + str(freq_bin_dict[9]) + "\n")
-    dict_out_file.write("\n")
-    dict_out_file.write("\n")
-    dict_out_file.write("Total number of variants analyzed: "
-                        + str(freq_bin_dict['total']) + "\n")
-    dict_out_file.write("Total number of possible samples per variant: "
-                        + str(freq_bin_dict['total_sample_count']))
+    dict_out_file = open(folder_pathway + "/" + study_file_name + ".txt", "w")
+    dict_out_file.write(f"{study_description}\n\nBin\tCounts\n{bin_lines}\n\n"
+                        f"Total number of variants analyzed: {freq_bin_dict['total']}\n"
+                        f"Total number of possible samples per variant: {freq_bin_dict['total_sample_count']}")
     dict_out_file.close()
     return()
 
 
-def printing_variant_results(folder_pathway, variant_list, variant_results_dictionary, variant_header):
+def printing_variant_results(folder_pathway, variant_list, variant_results_matrix, variant_header):
     
     """
 
@@ -3218,8 +3187,8 @@ def printing_variant_results(folder_pathway, variant_list, variant_results_dicti
     the printing of all frequency bin tables of results
     
     : Param folder_pathway: Pathway where to output the results
-    : Param variant_list: List of variants to keep dictionary in order
-    : Param variant_results_dictionary: Dictionary of all tallying of variant data
+    : Param variant_list: List of variants (same order as the rows of the tallying counts)
+    : Param variant_results_matrix: Tallying counts of each variant (columns in VARIANT_TALLY_COLUMNS order)
     : Param variant_header: Varaint header information to output to file
     
     : Return sig_variants_final_output_file_name: Returns file name for meta-analysis
@@ -3229,92 +3198,57 @@ def printing_variant_results(folder_pathway, variant_list, variant_results_dicti
 
     sig_variants_final_output_file_name = folder_pathway + "/sig_variants_report.txt"
     
-    variants_report_file = open(sig_variants_final_output_file_name, "w")
+    variants_report_file = open(sig_variants_final_output_file_name, "w", buffering=1<<20)
 
     variants_report_file.write(variant_header+ "\tAlt_Allele_Freq\tBiallelic_Testable\tBiallelic_No_ASE\tSig_ASE\t\tSig_ASE_Ref\tSig_ASE_Alt\t"
                              "\tHomo_Passing\t\tHomo_Ref\tHomo_Alt\t\tNon-Testable\n")
 
+    # Counts of all variants at once (columns in the order of VARIANT_TALLY_COLUMNS)
+    (biallelic_testable, sig_ase, sig_ase_ref, sig_ase_alt, biallelic_no_ase, passing_homozygous,
+     homozygous_ref_samples, homozygous_alt_samples, non_testable) = variant_results_matrix.T
+
+    # Total Sample Count
+    total_sample_counts = biallelic_testable + passing_homozygous + non_testable
+
+    # Calculating MAF
+    # Alternative Counts and Total Counts (reference plus alternative) from samples
+    alternative_counts = (biallelic_testable + 2 * homozygous_alt_samples).tolist()
+    total_counts = (2 * biallelic_testable + 2 * homozygous_ref_samples + 2 * homozygous_alt_samples).tolist()
+
+    # Getting the minor allele frequency from the counts (Python round, as printed)
+    # NOTE: MAF variable name is confusing SHOULD HAVE BEEN- alt_allele_freq
+    MAF_values = [round((alternative_count / total_count), 2)
+                  for alternative_count, total_count in zip(alternative_counts, total_counts)]
+
+    ################################################################
+    # Analyzing Overall ASE Prevalance Amoung Samples for a Variant
+    # Prevlance Amoung Variant (100% goes in the last bin)
+    prevalance_bins = np.minimum((sig_ase / total_sample_counts * 10).astype(np.int64), 9)
+
     # Sample Prevalance of ASE Dictionary
     sample_prev_freq_bin_dict = creating_frequency_bin_dict()
+    add_to_frequency_bins(sample_prev_freq_bin_dict, prevalance_bins, total_sample_counts)
+    ################################################################
+
+    ################################################################
+    # Analyzing Overall ASE Frequency (What freq shows ASE most)
+    # Prevlance Amoung Variant (100% goes in the last bin)
+    freq_bins = np.minimum((np.array(MAF_values, dtype=np.float64) * 10).astype(np.int64), 9)
 
     # ASE variant freq bin
     ase_variant_freq_bin_dict = creating_frequency_bin_dict()
-    
-    for variant in variant_list:
-        biallelic_testable = str(variant_results_dictionary[variant]['Biallelic_Testable'])
-        sig_ase = str(variant_results_dictionary[variant]['Sig_ASE'])
-        sig_ase_ref = str(variant_results_dictionary[variant]['Sig_ASE_Ref'])
-        sig_ase_alt = str(variant_results_dictionary[variant]['Sig_ASE_Alt'])
-        biallelic_no_ase = str(variant_results_dictionary[variant]['Biallelic_No_ASE'])
-        passing_homozygous = str(variant_results_dictionary[variant]['Passing_Homozygous'])
-
-        # Breakdown of Homozygous sample counts 
-        homozygous_ref_samples = str(variant_results_dictionary[variant]['Homozygous_Ref'])
-        homozygous_alt_samples = str(variant_results_dictionary[variant]['Homozygous_Alt'])
-
-        # Non-testable Sample Counts
-        non_testable = str(variant_results_dictionary[variant]['Non_Testable'])
-
-        # Total Sample Count
-        total_sample_count = (int(biallelic_testable) + int(passing_homozygous) + int(non_testable))
-
-        ################################################################
-        # Analyzing Overall ASE Prevalance Amoung Samples for a Variant
-        # Prevlance Amoung Variant
-        prevalance = int(int(sig_ase) / total_sample_count * 10)
-        # Check not 100%, otherwise subtract 1
-        if prevalance == 10:
-            prevalance = prevalance - 1
-        else:
-            pass
-        #Adding to frequency bin
-        sample_prev_freq_bin_dict[prevalance] += 1
-        sample_prev_freq_bin_dict['total'] += 1
-        # Just recording for printing purposes (NO TALLYING OCCURRING)
-        sample_prev_freq_bin_dict['total_sample_count'] = total_sample_count
-        ################################################################
-
-        # Calculating MAF
-        # Counts from samples
-        biallelic_count = int((variant_results_dictionary[variant]['Biallelic_Testable']))
-        homozygous_ref_count = 2*(int(variant_results_dictionary[variant]['Homozygous_Ref']))
-        homozygous_alt_count = 2*(int(variant_results_dictionary[variant]['Homozygous_Alt']))
-
-        # Reference Counts
-        reference_count = biallelic_count + homozygous_ref_count
-        # Alternative Counts
-        alternative_count = biallelic_count + homozygous_alt_count
-        # Total Counts
-        total_count = reference_count + alternative_count                    
-
-        # Getting the minor allele frequency from the counts
-        # NOTE: MAF variable name is confusing SHOULD HAVE BEEN- alt_allele_freq
-        MAF = str(round((alternative_count / total_count),2))
-
-        ################################################################
-        # Analyzing Overall ASE Frequency (What freq shows ASE most)
-        # Prevlance Amoung Variant
-        freq_bin = int(float(MAF)*10)
-        # Check not 100%, otherwise subtract 1
-        if freq_bin == 10:
-            freq_bin = freq_bin - 1
-        else:
-            pass
-        #Adding to frequency bin
-        ase_variant_freq_bin_dict[freq_bin] += 1
-        ase_variant_freq_bin_dict['total'] += 1
-        # Just recording for printing purposes (NO TALLYING OCCURRING)
-        ase_variant_freq_bin_dict['total_sample_count'] = total_sample_count
-        ################################################################
-
-        # Printing all variants results to the file                    
-        variants_report_file.write(str(variant) + "\t" + MAF + "\t" + biallelic_testable + "\t"
-                                  + biallelic_no_ase + "\t"
-                                  + sig_ase + "\t"
-                                  + "ASE_Breakdown:" + "\t"
-                                  + sig_ase_ref + "\t" + sig_ase_alt + "\t\t" 
-                                  + passing_homozygous + "\tHomo_Breakdown\t"  + homozygous_ref_samples
-                                  + "\t" + homozygous_alt_samples + "\t\t" + non_testable + "\n")
+    add_to_frequency_bins(ase_variant_freq_bin_dict, freq_bins, total_sample_counts)
+    ################################################################
+
+    # Printing all variants results to the file (one formatted row per variant, counts in the
+    # order of VARIANT_TALLY_COLUMNS)
+    variants_report_file.writelines(
+        f"{variant}\t{MAF}\t{biallelic_testable}\t{biallelic_no_ase}\t{sig_ase}\tASE_Breakdown:\t"
+        f"{sig_ase_ref}\t{sig_ase_alt}\t\t{passing_homozygous}\tHomo_Breakdown\t{homozygous_ref_samples}"
+        f"\t{homozygous_alt_samples}\t\t{non_testable}\n"
+        for variant, MAF, (biallelic_testable, sig_ase, sig_ase_ref, sig_ase_alt, biallelic_no_ase,
+                           passing_homozygous, homozygous_ref_samples, homozygous_alt_samples, non_testable)
+        in zip(variant_list, MAF_values, variant_results_matrix.tolist()))
 
     variants_report_file.close()
 
@@ -3384,15 +3318,20 @@ def printing_summary_report(folder_pathway, tally_global_dictionary,
     summary_report.write("######################################################################\n")
     summary_report.write("\n")
     summary_report.write("from __future__ import division\n")
+    summary_report.write("import array\n")
+    summary_report.write("import bisect\n")
+    summary_report.write("import mmap\n")
+    summary_report.write("import multiprocessing\n")
     summary_report.write("import os.path\n")
+    summary_report.write("import re\n")
+    summary_report.write("import shutil\n")
     summary_report.write("import sys\n")
     summary_report.write("import time\n")
     summary_report.write("from scipy import stats\n")
-    summary_report.write("from scipy.stats import combine_pvalues\n")
     summary_report.write("import numpy as np\n")
-    summary_report.write("import copy\n")
     summary_report.write("from datetime import datetime\n")
     summary_report.write("from platform import python_version\n")
+    summary_report.write("from typing import NamedTuple\n")
     summary_report.write("\n")
     summary_report.write("\n")
 
@@ -3401,24 +3340,22 @@ def printing_summary_report(folder_pathway, tally_global_dictionary,
     summary_report.write("######################################################################\n")
 
     summary_report.write("\n")
-    summary_report.write("The input file is: " + str(parameter_stuff['file_name'])+"\n")
+    summary_report.write("The input file is: " + str(parameter_stuff.file_name)+"\n")
     summary_report.write("\n")
     summary_report.write("User defined output location: " + user_defined_output_location + "\n")
     summary_report.write("\n")
     summary_report.write("The minimum qualtity score (phred score) for a variant is: "
-                         + str(parameter_stuff['quality_score_min']) + "\n")
+                         + str(parameter_stuff.quality_score_min) + "\n")
     summary_report.write("The indel exclusion region length is: "
-                         + str(parameter_stuff['indel_exclusion_region_length']) + " basepairs from an indel\n")
-    summary_report.write("The number of allowable reference alleles is (currently program is limited to one): "
-                         + str(parameter_stuff['numb_ref_alleles_allowed']) + "\n")
-    summary_report.write("The number of allowable alternative alleles is (currently program is limited to one): "
-                         + str(parameter_stuff['numb_alt_alleles_allowed']) + "\n")
+                         + str(parameter_stuff.indel_exclusion_region_length) + " basepairs from an indel\n")
+    summary_report.write("The number of allowable reference alleles is (currently program is limited to one): 1\n")
+    summary_report.write("The number of allowable alternative alleles is (currently program is limited to one): 1\n")
     summary_report.write("The minimum number of total read counts for a sample per variant is: "
-                         + str(parameter_stuff['min_total_read_count']) + "\n")
+                         + str(parameter_stuff.min_total_read_count) + "\n")
     summary_report.write("\n")
     summary_report.write("IMPORTANT TO NOTE BINOMIAL PROBABILITY VALUE\n")
     summary_report.write("The binomial probability is set to: "
-                         + str(parameter_stuff['binomial_probability_value']) + "\n")
+                         + str(parameter_stuff.binomial_probability_value) + "\n")
     summary_report.write("\n")
     summary_report.write("\n")
 
@@ -3432,7 +3369,7 @@ def printing_summary_report(folder_pathway, tally_global_dictionary,
     summary_report.write("Directory created by VADT output: " + vadt_output_directory + "\n")
     summary_report.write("\n")
     summary_report.write("The FULL output directory for analysis is: "
-                         + str(parameter_stuff['output_file_location'])+"\n")
+                         + str(parameter_stuff.output_file_location)+"\n")
     summary_report.write("\n")
     summary_report.write("\n")
     
@@ -3441,8 +3378,8 @@ def printing_summary_report(folder_pathway, tally_global_dictionary,
     summary_report.write("######################################################################\n")
 
     summary_report.write("\n")
-    summary_report.write("The number of variants in the file: "+str(raw_rna_seq_stats['variants_in_file']) + "\n")
-    summary_report.write("The number of samples in the VCF file are: "+str(raw_rna_seq_stats['no_of_individuals_in_file']) + "\n")
+    summary_report.write("The number of variants in the file: "+str(raw_rna_seq_stats.variants_in_file) + "\n")
+    summary_report.write("The number of samples in the VCF file are: "+str(raw_rna_seq_stats.no_of_individuals_in_file) + "\n")
     summary_report.write("\n")
     summary_report.write("\n")
 
@@ -3452,12 +3389,12 @@ def printing_summary_report(folder_pathway, tally_global_dictionary,
 
     summary_report.write("\n")
     summary_report.write("The number of variants that failed GATK filters: "
-                         + str(raw_rna_seq_stats['failed_GATK_SNP_filter']) + "\n")
+                         + str(raw_rna_seq_stats.failed_GATK_SNP_filter) + "\n")
     summary_report.write("The number of variants that failed Qualtity Score Filter (<20): "
-                         + str(raw_rna_seq_stats['failed_Qual_filter']) + "\n")
+                         + str(raw_rna_seq_stats.failed_Qual_filter) + "\n")
     summary_report.write("\n")
     summary_report.write("The number of indel exclusion regions identified: "
-                         + str(raw_rna_seq_stats['no_indel_exclusion_regions']) + "\n")
+                         + str(raw_rna_seq_stats.no_indel_exclusion_regions) + "\n")
     summary_report.write("The number of indels identified (some variants have multiple indels): "
                          + str(indel_stats_dict['number_indels_identified']) + "\n")
     summary_report.write("The longest indel was : "
@@ -3467,12 +3404,12 @@ def printing_summary_report(folder_pathway, tally_global_dictionary,
     summary_report.write("The average indel length was : "
                          + str(round(indel_stats_dict['average_indel'], 2)) + " bases \n")
     summary_report.write("The number of variants excluded because of indel exclusion regions: "
-                         + str(raw_rna_seq_stats['numb_SNPs_excl_Indels']) + "\n")
+                         + str(raw_rna_seq_stats.numb_SNPs_excl_Indels) + "\n")
     summary_report.write("\n")
     summary_report.write("The number of variants excluded with too many reference alleles: "
-                         + str(raw_rna_seq_stats['ref_allele_mutiple_forms']) + "\n")
+                         + str(raw_rna_seq_stats.ref_allele_mutiple_forms) + "\n")
     summary_report.write("The number of variants excluded with too many alternative alleles: "
-                         + str(raw_rna_seq_stats['alt_allele_mutiple_forms']) + "\n")
+                         + str(raw_rna_seq_stats.alt_allele_mutiple_forms) + "\n")
     summary_report.write("\n")
 
     summary_report.write("######################################################################\n")
@@ -3483,22 +3420,22 @@ def printing_summary_report(folder_pathway, tally_global_dictionary,
     summary_report.write("Each sample is investigated and if ALL samples fail the variant fails\n")
     summary_report.write("\n")
     summary_report.write("The number of variants excluded with no genotype values (all samples): "
-                         + str(raw_rna_seq_stats['no_genotype_values']) + "\n")
+                         + str(raw_rna_seq_stats.no_genotype_values) + "\n")
     summary_report.write("The number of variants excluded with low read counts values (all samples): "
-                         + str(raw_rna_seq_stats['low_read_count']) + "\n")
+                         + str(raw_rna_seq_stats.low_read_count) + "\n")
     summary_report.write("The number of variants excluded with low freq count (all samples): "
-                         + str(raw_rna_seq_stats['low_freq_count']) + "\n")
+                         + str(raw_rna_seq_stats.low_freq_count) + "\n")
     summary_report.write("The number of variants excluded that were all homozygous reference calls (all samples): "
-                         + str(raw_rna_seq_stats['no_ref_homozygous_variants']) + "\n")
+                         + str(raw_rna_seq_stats.no_ref_homozygous_variants) + "\n")
     summary_report.write("The number of variants excluded that were all homozygous alternative calls (all samples): "
-                         + str(raw_rna_seq_stats['no_alt_homozygous_variants']) + "\n")
+                         + str(raw_rna_seq_stats.no_alt_homozygous_variants) + "\n")
     summary_report.write("The number of variants excluded that were  a combination of homozygous calls (all samples): "
-                         + str(raw_rna_seq_stats['no_combo_homozygous_variants']) + "\n")
+                         + str(raw_rna_seq_stats.no_combo_homozygous_variants) + "\n")
     summary_report.write("The number of variants excluded that fail for a combo of filter failures (combination of all prior filters): "
-                         + str(raw_rna_seq_stats['combo_filter_failure']) + "\n")
+                         + str(raw_rna_seq_stats.combo_filter_failure) + "\n")
     summary_report.write("\n")
     summary_report.write("The number of passing variants: "
-                         + str(raw_rna_seq_stats['passing_variants']) + "\n")
+                         + str(raw_rna_seq_stats.passing_variants) + "\n")
     summary_report.write("\n")
     summary_report.write("The average reference allele ratio for testable variants is: "
                          + str(round(avg_ref_allele_ratio, 4)) + "\n")
@@ -3510,9 +3447,9 @@ def printing_summary_report(folder_pathway, tally_global_dictionary,
     summary_report.write("######################################################################\n")
 
     # Getting the p-value cutoffs from the parameter dictionary
-    multi_dim_adjust_pvalue_cutoff = parameter_stuff['multi_dim_adjust_pvalue_cutoff']
-    meta_BH_adj_p_value_cutoff = parameter_stuff['meta_BH_adj_p_value_cutoff']
-    meta_sample_p_value_cutoff = parameter_stuff['meta_sample_p_value_cutoff']
+    multi_dim_adjust_pvalue_cutoff = parameter_stuff.multi_dim_adjust_pvalue_cutoff
+    meta_BH_adj_p_value_cutoff = parameter_stuff.meta_BH_adj_p_value_cutoff
+    meta_sample_p_value_cutoff = parameter_stuff.meta_sample_p_value_cutoff
 
     # Meta-Analysis Report
     if statistical_test == 'meta_analysis':
@@ -3529,306 +3466,108 @@ def printing_summary_report(folder_pathway, tally_global_dictionary,
     else:
         summary_report.write("\n")
         summary_report.write("STATISTICAL TEST IMPLEMENTENT: Multi-Dimensional P-Value Adjustment\n")
-        summary_report.write("\n")
-        summary_report.write("Multi-Dimensional P-value Adjustment Cutoff: " + str(multi_dim_adjust_pvalue_cutoff) + "\n")
-        summary_report.write("\n")
-        summary_report.write("\n")
-
-    summary_report.write("               SUMMARY REPORT OF RESULTS")
-    summary_report.write("\n")
-    summary_report.write("The total number of testable biallelic variants is: "        
-                         + str(tally_global_dictionary['Biallelic_Testable_Variants']) + "\n")
-
-    summary_report.write("The total number of significant ASE variants is: "
-                         + str(tally_global_dictionary['Total_Sig_ASE_Variants']) + "\n")
-
-    summary_report.write("\n")
-
-    summary_report.write("            Breakdown of Significant Variants Results\n")
-
-    summary_report.write("The total number of ALL tests possible: "
-                         + str(tally_global_dictionary['Total_Tests']) + "\n")
-
-    summary_report.write("The total number of biallelic variants in all samples: "
-                         + str(tally_global_dictionary['Total_Biallelic_Samples']) + "\n")
-
-    summary_report.write("The total number of significant biallelic variants in all samples: "
-                         + str(tally_global_dictionary['Total_Sig_Biallelic_Samples']) + "\n")
-
-    summary_report.write("The total number of biallelic variants in all samples with NO significant ASE: "
-                         + str(tally_global_dictionary['Total_Biallelic_No_ASE']) + "\n")
-
-    summary_report.write("\n")
-
-    summary_report.write("       Breakdown of Significant Biallelic Variants in All Samples\n")     
-
-    summary_report.write("The total number of significant ASE where reference allele is higher: "
-                         + str(tally_global_dictionary['Total_Sig_ASE_Ref']) + "\n")
-
-    summary_report.write("The total number of significant ASE where alternative allele is higher: "
-                         + str(tally_global_dictionary['Total_Sig_ASE_Alt']) + "\n")
-
-    summary_report.write("\n")
-
-
-    summary_report.write("              Breakdown of Homozygous Results\n")
-
-    summary_report.write("The total number of homozygous variants in all samples (pass qualitity controls): "
-                         + str(tally_global_dictionary['Total_Passing_Homozygous']) + "\n")
-
-    summary_report.write("The total number of reference homozygous counts: "
-                         + str(tally_global_dictionary['Total_Passing_Homozygous_Ref']) + "\n")
-
-    summary_report.write("The total number of alternative homozygous counts: "
-                         + str(tally_global_dictionary['Total_Passing_Homozygous_Alt']) + "\n")
-
-    summary_report.write("\n")
-
-    summary_report.write("                  Non-testable Results\n")
-    
-    summary_report.write("The total number of variants in all samples that were not testable: "
-                         + str(tally_global_dictionary['Total_Non_Testable']) + "\n")
-
-    summary_report.write("\n")
-    summary_report.write("\n")
-    summary_report.write("######################################################################\n")
-    summary_report.write("######################################################################\n")
-    summary_report.write("######################################################################\n")
-
-    summary_report.close()
-
-    return(summary_report_file_name)
-
-
-def get_list_sig_variants(file_name):
-    
-    """
-
-    Parses through the significant variants file
-    and creates a dictionary of variants and their
-    information for later parsing
-    
-    : Param file_name: Name of file being parsed
-
-    : Return sig_variants_dict: A dictionary of significant results  
-
-    """
-
-    sig_variants_dict = {}
-
-    sig_variants_file = open(file_name, 'r')
-
-    # Skipping the header
-    for line in sig_variants_file:
-        if line.startswith('#CHROM'):
-            continue
-        
-        # Getting the actual data to create a dictionary
-        else:
-            parsed_line = line.rstrip().split('\t')
-
-            variant_name = parsed_line[0] + ":" + parsed_line[1]
-            variant_info = parsed_line[:8]
-            sig_variants_dict.update({variant_name: variant_info})
-
-    # Closing the file
-    sig_variants_file.close()
-
-    return(sig_variants_dict)
-
-
-def meta_data_for_mapping_bias_plots(testable_variants_file, sig_variants_dict, output_directory):
-    
-    """
-
-    Function parses through all the testable biallelic variants
-    and tallies the overall read counts to investigate reference allele bias
-    
-    : Param testable_variants_file: File with ALL biallelic testable variants
-    : Param sig_variants_dict: All ASE SNPs identified in the study
-    : Param output_directory: Tells where to output the data file
-
-    : Return avg_ref_allele_ratio: Average reference allele ratio ---help identify ref allele bias in data
-    
-    """
-
-    #opening up variant file
-    testable_variants_file=open(testable_variants_file, 'r') 
-
-    #Creating a log file for variant meta analysis
-    ref_bias_file=open(output_directory + "/data_for_ref_allele_bias_plotting.txt",'w')
-
-    # Writing the heading to file for plotting file
-    ref_bias_file.write("Variant_Name\tStatus\tRef_Count\tAlt_Count\tTotal_Count\tRatio\n")
-
-    # Creating Ref Allele Ratio List
-    ref_allele_ratio_list = []
-    
-    #reading file line by line
-    for line in testable_variants_file:
-
-        #Getting the header information from the file
-        if line.startswith('#CHROM'):
-            continue
-
-        else:
-            #Splitting the data
-            parsed_line = line.rstrip().split('\t')
-
-            variant_name = parsed_line[0] + ":" + parsed_line[1]
-
-            # Determining if the variant showed ASE
-            if variant_name in sig_variants_dict:
-                status = 'Sig_ASE'
-            else:
-                status = 'No_ASE'
-            
+        summary_report.write("\n")
+        summary_report.write("Multi-Dimensional P-value Adjustment Cutoff: " + str(multi_dim_adjust_pvalue_cutoff) + "\n")
+        summary_report.write("\n")
+        summary_report.write("\n")
 
-            # Simple Counters
-            variant_total_reference_count = 0
-            variant_total_alternative_count = 0
-            variant_total_count = 0 
+    summary_report.write("               SUMMARY REPORT OF RESULTS")
+    summary_report.write("\n")
+    summary_report.write("The total number of testable biallelic variants is: "        
+                         + str(tally_global_dictionary['Biallelic_Testable_Variants']) + "\n")
 
-            #Getting Variant Results Only
-            variant_sample_results=parsed_line[9:]
+    summary_report.write("The total number of significant ASE variants is: "
+                         + str(tally_global_dictionary['Total_Sig_ASE_Variants']) + "\n")
 
-            #Starting reading and writing 
-            for sample_data in variant_sample_results:
-                split_sample_data = sample_data.split(':')
+    summary_report.write("\n")
 
-                if split_sample_data[0]=='Biallelic':
+    summary_report.write("            Breakdown of Significant Variants Results\n")
 
-                    counts = split_sample_data[2].split(',')
+    summary_report.write("The total number of ALL tests possible: "
+                         + str(tally_global_dictionary['Total_Tests']) + "\n")
 
-                    reference_count = int(counts[0])
-                    alternative_count = int(counts[1])
-                    total_count = reference_count + alternative_count
+    summary_report.write("The total number of biallelic variants in all samples: "
+                         + str(tally_global_dictionary['Total_Biallelic_Samples']) + "\n")
 
-                    #add to variant totals
-                    variant_total_reference_count += reference_count
-                    variant_total_alternative_count += alternative_count
-                    variant_total_count += total_count 
- 
-                else:
-                    continue
+    summary_report.write("The total number of significant biallelic variants in all samples: "
+                         + str(tally_global_dictionary['Total_Sig_Biallelic_Samples']) + "\n")
 
-            # Get the reference allele ratio
-            ref_allele_ratio = (variant_total_reference_count/variant_total_count)
+    summary_report.write("The total number of biallelic variants in all samples with NO significant ASE: "
+                         + str(tally_global_dictionary['Total_Biallelic_No_ASE']) + "\n")
 
-            ref_allele_ratio_list.append(ref_allele_ratio)
+    summary_report.write("\n")
 
-            # Printing alll results to file
-            ref_bias_file.write(str(variant_name) + "\t" + status + "\t" + str(variant_total_reference_count)
-                                + "\t" + str(variant_total_alternative_count)
-                                + "\t" + str(variant_total_count) + "\t"
-                                + str(ref_allele_ratio) + "\n" )
+    summary_report.write("       Breakdown of Significant Biallelic Variants in All Samples\n")     
 
-    #Getting the average ref allele ratio
-    avg_ref_allele_ratio = np.mean(ref_allele_ratio_list)
+    summary_report.write("The total number of significant ASE where reference allele is higher: "
+                         + str(tally_global_dictionary['Total_Sig_ASE_Ref']) + "\n")
 
-    # Closing the file
-    testable_variants_file.close()
-    ref_bias_file.close()
+    summary_report.write("The total number of significant ASE where alternative allele is higher: "
+                         + str(tally_global_dictionary['Total_Sig_ASE_Alt']) + "\n")
 
-    return(avg_ref_allele_ratio)
-    
+    summary_report.write("\n")
 
 
+    summary_report.write("              Breakdown of Homozygous Results\n")
 
-#########################################################################################################################
-############################################ Main Function ##############################################################
-#########################################################################################################################
+    summary_report.write("The total number of homozygous variants in all samples (pass qualitity controls): "
+                         + str(tally_global_dictionary['Total_Passing_Homozygous']) + "\n")
 
-def main():
+    summary_report.write("The total number of reference homozygous counts: "
+                         + str(tally_global_dictionary['Total_Passing_Homozygous_Ref']) + "\n")
 
-    print ("")
-    print ("########### VCF ASE Detection Tool (VADT) ###########")
-    print ("")
-    print ("Starting analysis of data")
+    summary_report.write("The total number of alternative homozygous counts: "
+                         + str(tally_global_dictionary['Total_Passing_Homozygous_Alt']) + "\n")
 
-    ###############################################################################
-    ################ Parsing Through User Parameters ##############################
+    summary_report.write("\n")
 
-    # Setting up program
-    start_time=time.clock()
-    home_directory = os.getcwd()
-    
-    # Program first test to see if the parameter file is present
-    verdict=os.path.isfile('VADT_Parameter_File.txt')
+    summary_report.write("                  Non-testable Results\n")
     
-    # If Program finds the parameter file it then parses it
-    if verdict == True:
-        print ("")
-        print ("Loading Input from User Provided Parameter File")
-        #Code to pull in data from parameter file (TESTING ONLY)
-        print ("")
-        parameter_stuff = parsing_input_parameter_file('VADT_Parameter_File.txt')
+    summary_report.write("The total number of variants in all samples that were not testable: "
+                         + str(tally_global_dictionary['Total_Non_Testable']) + "\n")
 
-    
-    ###Else code pulls in data from the qsub file/command line
-    else: 
-        user_input=sys.argv[1:]
-        user_input=' '.join(user_input)
-        print ("")
-        print ("Loading input from User Supplied Parameters from Submission File")
-        print ("")
-        print (user_input)
-        parameter_stuff=parsing_input(user_input)
-                             
-    # Version of python
-    python_version = sys.version
+    summary_report.write("\n")
+    summary_report.write("\n")
+    summary_report.write("######################################################################\n")
+    summary_report.write("######################################################################\n")
+    summary_report.write("######################################################################\n")
 
-    # Program name
-    program_name = sys.argv[0]
-                             
-    # Embed Data and Time (Output Folder)
-    date = datetime.now().strftime('%Y-%m-%d' + "_" + '%H-%M')
+    summary_report.close()
 
-    # Directory name
-    vadt_output_directory = "VADT_output_" + date
+    return(summary_report_file_name)
 
-    # Making a directory to put all important, but non-essential results in
-    # See if directory exists otherwise make it
-    output_file_location = parameter_stuff['output_file_location']
 
-    # Keep record of original output location
-    user_defined_output_location = output_file_location
+#########################################################################################################################
+####################################### Statistical Test Pipelines ######################################################
+#########################################################################################################################
 
-    # Update output file location with time stamp
-    output_file_location = output_file_location + "/" + vadt_output_directory
-    parameter_stuff['output_file_location'] = output_file_location
+def run_multi_dim_adjustment(parameter_stuff, testable_variants_file, testable_file_biallelic_samples_dict,
+                             biallelic_read_counts, raw_rna_seq_stats, indel_stats_dict, python_version,
+                             program_name, date, vadt_output_directory, user_defined_output_location):
 
-    ###############################################################################
-    ####################### Filtering VCF FIle ####################################
-    ###############################################################################
-    
-    # Making a directory to put all important, but non-essential results in
-    # See if directory exists otherwise make it
+    """
 
-    # Get output location from dictionary
-    output_file_location = parameter_stuff['output_file_location']
-    
-    verdict = os.path.exists(output_file_location + '/Filtering_Results')
-    if str(verdict) == 'False':
-        print ("Creating Log Directory of Filtering Results")
-        os.makedirs(output_file_location + '/Filtering_Results')
-    else:
-        print("Log Directory already exists")
-        print("")
+    Runs the Multi-Dimensional p-value adjustment of the testable variants and prints
+    all of its reports
 
-    print("")
-    print ("Filtering the RNA-Seq VCF Results Data Based on User Parameters")
-    # Filter RNA_Seq_Data File before begining matching
-    filtering_results = filter_RNA_Seq_Data(parameter_stuff)
-    filtered_rna_seq_file_name = filtering_results['filtered_rna_seq_file_name']
-    raw_rna_seq_stats = filtering_results ['raw_rna_seq_stats']
-    indel_stats_dict = filtering_results ['indel_stats_dict']
+    : Param parameter_stuff: Original user input paramters passed to the program
+    : Param testable_variants_file: File with ALL biallelic testable variants
+    : Param testable_file_biallelic_samples_dict: Biallelic testable counts of each sample (testable file)
+    : Param biallelic_read_counts: Read counts of all biallelic testable variants (mapping bias)
+    : Param raw_rna_seq_stats: Filtering statistics from the analysis process
+    : Param indel_stats_dict: Dictionary of indel statistics for printing
+    : Param python_version: version of python running
+    : Param program_name: name of program running
+    : Param date: date and time program ran
+    : Param vadt_output_directory: Name of the time stamped output directory
+    : Param user_defined_output_location: Output location given by the user
 
-    # Renaming filtered RNA-Seq File
-    testable_variants_file =filtered_rna_seq_file_name
+    : Return summary_report_file_name_multi_dim: File name of the Multi-Dimensional summary report
 
-    # Getting a Sample Tally of all testable biallelic counts (individual sample counts)
-    testable_file_biallelic_samples_dict = count_sample_biallelic_testable(testable_variants_file)
+    """
+
+    # Get output location from parameters
+    output_file_location = parameter_stuff.output_file_location
 
     ###############################################################################
     ################ Multidimensional P-value Adjustment Code #####################
@@ -3837,10 +3576,9 @@ def main():
     print ("Starting Multi-Dimensional p-value Adjustment of Data")
     
     # Creating Output Folder of Results
-    verdict = os.path.exists(output_file_location + '/Multi_Dim_Adj_Results')
-    if str(verdict) == 'False':
+    if not os.path.isdir(output_file_location + '/Multi_Dim_Adj_Results'):
         print ("Creating Multi-Dimensional Adjustment Results folder")
-        os.makedirs(output_file_location + '/Multi_Dim_Adj_Results')
+        os.makedirs(output_file_location + '/Multi_Dim_Adj_Results', exist_ok=True)
     else:
         print("Multi-Dimensional p-value Adjustment folder already exists")
         print("")
@@ -3849,7 +3587,7 @@ def main():
     multi_dim_sample_output_dir = output_file_location + '/Multi_Dim_Adj_Results'
 
     # Getting the p-value cutoffs
-    multi_dim_adjust_pvalue_cutoff = parameter_stuff['multi_dim_adjust_pvalue_cutoff']
+    multi_dim_adjust_pvalue_cutoff = parameter_stuff.multi_dim_adjust_pvalue_cutoff
 
     print ("The Multi-Dimensional P-Value Cutoff Is:")
     print (multi_dim_adjust_pvalue_cutoff)
@@ -3875,12 +3613,12 @@ def main():
     multi_dim_global_counts_dict = filter_sig_multi_dim_results['multi_dim_global_counts_dict']
 
     #Investigating Ref Allele Bias in Testable Variants Data
-    multi_dim_sig_variants_dict = get_list_sig_variants(sig_multi_dimensional_file_name)
+    multi_dim_sig_variant_names = get_list_sig_variants(sig_multi_dimensional_file_name)
 
     # Getting Reference Allele Bias
     ########## ADD IN MATPLOT LIB HERE ##############
-    multi_dim_avg_ref_allele_ratio = multi_dim_data_for_mapping_bias_plots(testable_variants_file, multi_dim_sig_variants_dict, 
-    															 multi_dim_sample_output_dir)
+    multi_dim_avg_ref_allele_ratio = data_for_mapping_bias_plots(biallelic_read_counts, multi_dim_sig_variant_names,
+                                                                 multi_dim_sample_output_dir)
     #################################################
 
     # Tallying Final Results from All Significant Samples
@@ -3888,7 +3626,7 @@ def main():
     multi_dim_samples_list = tally_final_multi_dim[0]
     multi_dim_samples_counters_dict = tally_final_multi_dim[1]
     multi_dim_variant_list = tally_final_multi_dim[2]
-    multi_dim_variant_results_dictionary = tally_final_multi_dim[3]
+    multi_dim_variant_results_matrix = tally_final_multi_dim[3]
     multi_dim_variant_header = tally_final_multi_dim[4]
     tally_multi_dim_global_dictionary =  tally_final_multi_dim[5]
     
@@ -3896,7 +3634,7 @@ def main():
     printing_sample_results(multi_dim_sample_output_dir, multi_dim_samples_list, multi_dim_samples_counters_dict, testable_file_biallelic_samples_dict)
 
     sig_variants_multi_dim_final_file_name = printing_variant_results(multi_dim_sample_output_dir, multi_dim_variant_list,
-                                                                      multi_dim_variant_results_dictionary, multi_dim_variant_header)
+                                                                      multi_dim_variant_results_matrix, multi_dim_variant_header)
 
     # Define statistical test variable
     statistical_test = 'multi_dimensional_pvalue_adj'
@@ -3911,6 +3649,36 @@ def main():
     print ("")
     print ("")
 
+    return(summary_report_file_name_multi_dim)
+
+
+def run_meta_analysis(parameter_stuff, testable_variants_file, testable_file_biallelic_samples_dict,
+                      biallelic_read_counts, raw_rna_seq_stats, indel_stats_dict, python_version,
+                      program_name, date, vadt_output_directory, user_defined_output_location):
+
+    """
+
+    Runs the meta-analysis of the testable variants and prints all of its reports
+
+    : Param parameter_stuff: Original user input paramters passed to the program
+    : Param testable_variants_file: File with ALL biallelic testable variants
+    : Param testable_file_biallelic_samples_dict: Biallelic testable counts of each sample (testable file)
+    : Param biallelic_read_counts: Read counts of all biallelic testable variants (mapping bias)
+    : Param raw_rna_seq_stats: Filtering statistics from the analysis process
+    : Param indel_stats_dict: Dictionary of indel statistics for printing
+    : Param python_version: version of python running
+    : Param program_name: name of program running
+    : Param date: date and time program ran
+    : Param vadt_output_directory: Name of the time stamped output directory
+    : Param user_defined_output_location: Output location given by the user
+
+    : Return summary_report_file_name_meta: File name of the meta-analysis summary report
+
+    """
+
+    # Get output location from parameters
+    output_file_location = parameter_stuff.output_file_location
+
     ###############################################################################
     ################Meta Analysis of Data for ASE Testing##########################
 
@@ -3918,17 +3686,16 @@ def main():
 
     # Getting the p-value cutoff ############ FIX CUTOFF NAME ##############################################################
     ###############################################################################################################
-    meta_BH_adj_p_value_cutoff = parameter_stuff['meta_BH_adj_p_value_cutoff']
-    meta_sample_p_value_cutoff = parameter_stuff['meta_sample_p_value_cutoff']
+    meta_BH_adj_p_value_cutoff = parameter_stuff.meta_BH_adj_p_value_cutoff
+    meta_sample_p_value_cutoff = parameter_stuff.meta_sample_p_value_cutoff
 
     ###################################################################
     print ("The meta analysis cutoff p value is:")
     
     # Creating a Sample FDR Output Folder of Results
-    verdict = os.path.exists(output_file_location + '/Meta_Analysis_Results')
-    if str(verdict) == 'False':
+    if not os.path.isdir(output_file_location + '/Meta_Analysis_Results'):
         print ("Creating Meta_Analysis_Results folder")
-        os.makedirs(output_file_location + '/Meta_Analysis_Results')
+        os.makedirs(output_file_location + '/Meta_Analysis_Results', exist_ok=True)
     else:
         print("Meta_Analysis_Results folder already exists")
         print("")
@@ -3949,18 +3716,18 @@ def main():
     meta_global_counts_dict = filtered_meta_results['meta_global_counts_dict']
 
     #Investigating Ref Allele Bias in Testable Variants Data
-    meta_fdr_sig_variants_dict = get_list_sig_variants(sig_meta_file_name)
+    meta_fdr_sig_variant_names = get_list_sig_variants(sig_meta_file_name)
 
     # Getting Reference Allele Bias
     ########## ADD IN MATPLOT LIB HERE ##############
-    meta_avg_ref_allele_ratio = meta_data_for_mapping_bias_plots(testable_variants_file, meta_fdr_sig_variants_dict, meta_analysis_output_folder)
+    meta_avg_ref_allele_ratio = data_for_mapping_bias_plots(biallelic_read_counts, meta_fdr_sig_variant_names, meta_analysis_output_folder)
 
     # Tallying All Signficant Results from Meta-Analysis
     tally_final_meta_analysis = tally_final_meta_results(sig_meta_file_name, meta_global_counts_dict, meta_sample_p_value_cutoff)
     meta_samples_list = tally_final_meta_analysis[0]
     meta_samples_counters_dict = tally_final_meta_analysis[1] 
     meta_variant_list = tally_final_meta_analysis[2] 
-    meta_variant_results_dictionary = tally_final_meta_analysis[3] 
+    meta_variant_results_matrix = tally_final_meta_analysis[3] 
     meta_variant_header = tally_final_meta_analysis[4] 
     tally_meta_global_dictionary = tally_final_meta_analysis[5] 
 
@@ -3968,7 +3735,7 @@ def main():
     printing_sample_results(meta_analysis_output_folder, meta_samples_list, meta_samples_counters_dict, testable_file_biallelic_samples_dict)
 
     sig_variants_meta_final_file_name = printing_variant_results(meta_analysis_output_folder, meta_variant_list,
-                                                                 meta_variant_results_dictionary, meta_variant_header)
+                                                                 meta_variant_results_matrix, meta_variant_header)
 
     # Define statistical test variable
     statistical_test = 'meta_analysis'
@@ -3986,6 +3753,123 @@ def main():
     print ("")
     print ("")
 
+    return(summary_report_file_name_meta)
+
+
+#########################################################################################################################
+############################################ Main Function ##############################################################
+#########################################################################################################################
+
+def main():
+
+    print ("")
+    print ("########### VCF ASE Detection Tool (VADT) ###########")
+    print ("")
+    print ("Starting analysis of data")
+
+    ###############################################################################
+    ################ Parsing Through User Parameters ##############################
+
+    # Setting up program
+    start_time=time.perf_counter()
+    home_directory = os.getcwd()
+    
+    # Program first test to see if the parameter file is present
+    verdict=os.path.isfile('VADT_Parameter_File.txt')
+    
+    # If Program finds the parameter file it then parses it
+    if verdict == True:
+        print ("")
+        print ("Loading Input from User Provided Parameter File")
+        #Code to pull in data from parameter file (TESTING ONLY)
+        print ("")
+        parameter_stuff = parsing_input_parameter_file('VADT_Parameter_File.txt')
+
+    
+    ###Else code pulls in data from the qsub file/command line
+    else: 
+        user_input=sys.argv[1:]
+        user_input=' '.join(user_input)
+        print ("")
+        print ("Loading input from User Supplied Parameters from Submission File")
+        print ("")
+        print (user_input)
+        parameter_stuff=parsing_input(user_input)
+                             
+    # Version of python
+    python_version = sys.version
+
+    # Program name
+    program_name = sys.argv[0]
+                             
+    # Embed Data and Time (Output Folder)
+    date = datetime.now().strftime('%Y-%m-%d_%H-%M')
+
+    # Directory name
+    vadt_output_directory = "VADT_output_" + date
+
+    # Making a directory to put all important, but non-essential results in
+    # See if directory exists otherwise make it
+    output_file_location = parameter_stuff.output_file_location
+
+    # Keep record of original output location
+    user_defined_output_location = output_file_location
+
+    # Update output file location with time stamp
+    output_file_location = output_file_location + "/" + vadt_output_directory
+    parameter_stuff = parameter_stuff._replace(output_file_location=output_file_location)
+
+    ###############################################################################
+    ####################### Filtering VCF FIle ####################################
+    ###############################################################################
+    
+    # Making a directory to put all important, but non-essential results in
+    # See if directory exists otherwise make it
+
+    # Get output location from dictionary
+    output_file_location = parameter_stuff.output_file_location
+    
+    if not os.path.isdir(output_file_location + '/Filtering_Results'):
+        print ("Creating Log Directory of Filtering Results")
+        os.makedirs(output_file_location + '/Filtering_Results', exist_ok=True)
+    else:
+        print("Log Directory already exists")
+        print("")
+
+    print("")
+    print ("Filtering the RNA-Seq VCF Results Data Based on User Parameters")
+    # Filter RNA_Seq_Data File before begining matching
+    filtering_results = filter_RNA_Seq_Data(parameter_stuff)
+    filtered_rna_seq_file_name = filtering_results['filtered_rna_seq_file_name']
+    raw_rna_seq_stats = filtering_results ['raw_rna_seq_stats']
+    indel_stats_dict = filtering_results ['indel_stats_dict']
+
+    # Renaming filtered RNA-Seq File
+    testable_variants_file =filtered_rna_seq_file_name
+
+    # Getting a Sample Tally of all testable biallelic counts (individual sample counts)
+    testable_file_biallelic_samples_dict = count_sample_biallelic_testable(testable_variants_file)
+
+    # Read counts of all biallelic testable variants (parsed once, for the reference allele bias
+    # data of both statistical tests)
+    biallelic_read_counts = sum_biallelic_read_counts(testable_variants_file)
+
+    ###############################################################################
+    ########## Multi-Dimensional P-value Adjustment and Meta Analysis ############
+    ###############################################################################
+
+    # Both tests are run one after the other on the same inputs (they share the one copy of the
+    # read counts, which is only read by them)
+    analysis_inputs = (parameter_stuff, testable_variants_file, testable_file_biallelic_samples_dict,
+                       biallelic_read_counts, raw_rna_seq_stats, indel_stats_dict, python_version,
+                       program_name, date, vadt_output_directory, user_defined_output_location)
+
+    summary_report_file_name_multi_dim = run_multi_dim_adjustment(*analysis_inputs)
+    summary_report_file_name_meta = run_meta_analysis(*analysis_inputs)
+
+    # The read counts are no longer needed
+    del analysis_inputs, biallelic_read_counts
+
     ###############################################################################
     #################### End of Program Timing Stuff #################################
 
@@ -3994,32 +3878,20 @@ def main():
     print ("")
     print ("Program Done Running")
 
-    total_time = time.clock() - start_time
+    total_time = time.perf_counter() - start_time
     print ("")
     print ("")
     print("Program ran for a total of " + str(round(total_time, 2))+" seconds")
 
-    # Write the final times to the summary report files
-    
-    # Multi-Dimensional P-value Adjustment Report File
-    sum_multi_dim_file = open(summary_report_file_name_multi_dim, 'a')
-    sum_multi_dim_file.write("\n")
-    sum_multi_dim_file.write("\n")
-    sum_multi_dim_file.write("Program Ran successfully!!!")
-    sum_multi_dim_file.write("\n")
-    sum_multi_dim_file.write("Total Runtime of program ran for a total of " + str(round(total_time, 2))+" seconds\n")
-    sum_multi_dim_file.write("\n")
-    sum_multi_dim_file.close()
-
-    # Meta Report File
-    sum_meta_file = open(summary_report_file_name_meta, 'a')
-    sum_meta_file.write("\n")
-    sum_meta_file.write("\n")
-    sum_meta_file.write("Program Ran successfully!!!")
-    sum_meta_file.write("\n")
-    sum_meta_file.write("Total Runtime of program ran for a total of " + str(round(total_time, 2))+" seconds\n")
-    sum_meta_file.write("\n")
-    sum_meta_file.close()
+    # Write the final times to the summary report files (same footer for the Multi-Dimensional
+    # P-value Adjustment Report File and the Meta Report File, one write each)
+    runtime_footer = ("\n\nProgram Ran successfully!!!\n"
+                      "Total Runtime of program ran for a total of " + str(round(total_time, 2)) + " seconds\n\n")
+
+    for summary_report_file_name in (summary_report_file_name_multi_dim, summary_report_file_name_meta):
+        summary_report_file = open(summary_report_file_name, 'a')
+        summary_report_file.write(runtime_footer)
+        summary_report_file.close()
 
 if __name__ == "__main__":
     